@@ -1,36 +1,36 @@
 import argparse
+import signal
+import sys
 import time
-import schedule
-import datetime
-import json
 import asyncio
+import json
 from src.crawler import NuriCrawler
-from src.logger import get_logger
+from src.logger import get_logger, console_to_stderr
 from src.storage import Storage
+from src.daemon import CrawlerDaemon
+from src.scheduler import CrawlScheduler, IntervalPolicy, DailyPolicy
+from src.benchmark import run_benchmark
+from src.shard import ShardCoordinator
+from src.exporter import export_bids, export_changes
 
 logger = get_logger("MAIN")
 
-def run_crawler_job():
-    """크롤러 실행 작업 래퍼 함수"""
+async def crawl_job():
+    """크롤러 실행 작업 래퍼 함수 (interval/cron 모드에서는 CrawlScheduler 가 겹치지 않게 호출)"""
     logger.info(">> 스케줄러에 의해 크롤링 작업 시작")
     try:
         crawler = NuriCrawler()
-        # 비동기 함수 실행을 위해 asyncio.run 사용
-        asyncio.run(crawler.run())
+        await crawler.run()
     except Exception as e:
         logger.error(f"작업 실행 중 오류 발생: {e}")
     
     # 작업 종료 로그 및 구분선 추가
     logger.info(">> 크롤링 작업 종료")
     logger.info("-" * 60 + "\n") 
-    
-    # 다음 실행 시간 로깅
-    try:
-        next_run = schedule.next_run()
-        if next_run:
-            logger.info(f"== 다음 실행 예정 시간: {next_run.strftime('%Y-%m-%d %H:%M:%S')} ==\n")
-    except:
-        pass
+
+def run_crawler_job():
+    """1회 실행 (single 모드)"""
+    asyncio.run(crawl_job())
 
 def main():
     parser = argparse.ArgumentParser(description="누리장터 입찰공고 수집기")
@@ -40,18 +40,65 @@ def main():
         "--mode", 
         type=str, 
         default="single", 
-        choices=["single", "interval", "cron", "export"],
-        help="실행 모드 (single: 1회, interval: 반복, cron: 예약, export: JSON파일추출)"
+        choices=["single", "interval", "cron", "daemon", "export", "changes", "query", "search", "bench", "shard", "compact"],
+        help="실행 모드 (single: 1회, interval: 반복, cron: 예약, daemon: 브라우저 유지 반복, export: 파일추출, changes: 변경이력 조회, query: 조건 조회, search: 전문 검색, bench: mock 사이트 성능측정, shard: 검색 조건별 병렬 수집, compact: raw_data 압축 변환 및 크기 보고)"
     )
     
     # 시간/간격 설정 값
     parser.add_argument(
         "--value", 
         type=str, 
-        help="interval 모드일 경우 '분' 단위(예: 30), cron 모드일 경우 'HH:MM' (예: 09:00,18:00)"
+        help="interval/daemon 모드일 경우 '분' 단위(예: 30, daemon 은 adaptive 도 가능), cron 모드일 경우 'HH:MM' (예: 09:00,18:00), shard 모드일 경우 동시 프로세스 수"
     )
 
+    # 추출 설정 값 (export 모드)
+    parser.add_argument("--format", type=str, default="json", choices=["json", "ndjson"], help="export 모드: 출력 형식")
+    parser.add_argument("--gzip", action="store_true", help="export 모드: gzip 압축 (--output 이 .gz 로 끝나도 압축)")
+    parser.add_argument("--since", type=str, help="export 모드: 이 시각 이후 수집/갱신분만 (UTC, 'YYYY-MM-DD HH:MM:SS')")
+    parser.add_argument("--incremental", action="store_true", help="export 모드: 지난 증분 추출 이후 변경분만 (커서 자동 저장)")
+    parser.add_argument("--expiring-within", type=float, help="export 모드: 지금부터 N시간 안에 마감되는 공고만")
+
+    # 조회 조건 (export/query 모드)
+    parser.add_argument("--status", type=str, help="진행상태 (예: 입찰개시)")
+    parser.add_argument("--deadline-from", type=str, help="마감일시 하한 ('YYYY/MM/DD HH:MM')")
+    parser.add_argument("--deadline-to", type=str, help="마감일시 상한 ('YYYY/MM/DD HH:MM')")
+    parser.add_argument("--category", type=str, help="업무분류 (예: 용역, 물품, 공사)")
+    parser.add_argument("--contract-method", type=str, help="계약방법 (예: 제한경쟁)")
+    parser.add_argument("--budget-min", type=int, help="배정예산 하한(원)")
+    parser.add_argument("--budget-max", type=int, help="배정예산 상한(원)")
+    parser.add_argument("--region", type=str, help="개찰장소 등에서 추정한 시/도 약칭 (예: 서울, 부산, 경기)")
+    parser.add_argument("--department", type=str, help="담당부서 (부분 일치)")
+    parser.add_argument("--query", type=str, help="search 모드: 검색어 (공백으로 구분된 단어는 모두 포함)")
+    parser.add_argument("--order", type=str, default="budget", choices=["budget", "deadline", "recent"], help="query 모드: 정렬")
+
+    # 변경 이력 설정 값 (changes 모드)
+    parser.add_argument("--after", type=int, help="changes 모드: 이 seq 이후 이력부터")
+    parser.add_argument("--consumer", type=str, help="changes 모드: 소비자 이름 (커서를 DB에 저장해 이어 읽음)")
+    parser.add_argument("--limit", type=int, help="changes/query/search 모드: 최대 건수 (기본 1000/100/20)")
+    parser.add_argument("--compact", action="store_true", help="changes 모드: 보관 기간이 지난 이력 정리만 수행")
+
+    # 벤치마크 설정 값 (bench 모드)
+    parser.add_argument("--bids", type=int, default=200, help="bench 모드: mock 사이트 공고 수")
+    parser.add_argument("--latency", type=int, default=50, help="bench 모드: mock API 응답 지연(ms)")
+    parser.add_argument("--runs", type=int, default=1, help="bench 모드: 반복 횟수 (2회차부터 증분 수집)")
+    parser.add_argument("--output", type=str, help="export/changes/query/bench 모드: 결과 파일 경로")
+    parser.add_argument("--baseline", type=str, help="bench 모드: 비교할 이전 결과 JSON")
+
     args = parser.parse_args()
+    filters = {
+        "status": args.status,
+        "deadline_from": args.deadline_from,
+        "deadline_to": args.deadline_to,
+        "category": args.category,
+        "contract_method": args.contract_method,
+        "budget_min": args.budget_min,
+        "budget_max": args.budget_max,
+        "region": args.region,
+        "department": args.department,
+    }
+
+    # SIGTERM 도 정상 종료 경로(atexit)로 보내 대기 중인 DB 쓰기를 flush
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
     # 1. 단일 실행 (Single Mode)
     if args.mode == "single":
@@ -67,18 +114,8 @@ def main():
         minutes = int(args.value)
         logger.info(f"=== [모드] 인터벌 실행 (매 {minutes}분 마다) ===")
         
-        # 즉시 1회 실행 후 스케줄 등록
-        run_crawler_job()
-        
-        schedule.every(minutes).minutes.do(run_crawler_job)
-        
-        # 다음 실행 시간 안내
-        next_run = schedule.next_run()
-        logger.info(f"== 대기 중... 다음 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S')} ==\n")
-        
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        # 즉시 1회 실행 후 이전 실행이 끝난 시점 기준으로 다음 실행 예약
+        asyncio.run(CrawlScheduler(crawl_job, IntervalPolicy(minutes)).run_forever())
 
     # 3. 정해진 시간 실행 (Cron Mode)
     elif args.mode == "cron":
@@ -89,41 +126,142 @@ def main():
         target_times = [t.strip() for t in args.value.split(',')]
         logger.info(f"=== [모드] 예약 실행 (매일 {target_times}) ===")
 
-        for t in target_times:
-            schedule.every().day.at(t).do(run_crawler_job)
+        policy = DailyPolicy(target_times)
+        asyncio.run(CrawlScheduler(crawl_job, policy, run_immediately=False).run_forever())
+    
+    # 4. 상주 실행 (Daemon Mode): 브라우저를 유지한 채 N분 간격(또는 적응형 간격) 반복
+    elif args.mode == "daemon":
+        if not args.value:
+            logger.error("daemon 모드는 --value (분 단위 또는 adaptive)가 필요합니다.")
+            return
 
-        next_run = schedule.next_run()
-        if next_run:
-            logger.info(f"== 대기 중... 다음 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S')} ==\n")
+        if args.value == "adaptive":
+            logger.info("=== [모드] 상주 실행 (브라우저 유지, 신규 공고 속도에 맞춘 적응형 간격) ===")
+            asyncio.run(CrawlerDaemon().run_forever())
+        else:
+            minutes = int(args.value)
+            logger.info(f"=== [모드] 상주 실행 (브라우저 유지, 매 {minutes}분 마다) ===")
+            asyncio.run(CrawlerDaemon(minutes).run_forever())
 
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
-    
-    # 4. 데이터 추출 모드 (Export Mode)
+    # 5. 데이터 추출 모드 (Export Mode): 커서로 한 행씩 읽어 파일에 바로 기록
     elif args.mode == "export":
-        logger.info("=== [모드] DB 데이터 JSON 파일 추출 ===")
+        logger.info("=== [모드] DB 데이터 파일 추출 ===")
         try:
             storage = Storage()
-            all_data = storage.fetch_all()
+            filename, count = export_bids(
+                storage,
+                output=args.output,
+                fmt=args.format,
+                compress=args.gzip,
+                since=args.since,
+                incremental=args.incremental,
+                expiring_within=args.expiring_within,
+                **filters,
+            )
             storage.close()
 
-            if not all_data:
-                logger.info(">> 저장된 데이터가 없습니다.")
+            if not count:
+                logger.info(">> 추출할 데이터가 없습니다.")
                 return
 
-            # 파일명 생성: YYYYMMDD_HHMMSS_nuri_bids.json
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_nuri_bids.json"
+            logger.info(f">> 추출 완료: {filename} (총 {count}건)")
 
-            # JSON 파일 저장
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, ensure_ascii=False, indent=4)
-            
-            logger.info(f">> 추출 완료: {filename} (총 {len(all_data)}건)")
-            
         except Exception as e:
             logger.error(f"데이터 추출 중 오류 발생: {e}")
 
+    # 6. 변경 이력 조회 (Changes Mode): 커서 이후 insert/update/delete/expire 를 NDJSON 으로 출력
+    elif args.mode == "changes":
+        if not args.output and not args.compact:
+            console_to_stderr()  # 표준출력은 NDJSON 전용 (로그가 섞이면 소비 측 파싱 실패)
+        storage = Storage()
+        try:
+            if args.compact:
+                storage.compact_changes()
+                return
+            count, last = export_changes(storage, args.after, args.consumer, args.limit or 1000, args.output)
+            logger.info(f">> 변경 이력 {count}건 (다음 커서: {last})")
+        finally:
+            storage.close()
+
+    # 7. 조건 조회 (Query Mode): 타입 컬럼 인덱스로 예산/업무분류/지역 등 조건 조회
+    elif args.mode == "query":
+        storage = Storage()
+        try:
+            results = storage.query_bids(limit=args.limit or 100, order_by=args.order, **filters)
+        finally:
+            storage.close()
+
+        for data in results:
+            logger.info(
+                f"{data.get('입찰공고번호', '')} | {data.get('업무분류', '')} | {data.get('배정예산', '')} | "
+                f"마감 {data.get('입찰서접수마감일시', '')} | {data.get('입찰공고명', '')}"
+            )
+        logger.info(f">> 조회 결과 {len(results)}건")
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=4)
+            logger.info(f">> 저장 완료: {args.output}")
+
+    # 8. 전문 검색 (Search Mode): FTS5 trigram 색인으로 관련도 순 검색
+    elif args.mode == "search":
+        if not args.query:
+            logger.error("search 모드는 --query (검색어)가 필요합니다.")
+            return
+
+        storage = Storage()
+        try:
+            started = time.perf_counter()
+            results = storage.search(args.query, limit=args.limit or 20, status=args.status)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            storage.close()
+
+        for rank, item in enumerate(results, 1):
+            logger.info(f"{rank:>3}. {item['bid_no']} | {item['title']} | 마감 {item['end_date'] or '-'}")
+            logger.info(f"     {item['snippet']}")
+        logger.info(f">> '{args.query}' 검색 결과 {len(results)}건 ({elapsed_ms:.1f}ms)")
+
+    # 9. 성능 측정 모드 (Bench Mode): 로컬 mock 사이트 대상 오프라인 수집
+    elif args.mode == "bench":
+        logger.info("=== [모드] 오프라인 벤치마크 (mock 누리장터) ===")
+        run_benchmark(args.bids, args.latency, runs=args.runs, output=args.output, baseline=args.baseline)
+
+    # 10. 샤드 수집 모드 (Shard Mode): 검색 조건별 프로세스 병렬 수집, DB 쓰기는 조정 프로세스 1곳
+    elif args.mode == "shard":
+        logger.info("=== [모드] 샤드 병렬 수집 ===")
+        coordinator = ShardCoordinator(processes=int(args.value)) if args.value else ShardCoordinator()
+        try:
+            ok = coordinator.run()
+        finally:
+            coordinator.close()
+        if not ok:
+            sys.exit(1)
+
+    # 11. raw_data 압축 변환 (Compact Mode): 공유 값 선정 + 전체 행 재저장 + VACUUM, 전/후 크기 보고
+    elif args.mode == "compact":
+        logger.info("=== [모드] raw_data 압축 변환 ===")
+        storage = Storage()
+        try:
+            report = storage.compact_raw()
+        finally:
+            storage.close()
+
+        def size(n):
+            return f"{n / 1024 / 1024:.2f}MB" if n >= 1024 * 1024 else f"{n / 1024:.1f}KB"
+
+        before, after = report["before"], report["after"]
+        rows = max(after["rows"], 1)
+        saved = 1 - after["raw_bytes"] / before["raw_bytes"] if before["raw_bytes"] else 0
+        logger.info(
+            f">> [압축] {report['converted']}건 변환 (JSON 텍스트였던 행 {before['text_rows']}건, "
+            f"새 공유 값 {report['interned']}건, 실패 {report['failed']}건)"
+        )
+        logger.info(
+            f">> [압축] raw_data 합계: {size(before['raw_bytes'])} -> {size(after['raw_bytes'])} "
+            f"(행당 {before['raw_bytes'] / rows:.0f}B -> {after['raw_bytes'] / rows:.0f}B, {saved:.1%} 감소)"
+        )
+        logger.info(f">> [압축] DB 파일: {size(before['file_bytes'])} -> {size(after['file_bytes'])}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import os
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from urllib.parse import quote
+from src.config import (
+    ATTACH_URL, ATTACH_DIR, ATTACH_CONCURRENCY, ATTACH_MAX_ATTEMPTS, ATTACH_CHUNK_SIZE, ATTACH_TIMEOUT
+)
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+
+def attachment_url(template, bid_no: str, index: int, name: str, href=None):
+    """첨부파일 다운로드 URL: 그리드 링크(href)가 실제 URL 이면 우선, 아니면 ATTACH_URL 템플릿 (둘 다 없으면 None)"""
+    if href and href.lower().startswith(("http://", "https://")):
+        return href
+    if not template:
+        return None
+    bid_pbanc_no, _, bid_pbanc_ord = bid_no.partition("-")
+    return template.format(bid_no=bid_no, bid_pbanc_no=bid_pbanc_no, bid_pbanc_ord=bid_pbanc_ord,
+                           index=index, name=quote(name))
+
+
+class ContentStore:
+    """내용 주소(sha256) 파일 저장소: <root>/<해시 앞 2자리>/<sha256>, 같은 내용은 한 번만 저장"""
+
+    def __init__(self, root=ATTACH_DIR):
+        self.root = Path(root)
+        self.tmp = self.root / "tmp"
+        self.tmp.mkdir(parents=True, exist_ok=True)
+
+    def path(self, sha256: str):
+        return self.root / sha256[:2] / sha256
+
+    def part_path(self, bid_no: str, seq: int, url: str):
+        """
+        받는 중인 파일: (공고번호, 순번, URL) 기준 고정 이름 → 중단 후 다음 실행에서 이어 받기
+        (같은 URL 을 가진 다른 공고 파일이 동시에 받아져도 .part 를 공유하지 않음, 같은 내용은 commit 에서 합쳐짐)
+        """
+        key = f"{bid_no}\n{seq}\n{url}"
+        return self.tmp / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".part")
+
+    def commit(self, part: Path, sha256: str):
+        """다 받은 .part 를 해시 경로로 이동 (이미 같은 내용이 있으면 .part 삭제), 새로 저장했으면 True"""
+        target = self.path(sha256)
+        if target.exists():
+            part.unlink()
+            return False
+        target.parent.mkdir(exist_ok=True)
+        os.replace(part, target)  # 같은 내용을 동시에 받은 경우에도 원자적으로 덮어쓰므로 내용은 같음
+        return True
+
+
+class AttachmentDownloader:
+    """
+    첨부파일 다운로드 파이프라인 (ATTACH_DOWNLOAD=True)
+    - 상세 저장 시 enqueue: bid_files 에 공고 ↔ 파일 연결을 기록하고 다운로드 작업 예약 (목록/상세 수집과 병행)
+    - 동시 다운로드는 concurrency 개로 제한, 각 파일은 스레드에서 청크 단위로 .part 에 쓰면서 sha256 계산 (파일 전체를 메모리에 올리지 않음)
+    - 다 받은 파일은 해시 경로로 이동 → 변경공고마다 반복되는 공고서는 1번만 저장
+    - 중단/실패한 파일은 .part 와 bid_files(pending/failed) 가 남아 다음 실행에서 Range 요청으로 이어 받음 (max_attempts 회까지)
+    """
+
+    def __init__(self, storage, context, url_template=ATTACH_URL, root=ATTACH_DIR, headers=None,
+                 concurrency: int = ATTACH_CONCURRENCY, max_attempts: int = ATTACH_MAX_ATTEMPTS,
+                 chunk_size: int = ATTACH_CHUNK_SIZE, metrics=None):
+        self.storage = storage
+        self.context = context
+        self.url_template = url_template
+        self.store = ContentStore(root)
+        self.headers = headers or {}
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.max_attempts = max_attempts
+        self.chunk_size = chunk_size
+        self.metrics = metrics
+        self.tasks = set()
+        self.scheduled = set()  # 이번 실행에서 예약한 (bid_no, 순번)
+        self.done = storage.downloaded_files()  # (bid_no, 순번) → (파일명, 크기, URL), 이미 받은 파일
+        self.counts = Counter()  # downloaded / deduped / failed / no_url
+        self.bytes = 0
+
+    def resume(self):
+        """이전 실행에서 끝나지 못한 다운로드(pending/failed, 시도 횟수 남은 것) 재예약"""
+        items = self.storage.pending_files(self.max_attempts)
+        for item in items:
+            self._schedule(item)
+        if items:
+            logger.info(f">>> [첨부] 이전 실행에서 남은 다운로드 {len(items)}건 이어 받기")
+
+    def enqueue(self, bid_no: str, files):
+        """상세 저장 시 호출: 첨부파일 목록 [(파일명, 크기, href)] 을 공고에 연결하고, 아직 받지 않은 파일 다운로드 예약"""
+        items = [
+            {"bid_no": bid_no, "seq": index, "name": name, "size": size,
+             "url": attachment_url(self.url_template, bid_no, index, name, href)}
+            for index, (name, size, href) in enumerate(files)
+        ]
+        self.storage.link_files(bid_no, items)
+        for item in items:
+            if not item["url"]:
+                self.counts["no_url"] += 1
+            elif self.done.get((bid_no, item["seq"])) != (item["name"], item["size"], item["url"]):
+                self._schedule(item)
+
+    def _schedule(self, item):
+        key = (item["bid_no"], item["seq"])
+        if key in self.scheduled:
+            return
+        self.scheduled.add(key)
+        task = asyncio.create_task(self._download(item))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _download(self, item):
+        bid_no = item["bid_no"]
+        async with self.semaphore:
+            started = time.time()
+            try:
+                headers = dict(self.headers)
+                cookies = await self.context.cookies(item["url"]) if self.context else []
+                if cookies:
+                    headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+                part = self.store.part_path(bid_no, item["seq"], item["url"])
+                sha256, size, new = await asyncio.to_thread(self._fetch, item["url"], headers, part)
+            except Exception as e:
+                self.counts["failed"] += 1
+                self.storage.mark_file(bid_no, item["seq"], "failed", error=str(e)[:200])
+                logger.info(f"   [첨부] 다운로드 실패: {bid_no} {item['name']} ({e})", extra={"bid_no": bid_no})
+                return
+
+        duration = time.time() - started
+        self.counts["downloaded" if new else "deduped"] += 1
+        self.bytes += size
+        self.done[(bid_no, item["seq"])] = (item["name"], item["size"], item["url"])
+        self.storage.mark_file(bid_no, item["seq"], "done", sha256=sha256, size=size)
+        if self.metrics:
+            self.metrics.observe("attach.download", duration)
+        logger.debug(f"      [첨부] {item['name']} ({size:,}B, {'새 파일' if new else '같은 내용 있음'}) -> {sha256[:12]}",
+                     extra={"bid_no": bid_no, "phase": "attach", "duration": duration})
+
+    def _fetch(self, url: str, headers: dict, part: Path):
+        """스레드에서 실행: .part 에 이어 쓰며 sha256 계산 후 해시 경로로 이동 → (sha256, 크기, 새 파일 여부)"""
+        offset = part.stat().st_size if part.exists() else 0
+        try:
+            response = self._open(url, headers, offset)
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or not offset:
+                raise
+            # 이어 받을 범위가 없음(서버 파일이 바뀌었거나 .part 가 이미 끝까지 받음) → 처음부터
+            part.unlink()
+            offset = 0
+            response = self._open(url, headers, offset)
+
+        digest = hashlib.sha256()
+        with response:
+            if offset and response.status == 206:
+                with open(part, "rb") as f:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                        digest.update(chunk)
+                mode = "ab"
+            else:
+                offset, mode = 0, "wb"  # Range 미지원 서버는 처음부터
+
+            size = offset
+            expected = response.headers.get("Content-Length")
+            with open(part, mode) as f:
+                for chunk in iter(lambda: response.read(self.chunk_size), b""):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            if expected is not None and size - offset < int(expected):
+                raise IOError(f"연결 끊김 ({size - offset}/{expected}B, 다음 시도에서 이어 받음)")
+
+        sha256 = digest.hexdigest()
+        return sha256, size, self.store.commit(part, sha256)
+
+    @staticmethod
+    def _open(url: str, headers: dict, offset: int):
+        request_headers = dict(headers)
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+        return urllib.request.urlopen(urllib.request.Request(url, headers=request_headers), timeout=ATTACH_TIMEOUT)
+
+    async def close(self):
+        """예약된 다운로드가 모두 끝날 때까지 대기 후 결과 로그"""
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks), return_exceptions=True)
+        if self.metrics:
+            for name in ("downloaded", "deduped", "failed"):
+                if self.counts[name]:
+                    self.metrics.incr(f"attach.{name}", self.counts[name])
+        if sum(self.counts.values()):
+            logger.info(
+                f"   [첨부] 다운로드 {self.counts['downloaded']}건 ({self.bytes / 1024 / 1024:.1f}MB), "
+                f"같은 내용 {self.counts['deduped']}건, 실패 {self.counts['failed']}건, URL 없음 {self.counts['no_url']}건"
+            )
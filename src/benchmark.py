@@ -0,0 +1,140 @@
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from playwright.async_api import async_playwright
+from src.config import DETAIL_NAV
+from src.crawler import NuriCrawler
+from src.logger import get_logger
+from src.metrics import percentile
+from src.mock_site import MockNuriSite
+from src.storage import Storage
+
+logger = get_logger("MAIN")
+
+
+def _max_rss_mb(who):
+    """ru_maxrss (리눅스 KB, macOS bytes) → MB"""
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+class CrawlBenchmark:
+    """
+    mock 누리장터(src.mock_site)를 대상으로 한 오프라인 성능 측정
+    - 임시 DB / 브라우저 상태 없이 매 회 처음부터 수집 (run 수만큼 반복, 두 번째 run부터는 증분 경로)
+    - 처리량(공고/분), 단계별(navigate/menu_click/search/page/detail/return_to_list) p50/p95, 최대 메모리(프로세스/브라우저 RSS) 측정
+    - 메모리는 getrusage 최대 RSS 로만 측정 (tracemalloc 은 모든 할당을 추적해 처리량/지연 측정을 왜곡하므로 사용 안 함)
+    """
+
+    def __init__(self, bid_count: int = 200, latency_ms: int = 50, jitter_ms: int = 0, runs: int = 1, headless: bool = True):
+        self.bid_count = bid_count
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.runs = runs
+        self.headless = headless
+
+    async def run(self):
+        site = MockNuriSite(self.bid_count, self.latency_ms, self.jitter_ms).start()
+        tmp_dir = tempfile.TemporaryDirectory(prefix="nuri_bench_")
+        storage = Storage(db_path=Path(tmp_dir.name) / "bench.db")
+
+        results = []
+        try:
+            async with async_playwright() as p:
+                for run_no in range(1, self.runs + 1):
+                    logger.info(f"=== [벤치마크] {run_no}/{self.runs}회차 (공고 {self.bid_count}건, 지연 {self.latency_ms}ms) ===")
+                    crawler = NuriCrawler(storage, target_url=site.url, bid_list_url=None,
+                                          headless=self.headless, state_path=None,
+                                          metrics_dir=Path(tmp_dir.name) / "metrics",
+                                          detail_url=site.detail_url if DETAIL_NAV == "tab" else None,
+                                          attach_url=site.attach_url, attach_dir=Path(tmp_dir.name) / "files")
+                    last_seq = storage.change_bounds()[1] or 0
+                    started = time.time()
+                    await crawler.start(p)
+                    try:
+                        ok = await crawler.run_once()
+                    finally:
+                        await crawler.stop()
+                    elapsed = time.time() - started
+                    collected = storage.count_changes(last_seq, op="insert")  # 새로 저장된 공고 수 (DB 전체 복원 없이)
+                    results.append(self._summarize(run_no, ok, elapsed, collected, crawler.metrics.timers))
+        finally:
+            storage.close()
+            site.stop()
+            tmp_dir.cleanup()
+
+        return {
+            "config": {"bids": self.bid_count, "latency_ms": self.latency_ms, "jitter_ms": self.jitter_ms, "runs": self.runs},
+            "runs": results,
+            "memory": {
+                "process_rss_peak_mb": round(_max_rss_mb(resource.RUSAGE_SELF), 1),
+                "browser_rss_peak_mb": round(_max_rss_mb(resource.RUSAGE_CHILDREN), 1),
+            },
+        }
+
+    @staticmethod
+    def _summarize(run_no, ok, elapsed, collected, timers):
+        return {
+            "run": run_no,
+            "ok": ok,
+            "elapsed_sec": round(elapsed, 2),
+            "collected": collected,
+            "bids_per_min": round(collected / elapsed * 60, 1) if elapsed else 0.0,
+            "phases": {
+                name: {
+                    "count": len(values),
+                    "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(percentile(values, 95) * 1000, 1),
+                }
+                for name, values in sorted(timers.items())
+            },
+        }
+
+
+def report(result, baseline=None):
+    """벤치마크 결과 로그 (baseline 결과가 있으면 첫 회차 처리량/단계 p95 변화율 함께 출력)"""
+    base_run = baseline["runs"][0] if baseline and baseline.get("runs") else None
+
+    def delta(now, before):
+        if not before:
+            return ""
+        return f" ({(now - before) / before * 100:+.1f}%)"
+
+    for run in result["runs"]:
+        base = base_run if run["run"] == 1 else None
+        logger.info(
+            f">> [벤치마크] {run['run']}회차: {run['collected']}건 / {run['elapsed_sec']}초 → "
+            f"{run['bids_per_min']}건/분{delta(run['bids_per_min'], base and base['bids_per_min'])}"
+        )
+        for name, stat in run["phases"].items():
+            before = base and base["phases"].get(name, {}).get("p95_ms")
+            logger.info(
+                f"   [단계] {name}: {stat['count']}회, p50 {stat['p50_ms']}ms, "
+                f"p95 {stat['p95_ms']}ms{delta(stat['p95_ms'], before)}"
+            )
+
+    memory = result["memory"]
+    logger.info(
+        f">> [벤치마크] 최대 메모리: 프로세스 RSS {memory['process_rss_peak_mb']}MB, 브라우저 RSS {memory['browser_rss_peak_mb']}MB"
+    )
+
+
+def run_benchmark(bid_count=200, latency_ms=50, jitter_ms=0, runs=1, output=None, baseline=None, headless=True):
+    """벤치마크 실행 → 결과 로그, output 경로가 있으면 JSON 저장 (baseline JSON 과 비교 가능)"""
+    result = asyncio.run(CrawlBenchmark(bid_count, latency_ms, jitter_ms, runs, headless).run())
+
+    base = None
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            base = json.load(f)
+    report(result, base)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=4)
+        logger.info(f">> 벤치마크 결과 저장: {output}")
+    return result
@@ -0,0 +1,197 @@
+import asyncio
+import re
+import time
+from src.config import (
+    CAPTURE_LIST_URL_PATTERNS, CAPTURE_DETAIL_URL_PATTERNS,
+    CAPTURE_WAIT_TIMEOUT, CAPTURE_DETAIL_MIN_FIELDS, CAPTURE_SETTLE_SEC, CAPTURE_FIELD_LABELS
+)
+from src.logger import get_logger
+
+logger = get_logger("CAPTURE")
+
+# 첨부파일 목록 데이터셋에서 파일명/크기로 인식할 컬럼 ID
+FILE_NAME_KEYS = ("orgnlAtchFileNm", "atchFileNm", "fileNm")
+FILE_SIZE_KEYS = ("atchFileSz", "fileSz", "fileSize")
+
+HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def _iter_record_lists(payload):
+    """응답 JSON 안의 모든 'dict 리스트'를 순회 (WebSquare 는 데이터셋 이름 아래에 행 목록을 둠)"""
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) for item in payload):
+            yield payload
+        for item in payload:
+            yield from _iter_record_lists(item)
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            yield from _iter_record_lists(value)
+
+
+def _iter_records(payload):
+    """응답 JSON 안의 모든 dict 순회"""
+    if isinstance(payload, dict):
+        yield payload
+        for value in payload.values():
+            yield from _iter_records(value)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from _iter_records(item)
+
+
+def _format_datetime(value):
+    """'202602111000' 같은 숫자형 일시를 목록 표기(YYYY/MM/DD HH:MM)로 맞춤"""
+    text = str(value or "").strip()
+    digits = re.sub(r"\D", "", text)
+    if text.isdigit() and len(digits) >= 12:
+        return f"{digits[0:4]}/{digits[4:6]}/{digits[6:8]} {digits[8:10]}:{digits[10:12]}"
+    return text
+
+
+def parse_list_payload(payload):
+    """검색 응답 → read_list_rows 와 같은 형태의 행 목록 (인식 불가 시 None)"""
+    for records in _iter_record_lists(payload):
+        if "bidPbancNum" not in records[0]:
+            continue
+        return [
+            {
+                "index": index,
+                "bid_no": str(rec.get("bidPbancNum") or "").strip(),
+                "title": str(rec.get("bidPbancNm") or "").strip(),
+                "status": str(rec.get("pbancSttsGridCdNm") or "").strip(),
+                "deadline": _format_datetime(rec.get("slprRcptDdlnDt")),
+                "has_link": True,
+            }
+            for index, rec in enumerate(records)
+        ]
+    return None
+
+
+def parse_detail_payload(payload):
+    """상세 응답 → (fields, files). fields 는 (키, 값) 목록, files 는 (파일명, 크기) 목록"""
+    fields = []
+    files = []
+
+    for rec in _iter_records(payload):
+        name_key = next((k for k in FILE_NAME_KEYS if k in rec), None)
+        if name_key:
+            size_key = next((k for k in FILE_SIZE_KEYS if k in rec), None)
+            files.append((str(rec.get(name_key) or "").strip(), str(rec.get(size_key) or "").strip() if size_key else ""))
+            continue
+
+        for key, value in rec.items():
+            if isinstance(value, (dict, list)):
+                continue
+            label = CAPTURE_FIELD_LABELS.get(key) or (key if HANGUL_RE.search(key) else None)
+            if label:
+                fields.append((label, str(value if value is not None else "").strip()))
+
+    return fields, files
+
+
+class NetworkCapture:
+    """
+    page.on("response") 로 WebSquare 검색/상세 응답을 가로채 공고 레코드로 변환
+    - expect_*() 로 다음 응답을 기다릴 준비 → 클릭 → wait_*() 로 파싱 결과 수신
+    - 응답 형태를 인식하지 못하면 None 을 돌려주고, 호출 측은 DOM 추출로 폴백
+      (상세 응답은 필드가 CAPTURE_DETAIL_MIN_FIELDS 미만이고 첨부파일 목록도 아니면 시간 초과를 기다리지 않고 바로 미인식 처리)
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.list_rows = None
+        self.detail_fields = []
+        self.detail_files = []
+        self._list_event = asyncio.Event()
+        self._detail_event = asyncio.Event()
+        self._last_detail_at = 0.0
+        self._detail_miss = False
+        # 응답을 한 번도 받지 못하면(엔드포인트 불일치) 이후로는 기다리지 않고 바로 DOM 폴백
+        self.list_enabled = True
+        self.detail_enabled = True
+        self._list_seen = False
+        self._detail_seen = False
+        page.on("response", self._on_response)
+
+    @staticmethod
+    def _match(url, patterns):
+        return any(pattern in url for pattern in patterns)
+
+    async def _on_response(self, response):
+        url = response.url
+        is_list = self._match(url, CAPTURE_LIST_URL_PATTERNS)
+        is_detail = self._match(url, CAPTURE_DETAIL_URL_PATTERNS)
+        if not (is_list or is_detail):
+            return
+
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+
+        if is_list:
+            rows = parse_list_payload(payload)
+            # 인식하지 못한 응답이면 이전 목록을 버려 DOM 폴백을 유도
+            self.list_rows = rows
+            if rows is not None:
+                self._list_event.set()
+
+        if is_detail:
+            fields, files = parse_detail_payload(payload)
+            self.detail_fields.extend(fields)
+            self.detail_files.extend(files)
+            self._last_detail_at = time.time()
+            if len(self.detail_fields) >= CAPTURE_DETAIL_MIN_FIELDS:
+                self._detail_event.set()
+            elif not files and not self._detail_event.is_set():
+                # 상세 본문 응답인데 인식한 필드가 부족 → 컬럼 매핑 불일치, 바로 DOM 폴백
+                self._detail_miss = True
+                self._detail_event.set()
+
+    def expect_list(self):
+        self.list_rows = None
+        self._list_event.clear()
+
+    def expect_detail(self):
+        self.detail_fields = []
+        self.detail_files = []
+        self._detail_miss = False
+        self._detail_event.clear()
+
+    async def wait_list(self, timeout=CAPTURE_WAIT_TIMEOUT):
+        """검색/페이지 이동 응답의 행 목록 (시간 초과 또는 인식 불가면 None)"""
+        if not self.list_enabled:
+            return None
+        try:
+            await asyncio.wait_for(self._list_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            if self.list_rows is None and not self._list_seen:
+                self.list_enabled = False
+                logger.info("   [주의] 검색 응답을 인식하지 못함 -> 목록은 DOM 추출로 진행")
+            return None
+        self._list_seen = True
+        return self.list_rows
+
+    async def wait_detail(self, timeout=CAPTURE_WAIT_TIMEOUT):
+        """상세 응답의 (fields, files) (시간 초과 또는 인식 불가면 None)"""
+        if not self.detail_enabled:
+            return None
+        try:
+            await asyncio.wait_for(self._detail_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            if not self._detail_seen:
+                self.detail_enabled = False
+                logger.info("   [주의] 상세 응답을 인식하지 못함 -> 상세는 DOM 추출로 진행")
+            return None
+        if self._detail_miss:
+            if not self._detail_seen:
+                self.detail_enabled = False
+                logger.info(f"   [주의] 상세 응답 필드를 인식하지 못함({len(self.detail_fields)}개) -> 상세는 DOM 추출로 진행")
+            return None
+        self._detail_seen = True
+
+        # 첨부파일 등 후속 응답이 이어질 수 있으므로 잠시 조용해질 때까지 대기
+        while time.time() - self._last_detail_at < CAPTURE_SETTLE_SEC:
+            await asyncio.sleep(CAPTURE_SETTLE_SEC)
+
+        return list(self.detail_fields), list(self.detail_files)
@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime, timedelta
+from src.config import CHECKPOINT_MAX_AGE_HOURS
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+STATE_KEY = "checkpoint"
+
+
+class CrawlCheckpoint:
+    """
+    중단 후 재개용 체크포인트 (crawl_state 테이블에 저장)
+    - run_id: 체크포인트를 남긴 실행 ID (재개한 실행은 같은 ID 를 이어 씀)
+    - page / row: 처리 중이던 목록 페이지와 마지막으로 처리한 행 번호
+    - 실행이 끝까지(또는 증분 중단 조건까지) 마치면 삭제, 예외로 중단되면 남아 다음 실행이 해당 페이지부터 재개
+    - CHECKPOINT_MAX_AGE_HOURS 보다 오래된 체크포인트는 무시
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        saved = self._load()
+        self.resume_page = saved["page"] if saved else None
+        self.resume_row = saved.get("row", -1) if saved else -1
+        self.run_id = saved["run_id"] if saved else uuid.uuid4().hex[:12]
+        self.started_at = saved["started_at"] if saved else datetime.now().isoformat(timespec="seconds")
+
+        if saved:
+            logger.info(
+                f">>> [재개] 이전 실행({self.run_id}) 체크포인트: {self.resume_page}페이지 "
+                f"{self.resume_row + 1}번째 행까지 처리됨 -> 해당 페이지부터 이어서 수집"
+            )
+
+    def _load(self):
+        saved = self.storage.get_state(STATE_KEY)
+        if not saved or not saved.get("page"):
+            return None
+        try:
+            updated_at = datetime.fromisoformat(saved["updated_at"])
+        except (KeyError, ValueError):
+            return None
+        if datetime.now() - updated_at > timedelta(hours=CHECKPOINT_MAX_AGE_HOURS):
+            logger.info(f">>> [재개] {CHECKPOINT_MAX_AGE_HOURS}시간 지난 체크포인트 무시 ({saved.get('page')}페이지)")
+            return None
+        return saved
+
+    def skip_row(self, page_num, row_index):
+        """재개한 페이지에서 이미 처리한 행인지 (순차 처리 모드에서만 사용)"""
+        return page_num == self.resume_page and row_index <= self.resume_row
+
+    def mark(self, page_num, row_index=-1):
+        """현재 위치 저장 (row_index=-1 이면 페이지 시작)"""
+        self.storage.set_state(STATE_KEY, {
+            "run_id": self.run_id,
+            "page": page_num,
+            "row": row_index,
+            "started_at": self.started_at,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    def clear(self):
+        """정상 종료: 체크포인트 삭제 (다음 실행은 1페이지부터)"""
+        self.storage.set_state(STATE_KEY, None)
@@ -0,0 +1,143 @@
+import json
+import zlib
+from src.config import RAW_COMPRESSION
+from src.logger import get_logger
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 zlib 사용
+    zstandard = None
+
+logger = get_logger("STORAGE")
+
+# 압축 BLOB 첫 바이트 = 압축 방식 (JSON 텍스트로 저장된 이전 행은 str 로 읽힘)
+ZLIB_HEADER = b"z"
+ZSTD_HEADER = b"s"
+
+
+class RawCodec:
+    """
+    bids.raw_data 저장 형식 변환기
+    - 키는 raw_keys id, 공유 값은 raw_values id 로 바꾼 평면 배열 [키id, 값, 키id, 값, ...] 을 JSON 직렬화 후 압축
+      (값: 문자열 그대로 | 정수 = 공유 값 id | [원래 값] = 문자열이 아닌 값)
+    - BLOB 앞 1바이트로 압축 방식(zlib/zstd) 구분, 이전 형식(JSON 텍스트) 행도 그대로 읽음 → 두 형식이 섞여 있어도 됨
+    - 사전 테이블은 모든 프로세스가 공유: 새 키는 저장(bids 쓰기)과 같은 트랜잭션에서 등록하고, 모르는 id 를 만나면 DB에서 다시 읽음
+    - 그 트랜잭션이 롤백되면 호출 측이 load() 로 메모리 사전을 되돌림 (커밋되지 않은 id 재사용 방지)
+    """
+
+    def __init__(self, conn, compression=RAW_COMPRESSION):
+        self.conn = conn
+        if compression == "zstd" and zstandard is None:
+            logger.info("   [압축] zstandard 미설치 -> zlib 사용")
+            compression = "zlib"
+        self.compression = compression
+        self.load()
+
+    def load(self, cursor=None):
+        """사전 테이블(raw_keys/raw_values)을 메모리로 적재 (cursor: 다른 스레드에서 부를 때 그 스레드의 연결)"""
+        cursor = cursor or self.conn
+        rows = cursor.execute("SELECT id, key FROM raw_keys").fetchall()
+        self.key_names = dict(rows)
+        self.key_ids = {key: key_id for key_id, key in rows}
+        rows = cursor.execute("SELECT id, value FROM raw_values").fetchall()
+        self.values = dict(rows)
+        self.value_ids = {value: value_id for value_id, value in rows}
+
+    def key_id(self, key: str, cursor):
+        """키 id (처음 보는 키면 cursor 의 트랜잭션에서 raw_keys 에 추가, 커밋은 호출 측 쓰기와 함께)"""
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            cursor.execute("INSERT OR IGNORE INTO raw_keys (key) VALUES (?)", (key,))
+            key_id = cursor.execute("SELECT id FROM raw_keys WHERE key = ?", (key,)).fetchone()[0]
+            self.key_ids[key] = key_id
+            self.key_names[key_id] = key
+        return key_id
+
+    def intern(self, values):
+        """반복되는 긴 값을 raw_values 에 등록 (이후 encode 부터 id 로 저장), 새로 등록한 건수 반환"""
+        new_values = [(value,) for value in values if value not in self.value_ids]
+        if new_values:
+            self.conn.executemany("INSERT OR IGNORE INTO raw_values (value) VALUES (?)", new_values)
+            self.conn.commit()
+            self.load()
+        return len(new_values)
+
+    def encode(self, data: dict, cursor):
+        """
+        dict → 저장 값 (압축 BLOB, 압축 미사용(RAW_COMPRESSION=None)이면 JSON 텍스트)
+        - cursor: 이 값을 저장할 쓰기 트랜잭션의 커서 (writer 스레드의 op 안에서 호출 → 새 키도 같은 배치로 커밋)
+        """
+        if not self.compression:
+            return json.dumps(data, ensure_ascii=False)
+
+        flat = []
+        for key, value in data.items():
+            if isinstance(value, str):
+                value = self.value_ids.get(value, value)
+            else:
+                value = [value]
+            flat += [self.key_id(key, cursor), value]
+        payload = json.dumps(flat, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.compression == "zstd":
+            return ZSTD_HEADER + zstandard.ZstdCompressor().compress(payload)
+        return ZLIB_HEADER + zlib.compress(payload)
+
+    def decode(self, raw, cursor=None):
+        """
+        저장 값(JSON 텍스트/압축 BLOB) → dict (빈 값이면 None, 손상/해석 불가면 ValueError)
+        - cursor: writer 스레드처럼 self.conn 을 쓸 수 없는 곳에서 모르는 id 를 만났을 때 사전을 다시 읽을 연결
+        """
+        if not raw:
+            return None
+        if isinstance(raw, str):
+            return json.loads(raw)
+
+        flat = json.loads(self._decompress(bytes(raw)))
+        try:
+            return self._rebuild(flat)
+        except KeyError:
+            self.load(cursor)  # 다른 프로세스가 추가한 키/공유 값
+        try:
+            return self._rebuild(flat)
+        except KeyError as e:
+            raise ValueError(f"raw_data 사전에 없는 id: {e}")
+
+    def text(self, raw):
+        """저장 값 → JSON 텍스트 (이전 형식은 그대로, 압축분은 save 때와 같은 json.dumps 형태로 복원)"""
+        if not raw or isinstance(raw, str):
+            return raw
+        return json.dumps(self.decode(raw), ensure_ascii=False)
+
+    def sql_text(self, raw):
+        """SQLite 함수 raw_json(raw_data) 용: 해석 불가 행은 빈 문자열"""
+        try:
+            return self.text(raw) or ""
+        except ValueError:
+            return ""
+
+    @staticmethod
+    def _decompress(body: bytes):
+        header, payload = body[:1], body[1:]
+        if header == ZLIB_HEADER:
+            decompress = zlib.decompress
+        elif header == ZSTD_HEADER:
+            if zstandard is None:
+                raise ValueError("zstd 로 압축된 raw_data: zstandard 설치 필요")
+            decompress = zstandard.ZstdDecompressor().decompress
+        else:
+            raise ValueError(f"알 수 없는 raw_data 형식: {header!r}")
+        try:
+            return decompress(payload)
+        except Exception as e:  # zlib.error / zstandard.ZstdError
+            raise ValueError(f"raw_data 압축 해제 실패: {e}")
+
+    def _rebuild(self, flat):
+        data = {}
+        for i in range(0, len(flat), 2):
+            value = flat[i + 1]
+            if isinstance(value, int):
+                value = self.values[value]
+            elif isinstance(value, list):
+                value = value[0]
+            data[self.key_names[flat[i]]] = value
+        return data
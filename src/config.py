@@ -10,8 +10,210 @@ LOG_DIR = BASE_DIR / "logs"
 DATA_DIR.mkdir(exist_ok=True)
 LOG_DIR.mkdir(exist_ok=True)
 
+# 로그: 프로세스당 큐 1개 + writer 스레드 1개(QueueListener)가 콘솔/파일에 기록 (호출 측은 큐에 넣기만 함)
+LOG_LEVEL = "INFO"  # 공고별 로그(진입/스킵/저장/단계별 소요시간)는 DEBUG
+LOG_JSON = False  # True 면 logs/crawler.jsonl 에 JSON lines(ts/level/logger/msg + bid_no/page/phase/duration) 추가 기록
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 로그 파일 회전 크기
+LOG_BACKUP_COUNT = 5
+
 # 크롤링 설정
 TARGET_URL = "https://nuri.g2b.go.kr/"
 HEADLESS = False  # 브라우저 보임
 TIMEOUT = 30 * 1000  # 30초
-DB_PATH = DATA_DIR / "bids.db" # DB
\ No newline at end of file
+DB_PATH = DATA_DIR / "bids.db" # DB
+
+# 상세 수집 워커 설정
+DETAIL_WORKERS = 0  # 상세 페이지를 동시에 여는 워커 페이지 수 (0이면 목록 페이지에서 순차 처리, 실제 사이트 동시 접속 부하는 --mode bench 로 확인 후 올림)
+DETAIL_QUEUE_SIZE = 30  # 목록 순회 → 워커 대기열 상한 (가득 차면 목록 순회가 잠시 대기)
+
+# 상세 화면 이동 방식: "inline"(목록 행 클릭 → 상세 → '목록' 버튼 복귀) | "tab"(목록은 그대로 두고 상세 전용 페이지에서 DETAIL_URL 로 직접 열기)
+DETAIL_NAV = "inline"
+DETAIL_URL = None  # 상세 화면 직접 URL 템플릿 ({bid_no}, {bid_pbanc_no}, {bid_pbanc_ord} 치환), tab 모드에서 필요 (없으면 inline 으로 진행)
+
+# 추출 방식: "evaluate"(page.evaluate 1회로 목록/상세 전체 추출) | "element"(셀마다 inner_text 호출)
+EXTRACT_MODE = "evaluate"
+
+# 추출 엔진: "dom"(렌더링된 화면에서 추출) | "network"(WebSquare 응답 JSON 을 가로채 추출, 인식 실패 시 DOM 폴백)
+EXTRACT_ENGINE = "dom"
+CAPTURE_LIST_URL_PATTERNS = ["BidPbancList"]  # 검색/페이지 이동 응답 URL 에 포함된 문자열
+CAPTURE_DETAIL_URL_PATTERNS = ["BidPbancDtl", "AtchFile"]  # 상세/첨부파일 응답 URL 에 포함된 문자열
+CAPTURE_WAIT_TIMEOUT = 10  # 응답 대기 최대 시간(초)
+CAPTURE_DETAIL_MIN_FIELDS = 10  # 상세 응답으로 인정할 최소 필드 수 (미만이면 DOM 폴백)
+CAPTURE_SETTLE_SEC = 0.3  # 상세 응답 이후 후속 응답(첨부파일 등)을 기다리는 시간(초)
+# 응답 데이터셋 컬럼 ID → 저장 dict 키 (목록 그리드 col_id 및 상세 데이터셋 컬럼, 한글 키는 그대로 사용)
+# 상세 응답에서 여기 매핑되는 필드가 CAPTURE_DETAIL_MIN_FIELDS 미만이면 바로 DOM 폴백 → 엔드포인트 컬럼이 바뀌면 여기에 추가
+CAPTURE_FIELD_LABELS = {
+    # 목록 그리드
+    "bidPbancNum": "입찰공고번호",
+    "bidPbancNm": "입찰공고명",
+    "pbancSttsGridCdNm": "진행상태",
+    "slprRcptDdlnDt": "입찰서접수마감일시",
+    # 상세 - 공고일반
+    "docNo": "문서번호",
+    "emrgBidYn": "긴급입찰여부",
+    "pbancKndCdNm": "공고종류",
+    "pbancPrcsSeCdNm": "공고처리구분",
+    "bsnsDivCdNm": "업무분류",
+    "bidMthdCdNm": "입찰방식",
+    "cntrctMthdCdNm": "계약방법",
+    "scsbdMthdCdNm": "낙찰방법",
+    "rbidYn": "재입찰여부",
+    "slprRcptBgngDt": "입찰서접수시작일시",
+    "onbsDt": "개찰일시",
+    "bidGrntRcptDdlnDt": "입찰보증서 접수마감일시",
+    "bidQlfcRegDdlnDt": "입찰참가자격 등록마감일시",
+    "onbsPlc": "개찰장소",
+    "onbsScsbdRmrk": "개찰및낙찰-비고",
+    "rltPbancNo": "관련공고",
+    "pbancInfo": "공고정보",
+    # 상세 - 역경매/가격
+    "minDcrsRt": "최소인하비율(%)",
+    "bdngLmtCnt": "투찰제한횟수",
+    "autoExtnTm": "자동연장시각",
+    "bgngPrc": "시작가격",
+    "bgngPrcRegDt": "시작가격등록일시",
+    "slprRcptDdlnExtnDt": "입찰서접수마감일시(연장)",
+    # 상세 - 담당/예산
+    "chrgDeptNm": "담당부서",
+    "picNm": "담당자",
+    "vatInclYn": "부가가치세포함여부",
+    "asgnBdgtAmt": "배정예산",
+    "bssAmtUseYn": "기준금액사용여부",
+    "bssAmtRlsYn": "기준금액공개여부",
+    "bssAmt": "기준금액",
+    "qlfcExmnTrgtYn": "적격심사대상여부",
+    "qlfcExmnTbl": "적격심사표",
+    # 상세 - 참가자격
+    "rgnLmtCdNm": "지역제한",
+    "brofcPrmsnYn": "지사/지점허용여부",
+    "tpbiLmtCdNm": "업종제한",
+    "prtcpPsblRgnNm": "참가가능지역",
+    "tpbiLmtMttr": "업종제한사항",
+    "bdngPsblTpbiNm": "투찰가능한업종",
+    "prmsnTpbiNm": "허용업종",
+    # 상세 - 현장설명회
+    "siteExplnTrgtYn": "현장설명회대상여부",
+    "siteExplnDt": "현장설명회일시",
+    "siteExplnPlc": "현장설명회장소",
+    # 상세 - 단지정보
+    "cmplxNm": "단지명",
+    "cmplxAddr": "단지주소",
+    "cmplxTelno": "연락처",
+    "hmpgAddr": "홈페이지",
+    "totAr": "연면적",
+    "mngcstLevyAr": "관리비부과면적",
+    "hhldDongCnt": "세대수/동수",
+    "htngMthdNm": "난방방식",
+    "ancFcltNm": "부대및복리시설",
+}
+
+# DB 쓰기 지연(write-behind): 쓰기를 대기열에 모아 백그라운드 스레드에서 일괄 커밋 (WAL 모드)
+WRITE_BEHIND = True
+WRITE_BATCH_SIZE = 50  # 한 트랜잭션에 묶을 최대 쓰기 수
+WRITE_FLUSH_INTERVAL = 1.0  # 최대 커밋 지연(초)
+# 증분 추출(--incremental)은 이 시간(초) 이전에 수집된 행까지만 내보냄: collected_at 은 writer 가 op 를 실행할 때 찍히고
+# 커밋은 배치가 끝난 뒤라(다른 프로세스의 daemon 포함) 커서가 아직 커밋되지 않은 행을 앞질러 영영 빠뜨리지 않도록 여유를 둠
+EXPORT_HOLDBACK_SEC = 2 * WRITE_FLUSH_INTERVAL + 1
+
+# raw_data 압축 저장: 키 사전(raw_keys) + 반복되는 긴 값 공유(raw_values) + 압축 (조회/추출 시 자동 복원)
+RAW_COMPRESSION = "zlib"  # "zlib" | "zstd"(zstandard 설치 시, 없으면 zlib) | None(JSON 텍스트 그대로 저장)
+RAW_INTERN_MIN_LENGTH = 30  # 이 길이 이상이면서
+RAW_INTERN_MIN_COUNT = 3  # 이 건수 이상 반복되는 값은 raw_values 에 한 번만 저장 (--mode compact 실행 시 선정)
+
+# 증분 수집: 이미 수집된(변경 없는) 페이지가 연속되면 페이지 순회 중단
+INCREMENTAL = True
+INCREMENTAL_STOP_PAGES = 2  # 연속으로 알려진 페이지가 이만큼 나오면 중단
+FULL_SWEEP_INTERVAL_HOURS = 6  # 이 주기마다 한 번은 전체 페이지 순회
+
+# 변경공고 재수집: 이미 수집된 공고의 목록 행 지문(공고명/상태/마감일시)이 바뀌면 상세 재수집 대기열에 등록
+RECRAWL_BUDGET = 20  # 실행당 최대 상세 재수집 건수 (남은 건은 다음 실행에서 처리)
+RECRAWL_MAX_ATTEMPTS = 3  # 목록에서 공고를 찾지 못해 재수집에 실패한 항목을 제외하기까지의 시도 횟수
+# 목록 값이 그대로인 공고도 이 실행 횟수마다 1번 상세를 다시 열어 상세 지문 비교 (목록에 드러나지 않는 예산/첨부파일/입찰방식 변경공고 감지)
+# 공고번호 해시로 실행마다 나눠 확인하며, 목록 변경 감지분보다 후순위로 RECRAWL_BUDGET 을 함께 사용 (0이면 끔)
+RECRAWL_RECHECK_RUNS = 24
+
+# 대기 설정: 고정 sleep 대신 준비 신호 대기 (종류별 최대 대기 ms)
+SLOW_MO = 0  # Playwright 동작 간 지연(ms), 디버깅 시에만 사용
+LOADING_SELECTOR = "#___processbar2, .w2processbar"  # WebSquare 로딩 표시
+WAIT_TIMEOUTS = {
+    "selector": 10000,  # 요소 표시
+    "loading": 10000,  # 로딩 표시 사라짐
+    "network_idle": 15000,  # 네트워크 유휴
+    "grid": 15000,  # 목록 첫 행 변경
+    "detail": 5000,  # 상세 화면 전환(목록 그리드 사라짐)
+    "menu": 3000,  # hover 후 메뉴 펼쳐짐
+}
+
+# 요청 차단(라우팅) 프로필: "off" | "safe" | "aggressive"
+ROUTE_PROFILE = "safe"
+ROUTE_PROFILES = {
+    "off": {},
+    # WebSquare 스크립트/스타일은 유지 (표시 여부 판단이 CSS 에 의존)
+    "safe": {
+        "block_types": ["image", "media", "font"],
+        "block_patterns": ["google-analytics.com", "googletagmanager.com", "/banner/"],
+        "allow_patterns": ["/websquare/"],
+    },
+    "aggressive": {
+        "block_types": ["image", "media", "font", "stylesheet"],
+        "block_patterns": ["google-analytics.com", "googletagmanager.com", "/banner/", "/popup/"],
+        "allow_patterns": ["/websquare/"],
+    },
+}
+ROUTE_BYTES_ESTIMATE = {  # 차단 요청 1건당 절감 바이트 추정치
+    "image": 30 * 1024,
+    "media": 500 * 1024,
+    "font": 80 * 1024,
+    "stylesheet": 20 * 1024,
+    "other": 5 * 1024,
+}
+
+# 팝업 자동 차단: 컨텍스트에 init script(CSS + MutationObserver)를 1회 설치해 팝업/모달이 붙는 즉시 제거
+# (False 거나 설치 실패 시 클릭/이동 전마다 page.evaluate 로 검사해 제거)
+POPUP_SUPPRESS = True
+POPUP_SELECTORS = ".w2window, .w2popup_window"  # 공지사항 등 팝업창
+MODAL_SELECTORS = ".w2modal"  # 팝업 뒤 배경 어둠 처리 레이어
+
+# 브라우저 재사용(daemon 모드)
+BID_LIST_URL = None  # 입찰공고목록 화면 직접 URL (설정 시 메뉴 이동 생략, 실패하면 메뉴 이동)
+BROWSER_STATE_PATH = DATA_DIR / "browser_state.json"  # 쿠키/스토리지 저장 위치 (브라우저 재시작 시 복원)
+DAEMON_RESTART_EVERY = 20  # N회 실행마다 브라우저 재시작 (실패 시에는 즉시 재시작)
+
+# 실행 메트릭 (단계별 타이머/카운터): 매 실행 후 JSON + Prometheus textfile 로 저장
+METRICS_EXPORT = True
+METRICS_DIR = DATA_DIR / "metrics"  # last_run.json, nuri_crawler.prom (node_exporter textfile collector 경로로 지정 가능)
+
+# 변경 이력(bid_changes) 보관 기간: 이보다 오래된 이력은 실행 시작 시 정리 (소비자는 이 기간 안에 커서를 따라와야 함)
+CHANGELOG_RETENTION_DAYS = 7
+
+# 반복 실행 스케줄러 (interval/cron/daemon): 이전 실행이 끝나야 다음 실행 예약, 대기 시간에 무작위 지연 추가
+SCHEDULE_JITTER_SEC = 60  # interval/daemon: ±N초, cron: 0~N초 (여러 대가 같은 시각에 몰리지 않도록)
+# 적응형 간격(daemon --value adaptive): 최근 실행당 신규 공고 속도 + 시간대별 게시 패턴으로 간격 결정
+ADAPTIVE_MIN_MINUTES = 5
+ADAPTIVE_MAX_MINUTES = 60
+ADAPTIVE_TARGET_NEW_BIDS = 10  # 한 번 실행할 때 이 정도 신규 공고가 쌓이도록 간격 조절
+ADAPTIVE_SMOOTHING = 0.5  # 최근 속도 지수이동평균 가중치 (클수록 최근 실행 반영 비중↑)
+ADAPTIVE_HISTORY_DAYS = CHANGELOG_RETENTION_DAYS  # 실행 이력 보관 기간 (시간대별 패턴 계산용)
+ADAPTIVE_MIN_HOUR_SAMPLES = 3  # 시간대 속도를 쓰기 위한 같은 시간대 최소 실행 수
+
+# 중단 후 재개 체크포인트: 이보다 오래된 체크포인트는 무시하고 1페이지부터 수집
+CHECKPOINT_MAX_AGE_HOURS = 12
+
+# 샤드 수집(--mode shard): 검색 조건별로 나눠 프로세스마다 브라우저 1개씩 병렬 수집, DB 쓰기는 조정 프로세스 1곳
+SHARD_PROCESSES = 3  # 동시에 띄울 샤드 프로세스(브라우저) 수
+SHARD_RETRIES = 1  # 실패한 샤드 재시도 횟수
+SHARD_CATEGORY_SELECTOR = "#mf_wfm_container_sbxBsnsDvsnCd"  # 입찰공고목록 검색 영역의 업무분류 select (화면에 없으면 조건 없는 단일 샤드로 전환)
+SHARD_FILTERS = [  # 샤드 이름 → 추가 검색 조건 {select 선택자: 옵션 label}
+    {"name": "물품", "selects": {SHARD_CATEGORY_SELECTOR: "물품"}},
+    {"name": "용역", "selects": {SHARD_CATEGORY_SELECTOR: "용역"}},
+    {"name": "공사", "selects": {SHARD_CATEGORY_SELECTOR: "공사"}},
+]
+
+# 첨부파일 다운로드(선택): 상세 첨부파일 그리드의 파일을 내려받아 내용 해시(sha256) 경로에 1번만 저장, bid_files 테이블로 공고와 연결
+ATTACH_DOWNLOAD = False
+ATTACH_URL = None  # 다운로드 URL 템플릿 ({bid_no}/{bid_pbanc_no}/{bid_pbanc_ord}/{index}: 그리드 순번(0부터)/{name}: 파일명), 없으면 그리드 링크(href)가 있는 파일만
+ATTACH_DIR = DATA_DIR / "files"  # <ATTACH_DIR>/<해시 앞 2자리>/<sha256>, 받는 중인 파일은 <ATTACH_DIR>/tmp/*.part
+ATTACH_CONCURRENCY = 4  # 동시 다운로드 수
+ATTACH_MAX_ATTEMPTS = 3  # 실패한 파일은 다음 실행에서 이어 받기 (최대 시도 횟수)
+ATTACH_CHUNK_SIZE = 256 * 1024  # 스트리밍 읽기/쓰기 단위(바이트)
+ATTACH_TIMEOUT = 60  # 요청 타임아웃(초)
@@ -3,24 +3,72 @@ import time
 from datetime import datetime
 from playwright.async_api import async_playwright
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from src.config import TARGET_URL, HEADLESS, TIMEOUT
+from src.config import (
+    TARGET_URL, BID_LIST_URL, BROWSER_STATE_PATH, HEADLESS, TIMEOUT, SLOW_MO, DETAIL_WORKERS, DETAIL_QUEUE_SIZE,
+    DETAIL_NAV, DETAIL_URL, POPUP_SUPPRESS, POPUP_SELECTORS, MODAL_SELECTORS,
+    EXTRACT_ENGINE, CAPTURE_WAIT_TIMEOUT, METRICS_EXPORT, METRICS_DIR, ATTACH_DOWNLOAD, ATTACH_URL, ATTACH_DIR
+)
 from src.logger import get_logger
 from src.storage import Storage
+from src.workers import DetailWorkerPool, DetailJob
+from src.extractor import read_list_rows, read_detail, build_detail, file_label
+from src.capture import NetworkCapture
+from src.watermark import CrawlWatermark, page_fingerprint
+from src.checkpoint import CrawlCheckpoint
+from src.recrawl import RecrawlQueue, row_fingerprint
+from src.waits import WaitEngine
+from src.router import RequestRouter
+from src.popups import PopupSuppressor
+from src.attachments import AttachmentDownloader
+from src.metrics import Metrics
 
 logger = get_logger("CRAWLER")
 
 class NuriCrawler:
-    def __init__(self):
-        self.storage = Storage()
+    ROW_SELECTOR = "#mf_wfm_container_grdBidPbancList_body_tbody tr.grid_body_row"
+    SEARCH_BTN_SELECTOR = "#mf_wfm_container_btnS0001"
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+
+    def __init__(self, storage=None, target_url=TARGET_URL, bid_list_url=BID_LIST_URL, headless=HEADLESS,
+                 state_path=BROWSER_STATE_PATH, metrics_dir=METRICS_DIR if METRICS_EXPORT else None,
+                 search_filters=None, detail_url=DETAIL_URL if DETAIL_NAV == "tab" else None, attach_url=ATTACH_URL,
+                 attach_dir=ATTACH_DIR):
+        self.storage = storage or Storage()
+        self.target_url = target_url
+        self.bid_list_url = bid_list_url
+        self.headless = headless
+        self.state_path = state_path
+        self.metrics_dir = metrics_dir
+        self.search_filters = search_filters or {}  # 추가 검색 조건 {select 선택자: 옵션 label} (샤드 수집)
+        self.search_filter_failed = False  # 샤드 검색 조건을 적용하지 못함 (화면 개편 등 → 조정 프로세스가 조건 없는 수집으로 전환)
+        self.detail_url = detail_url  # 상세 직접 URL 템플릿 (있으면 목록 화면을 벗어나지 않고 상세 전용 페이지에서 수집)
+        self.detail_tab = None  # 순차 처리 모드에서 상세를 여는 전용 페이지 (detail_url 사용 시)
+        self.attach_url = attach_url  # 첨부파일 다운로드 URL 템플릿 (ATTACH_DOWNLOAD 시 사용)
+        self.attach_dir = attach_dir  # 첨부파일 내용 해시 저장소 경로
+        self.attachments = None  # 실행 중 첨부파일 다운로더 (ATTACH_DOWNLOAD)
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.idle_pages = []
+        self.detail_pool = None
+        self.captures = {}  # page → NetworkCapture (EXTRACT_ENGINE=network)
+        self.waits = WaitEngine()
+        self.router = RequestRouter()
+        self.popups = PopupSuppressor()
+        self.metrics = Metrics()  # 단계별 타이머/카운터 (실행마다 새로 생성)
+        self.checkpoint = None  # 실행 중 CrawlCheckpoint (_crawl_process)
+        self.recrawl = None  # 실행 중 변경공고 재수집 대기열 (_crawl_process)
 
     async def _close_blocking_popups(self, page):
-        """화면을 가리는 팝업/공지사항/모달 강제 삭제 (JS 실행)"""
+        """화면을 가리는 팝업/공지사항/모달 강제 삭제 (JS 실행, 팝업 차단 스크립트가 설치되어 있으면 생략)"""
+        if self.popups.installed:
+            return
         try:
-            count = await page.evaluate("""() => {
+            count = await page.evaluate("""([popupSelectors, modalSelectors]) => {
                 let removedCount = 0;
                 
                 // 1. 팝업창 요소 (w2window, w2popup_window 등) 찾아서 제거
-                const popups = document.querySelectorAll('.w2window, .w2popup_window');
+                const popups = document.querySelectorAll(popupSelectors);
                 popups.forEach(el => {
                     // 보이는 요소라면 삭제
                     if (el.style.display !== 'none' && el.offsetParent !== null) {
@@ -30,15 +78,16 @@ class NuriCrawler:
                 });
 
                 // 2. 배경 어둠 처리(Modal) 레이어 제거
-                const modals = document.querySelectorAll('.w2modal');
+                const modals = document.querySelectorAll(modalSelectors);
                 modals.forEach(el => {
                     el.remove();
                 });
                 
                 return removedCount;
-            }""")
+            }""", [POPUP_SELECTORS, MODAL_SELECTORS])
             
             if count > 0:
+                self.metrics.incr("popup.removed", count)
                 logger.info(f">>> [팝업] 방해 요소 {count}개 강제 삭제 완료")
                 await asyncio.sleep(0.5)
 
@@ -52,7 +101,16 @@ class NuriCrawler:
         - 안 보이면 pre_hover_selector hover로 펼침 유도
         - 그래도 안 되면 JS click fallback
         """
+        with self.metrics.timer("menu_click"):
+            ok = await self._safe_click_attempts(page, selector, label, timeout, retries, pre_hover_selector)
+        if not ok:
+            self.metrics.incr("safe_click.failed")
+        return ok
+
+    async def _safe_click_attempts(self, page, selector, label, timeout, retries, pre_hover_selector):
         for attempt in range(retries):
+            if attempt > 0:
+                self.metrics.incr("safe_click.retry")
             try:
                 await self._close_blocking_popups(page)
 
@@ -77,9 +135,9 @@ class NuriCrawler:
                 if pre_hover_selector:
                     try:
                         await page.hover(pre_hover_selector)
-                        await asyncio.sleep(0.3)
-                        if await loc.is_visible():
+                        if await self.waits.selector(page, selector, state="visible", kind="menu"):
                             await loc.click(force=True, timeout=timeout)
+                            self.metrics.incr("safe_click.hover")
                             return True
                     except:
                         pass
@@ -95,7 +153,8 @@ class NuriCrawler:
                     }""", selector)
 
                     if clicked:
-                        await asyncio.sleep(0.3)
+                        self.metrics.incr("safe_click.js_fallback")
+                        await self.waits.loading_done(page)
                         return True
                 except:
                     pass
@@ -110,37 +169,151 @@ class NuriCrawler:
         logger.info(f"   [오류] '{label}' 클릭 최종 실패: {selector}")
         return False
 
-    async def run(self):
-        start_time = time.time()
-        self.storage.clean_old_data()
+    async def start(self, playwright):
+        """브라우저/컨텍스트/메인 페이지 준비 (저장된 브라우저 상태가 있으면 쿠키 등 복원)"""
+        self.browser = await playwright.chromium.launch(headless=self.headless, slow_mo=SLOW_MO)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=HEADLESS, slow_mo=100)
+        self.context = await self.browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent=self.USER_AGENT,
+            storage_state=str(self.state_path) if self.state_path and self.state_path.exists() else None
+        )
+        await self.router.install(self.context)
+        if POPUP_SUPPRESS:
+            await self.popups.install(self.context)
+
+        self.page = await self.context.new_page()
+        self.idle_pages = []  # 실행 간 재사용하는 워커 페이지
 
-            context = await browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+    async def stop(self):
+        """브라우저 종료 (start 이전이거나 이미 종료된 경우 무시)"""
+        if self.browser:
+            try:
+                await self.browser.close()
+            except:
+                pass
+        self.browser = None
+        self.context = None
+        self.popups.installed = False  # 다음 start() 에서 새 컨텍스트에 다시 설치
+        self.page = None
+        self.detail_tab = None
+        self.idle_pages = []
+        self.captures = {}
+
+    async def run_once(self):
+        """준비된 브라우저로 1회 수집 (성공 여부 반환)"""
+        start_time = time.time()
+        self.waits = WaitEngine()
+        self.router.reset()
+        self.popups.reset()
+        self.metrics = Metrics()
+        self.storage.set_metrics(self.metrics)
+        self.storage.clean_old_data()
+        self.storage.compact_changes()
+        self.storage.preload_index()
+
+        # 첨부파일 다운로드: 상세 저장과 병행, 이전 실행에서 남은 파일부터 이어 받기
+        if ATTACH_DOWNLOAD:
+            self.attachments = AttachmentDownloader(
+                self.storage, self.context, self.attach_url, self.attach_dir,
+                headers={"User-Agent": self.USER_AGENT, "Referer": self.target_url}, metrics=self.metrics
             )
+            self.attachments.resume()
 
-            page = await context.new_page()
+        # 상세 수집 워커 풀 (워커 페이지는 첫 작업을 받을 때 목록 화면을 준비)
+        if DETAIL_WORKERS > 0:
+            self.detail_pool = DetailWorkerPool(self, self.context, DETAIL_WORKERS, DETAIL_QUEUE_SIZE)
+            self.detail_pool.start()
 
+        ok = True
+        try:
+            await self._crawl_process(self.page)
+        except Exception as e:
+            ok = False
+            logger.info(f"!!! 크롤링 중단: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            # 이미 대기열에 들어간 공고는 마저 수집
+            if self.detail_pool:
+                await self.detail_pool.close()
+                self.detail_pool = None
+            # 예약된 첨부파일 다운로드 완료 대기 (못 받은 파일은 다음 실행에서 이어 받음)
+            if self.attachments:
+                await self.attachments.close()
+                self.attachments = None
+            # 재수집하지 못한 변경공고는 다음 실행으로 이월
+            if self.recrawl:
+                pending = self.recrawl.save()
+                if pending:
+                    logger.info(f">>> [재수집] 남은 변경공고 {pending}건 -> 다음 실행에서 처리")
+                self.recrawl = None
+
+        # 다음 브라우저 시작 시 복원할 쿠키/스토리지 저장
+        if ok and self.state_path:
             try:
-                await self._crawl_process(page)
+                await self.context.storage_state(path=str(self.state_path))
             except Exception as e:
-                logger.info(f"!!! 크롤링 중단: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.info(f"   [주의] 브라우저 상태 저장 실패: {e}")
+
+        duration = time.time() - start_time
+        self.metrics.observe("run", duration)
+        self.metrics.incr("run.ok" if ok else "run.failed")
+        if self.popups.removed["popup"]:
+            self.metrics.incr("popup.removed", self.popups.removed["popup"])
+        summary = self.metrics.export(self.metrics_dir) if self.metrics_dir else self.metrics.summary()
+
+        self.waits.report()
+        self.router.report()
+        self.popups.report()
+        self.metrics.report(summary)
+        logger.info(f"== 크롤링 완료 (소요시간: {duration:.2f}초) ==", extra={"phase": "run", "duration": duration})
+        return ok
+
+    async def run(self):
+        async with async_playwright() as p:
+            await self.start(p)
+            try:
+                await self.run_once()
             finally:
+                await self.stop()
                 self.storage.close()
-                await browser.close()
 
-        duration = time.time() - start_time
-        logger.info(f"== 크롤링 완료 (소요시간: {duration:.2f}초) ==")
+    async def _ensure_bid_list(self, page):
+        """이미 입찰공고목록 화면이면 검색만 재실행, 아니면 접속부터 다시 진행"""
+        try:
+            on_list = page.url.startswith("http") and await page.is_visible(self.SEARCH_BTN_SELECTOR)
+        except:
+            on_list = False
+
+        if on_list:
+            logger.info(">>> [목록] 기존 입찰공고목록 화면 재사용 -> 검색만 재실행")
+            await self._search(page)
+        else:
+            await self._open_bid_list(page)
+
+    async def _open_bid_list(self, page):
+        """누리장터 접속 → 입찰공고목록 메뉴 이동 → '입찰개시' 검색까지 수행"""
+        if EXTRACT_ENGINE == "network" and page not in self.captures:
+            self.captures[page] = NetworkCapture(page)
+
+        if self.bid_list_url:
+            # 입찰공고목록 화면 직접 접속 (메뉴 이동 생략)
+            logger.info(">>> [메인] 입찰공고목록 직접 접속")
+            started = time.time()
+            await page.goto(self.bid_list_url, timeout=TIMEOUT)
+            await self.waits.network_idle(page)
+            await self._close_blocking_popups(page)
+            if await self.waits.selector(page, self.SEARCH_BTN_SELECTOR, state="visible"):
+                self.metrics.observe("navigate", time.time() - started)
+                await self._search(page)
+                return
+            logger.info("   [주의] 직접 접속 실패 -> 메뉴 이동으로 진행")
 
-    async def _crawl_process(self, page):
         logger.info(">>> [메인] 누리장터 접속")
-        await page.goto(TARGET_URL, timeout=TIMEOUT)
-        await page.wait_for_load_state("networkidle")
+        started = time.time()
+        await page.goto(self.target_url, timeout=TIMEOUT)
+        await self.waits.network_idle(page)
 
         await self._close_blocking_popups(page)
 
@@ -152,7 +325,7 @@ class NuriCrawler:
         if not ok:
             raise Exception("입찰공고(Depth1) 메뉴 클릭 실패")
 
-        await asyncio.sleep(1.0)  # 메뉴 펼쳐짐 대기
+        await self.waits.loading_done(page)  # 메뉴 화면 전환 대기
 
         # Depth2가 있다면 먼저 펼침 시도 (없으면 무시)
         menu2_selector = "#mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_genDepth2_0_btn_menuLvl2"
@@ -167,7 +340,6 @@ class NuriCrawler:
                     retries=2,
                     pre_hover_selector=menu1_selector
                 )
-                await asyncio.sleep(0.5)
         except:
             pass
 
@@ -186,8 +358,14 @@ class NuriCrawler:
         if not ok:
             raise Exception("입찰공고목록(Depth3) 메뉴 클릭 실패")
 
+        self.metrics.observe("navigate", time.time() - started)
+        await self._search(page)
+
+    async def _search(self, page):
+        """입찰공고목록 화면에서 '입찰개시' 필터 설정 후 검색"""
         # 2. 필터 설정
-        search_btn_selector = "#mf_wfm_container_btnS0001"
+        search_btn_selector = self.SEARCH_BTN_SELECTOR
+        started = time.time()
         await page.wait_for_selector(search_btn_selector, state="visible", timeout=TIMEOUT)
 
         try:
@@ -196,14 +374,32 @@ class NuriCrawler:
         except Exception as e:
             logger.info(f"   [주의] 필터 설정 실패: {e}")
 
+        for selector, label in self.search_filters.items():
+            # 샤드 조건은 적용되지 않으면 전체 목록을 수집하게 되므로 실패 시 중단
+            logger.info(f">>> [필터] 샤드 조건 '{label}' 선택 ({selector})")
+            try:
+                await page.select_option(selector, label=label, timeout=TIMEOUT)
+            except Exception:
+                self.search_filter_failed = True
+                raise
+
         # 3. 검색 수행
         logger.info(">>> [목록] 검색 수행")
         await self._close_blocking_popups(page)
+        capture = self.captures.get(page)
+        if capture:
+            capture.expect_list()
         await page.click(search_btn_selector, force=True)
 
-        row_selector = "#mf_wfm_container_grdBidPbancList_body_tbody tr.grid_body_row"
-        await page.wait_for_selector(row_selector, state="attached", timeout=TIMEOUT)
-        await asyncio.sleep(2)
+        await page.wait_for_selector(self.ROW_SELECTOR, state="attached", timeout=TIMEOUT)
+        if not (capture and await self._wait_for_captured_list(page, self.ROW_SELECTOR, capture)):
+            await self.waits.loading_done(page)
+        self.metrics.observe("search", time.time() - started)
+
+    async def _crawl_process(self, page):
+        await self._ensure_bid_list(page)
+        row_selector = self.ROW_SELECTOR
+        search_btn_selector = self.SEARCH_BTN_SELECTOR
 
         try:
             total_cnt_selector = "#mf_wfm_container_tbxTotCnt"
@@ -213,52 +409,266 @@ class NuriCrawler:
         except:
             pass
 
-        # 4. 페이지네이션 순회
-        while True:
-            await self._close_blocking_popups(page)
+        # 4. 페이지네이션 순회 (증분 모드면 알려진 페이지가 연속되면 중단)
+        watermark = CrawlWatermark(self.storage)
+        self.checkpoint = checkpoint = CrawlCheckpoint(self.storage)
+        self.recrawl = RecrawlQueue(self.storage)
+        await self._resume_from_checkpoint(page, row_selector, checkpoint)
+
+        completed = False
+        finished = False  # 끝까지 또는 증분 중단 조건까지 정상 종료 (체크포인트 삭제)
+        try:
+            while True:
+                await self._close_blocking_popups(page)
+
+                current_page_num = await self._get_current_page_num(page)
+
+                logger.info(f"\n>>> [페이지] {current_page_num}페이지 수집 중...",
+                            extra={"page": current_page_num, "phase": "page"})
+                if current_page_num != checkpoint.resume_page:
+                    checkpoint.mark(current_page_num)
 
+                old_first_bid_no = await self._get_first_bid_no(page, row_selector)
+
+                # 처리 전 기준으로 페이지 지문/기존 공고 여부 판단
+                rows = await self._list_rows(page, row_selector)
+                fp = page_fingerprint(rows)
+                all_known = self._rows_known(rows)
+
+                if rows and all_known and watermark.page_unchanged(current_page_num, fp):
+                    logger.info("   [증분] 이전 실행과 동일한 페이지 -> 행 검사 생략")
+                    has_next_items = True
+                else:
+                    has_next_items = await self._process_current_page(page, row_selector, search_btn_selector, current_page_num)
+                if not has_next_items:
+                    completed = finished = True
+                    break
+
+                if watermark.record_page(current_page_num, rows, fp, all_known):
+                    logger.info(f">>> [증분] 새 공고가 없는 구간에 도달해 순회 중단 ({current_page_num}페이지)")
+                    finished = True
+                    break
+
+                # 페이지 이동 로직
+                target_next_num = current_page_num + 1
+                await self.waits.loading_done(page)
+
+                next_num_btn = await page.query_selector(f".w2pageList_ul a[title='{target_next_num}']")
+                clicked_btn = None
+
+                if next_num_btn:
+                    logger.info(f">>> [이동] {target_next_num} 페이지 클릭 시도")
+                    clicked_btn = next_num_btn
+                else:
+                    next_arrow_btn = await page.query_selector(".w2pageList_control_next a")
+                    if next_arrow_btn:
+                        logger.info(">>> [이동] 다음 구간(화살표) 이동 시도")
+                        clicked_btn = next_arrow_btn
+                    else:
+                        logger.info(">>> [종료] 다음 페이지 버튼 없음 (마지막 페이지)")
+                        completed = finished = True
+                        break
+
+                started = time.time()
+                self._expect_list(page)
+                await clicked_btn.click(force=True)
+
+                is_changed = await self._wait_for_list_change(page, row_selector, old_first_bid_no)
+                self.metrics.observe("page", time.time() - started)
+
+                if not is_changed:
+                    logger.info(">>> [경고] 페이지 클릭 후 데이터가 변경되지 않았습니다. (마지막이거나 통신 장애)")
+                    if not next_num_btn:
+                        logger.info(">>> [완료] 모든 데이터 탐색 완료")
+                        completed = finished = True
+                        break
+
+            # 5. 변경공고(목록 지문 변경) 상세 재수집
+            await self._process_recrawl(page, row_selector, search_btn_selector)
+        finally:
+            watermark.save(completed)
+            if finished:
+                checkpoint.clear()
+            self.checkpoint = None
+
+    async def _resume_from_checkpoint(self, page, row_selector, checkpoint):
+        """체크포인트가 있으면 저장된 페이지로 바로 이동 (실패 시 1페이지부터 진행)"""
+        if not checkpoint.resume_page or checkpoint.resume_page <= 1:
+            return
+        with self.metrics.timer("resume"):
+            # 번호 버튼/다음 구간 이동은 한 번에 최소 1페이지씩 전진
+            moved = await self._goto_page(page, checkpoint.resume_page, row_selector,
+                                          max_steps=checkpoint.resume_page + 10)
+        if moved:
+            self.metrics.incr("checkpoint.resumed")
+            logger.info(f">>> [재개] {checkpoint.resume_page}페이지로 이동 완료")
+        else:
+            logger.info(f">>> [재개] {checkpoint.resume_page}페이지 이동 실패 -> 현재 페이지부터 진행")
+            checkpoint.resume_page = None
+
+    async def _process_recrawl(self, page, row_selector, search_btn_selector):
+        """변경공고 대기열에서 우선순위 순으로 예산만큼 꺼내 상세 재수집 (워커 풀 사용 시 워커에 위임)"""
+        for item in self.recrawl.take():
+            job = DetailJob(item["page"], item["bid_no"], item["title"], item["status"], item["list_fp"])
+            if self.detail_pool:
+                if await self.detail_pool.submit(job):
+                    logger.debug(f"   [대기열] 변경공고 재수집 요청: {job.bid_no}", extra={"bid_no": job.bid_no})
+                continue
             try:
-                active_page_el = await page.query_selector(".w2pageList_label_selected")
-                current_page_num = int((await active_page_el.inner_text()).strip()) if active_page_el else 1
-            except:
-                current_page_num = 1
+                target = await self._detail_page() if self.detail_url else page
+                if not await self._collect_job(target, job):
+                    logger.info(f"   [주의] 목록에서 변경공고를 찾지 못함: {job.bid_no}")
+            except Exception as e:
+                self.metrics.incr("detail.failed")
+                logger.info(f"   [오류] 변경공고 재수집 실패: {job.bid_no} ({e})", extra={"bid_no": job.bid_no})
+                if self.detail_url:
+                    continue
+                try:
+                    await self._return_to_list(page, row_selector, search_btn_selector)
+                except:
+                    pass
 
-            logger.info(f"\n>>> [페이지] {current_page_num}페이지 수집 중...")
+    async def _collect_job(self, page, job):
+        """job.page_num 페이지(대기 중 목록이 밀렸으면 다음 페이지)에서 공고를 찾아 상세 수집 후 목록 복귀 (못 찾으면 False)"""
+        if self.detail_url:
+            # 상세 직접 URL 이 있으면 목록 이동 없이 바로 상세 화면
+            logger.debug(f"   [진입] (상세 페이지) {job.title}", extra={"bid_no": job.bid_no})
+            await self._open_detail_direct(page, job.bid_no, job.title, job.status, job.list_fp)
+            return True
+
+        row_selector = self.ROW_SELECTOR
+        for page_num in (job.page_num, job.page_num + 1):
+            if not await self._goto_page(page, page_num, row_selector):
+                continue
+
+            link = await self._find_row_link(page, row_selector, job.bid_no)
+            if link is None:
+                continue
+
+            logger.debug(f"   [진입] ({page_num}p) {job.title}", extra={"bid_no": job.bid_no, "page": page_num})
+            await self._collect_detail(page, link, job.bid_no, job.title, job.status, job.list_fp)
+            await self._return_to_list(page, row_selector, self.SEARCH_BTN_SELECTOR)
+            return True
+        return False
 
-            old_first_bid_no = await self._get_first_bid_no(page, row_selector)
+    def _rows_known(self, rows):
+        """목록 행이 모두 DB에 같은 상태로 저장되어 있는지 (만료 행은 제외, 마감일시 보정/변경공고 재수집이 필요하면 False)"""
+        for row in rows:
+            if not row["has_link"]:
+                continue
+            deadline_dt = self._parse_deadline(row["deadline"])
+            if deadline_dt and deadline_dt <= datetime.now():
+                continue
+            db_status, db_end_date = self.storage.get_meta(row["bid_no"])
+            if not db_status or db_status != row["status"]:
+                return False
+            if deadline_dt and not (db_end_date or "").strip():
+                return False
+            list_fp = self.storage.get_fingerprints(row["bid_no"])[0]
+            if list_fp and list_fp != row_fingerprint(row):
+                return False
+        return True
 
-            has_next_items = await self._process_current_page(page, row_selector, search_btn_selector)
-            if not has_next_items:
-                break
+    @staticmethod
+    def _parse_deadline(deadline_txt):
+        """목록 마감일시(YYYY/MM/DD HH:MM) 파싱 (빈 값/형식 불일치면 None)"""
+        if not deadline_txt:
+            return None
+        try:
+            return datetime.strptime(deadline_txt, "%Y/%m/%d %H:%M")
+        except ValueError:
+            return None
 
-            # 페이지 이동 로직
-            target_next_num = current_page_num + 1
-            await asyncio.sleep(1)
+    async def _get_current_page_num(self, page):
+        """현재 선택된 페이지 번호 반환 (확인 불가 시 1)"""
+        try:
+            active_page_el = await page.query_selector(".w2pageList_label_selected")
+            return int((await active_page_el.inner_text()).strip()) if active_page_el else 1
+        except:
+            return 1
 
-            next_num_btn = await page.query_selector(f".w2pageList_ul a[title='{target_next_num}']")
-            clicked_btn = None
+    async def _goto_page(self, page, target_num, row_selector, max_steps=50):
+        """
+        목록을 target_num 페이지로 이동
+        - 번호 버튼이 보이면 클릭, 없으면 다음 구간(화살표)으로 진행
+        - 앞 페이지로 되돌아가야 하면 검색을 재실행해 1페이지부터 이동
+        """
+        for _ in range(max_steps):
+            current_num = await self._get_current_page_num(page)
+            if current_num == target_num:
+                return True
+
+            old_first_bid_no = await self._get_first_bid_no(page, row_selector)
+            btn = await page.query_selector(f".w2pageList_ul a[title='{target_num}']")
 
-            if next_num_btn:
-                logger.info(f">>> [이동] {target_next_num} 페이지 클릭 시도")
-                clicked_btn = next_num_btn
+            if not btn and target_num < current_num:
+                await self._close_blocking_popups(page)
+                self._expect_list(page)
+                await page.click(self.SEARCH_BTN_SELECTOR, force=True)
             else:
-                next_arrow_btn = await page.query_selector(".w2pageList_control_next a")
-                if next_arrow_btn:
-                    logger.info(">>> [이동] 다음 구간(화살표) 이동 시도")
-                    clicked_btn = next_arrow_btn
-                else:
-                    logger.info(">>> [종료] 다음 페이지 버튼 없음 (마지막 페이지)")
-                    break
+                if not btn:
+                    btn = await page.query_selector(".w2pageList_control_next a")
+                if not btn:
+                    return False
+                self._expect_list(page)
+                await btn.click(force=True)
 
-            await clicked_btn.click(force=True)
+            if not await self._wait_for_list_change(page, row_selector, old_first_bid_no):
+                return False
 
-            is_changed = await self._wait_for_grid_update(page, row_selector, old_first_bid_no)
+        return False
 
-            if not is_changed:
-                logger.info(">>> [경고] 페이지 클릭 후 데이터가 변경되지 않았습니다. (마지막이거나 통신 장애)")
-                if not next_num_btn:
-                    logger.info(">>> [완료] 모든 데이터 탐색 완료")
-                    break
+    async def _find_row_link(self, page, row_selector, bid_no):
+        """현재 목록에서 공고번호가 일치하는 행의 상세 링크 반환 (없으면 None)"""
+        for row in await self._list_rows(page, row_selector):
+            if row["bid_no"] == bid_no and row["has_link"]:
+                return self._row_link(page, row_selector, row["index"])
+        return None
+
+    async def _list_rows(self, page, row_selector):
+        """현재 목록 행 정보 (가로챈 검색 응답이 화면과 일치하면 그대로 사용, 아니면 DOM 추출)"""
+        capture = self.captures.get(page)
+        if capture and capture.list_rows:
+            if capture.list_rows[0]["bid_no"] == await self._get_first_bid_no(page, row_selector):
+                return capture.list_rows
+        return await read_list_rows(page, row_selector)
+
+    def _expect_list(self, page):
+        """목록이 바뀌는 클릭 직전에 호출 (network 엔진이면 다음 검색 응답을 기다릴 준비)"""
+        capture = self.captures.get(page)
+        if capture:
+            capture.expect_list()
+
+    async def _wait_for_captured_list(self, page, row_selector, capture):
+        """검색 응답 수신 후, 화면 첫 행이 응답 첫 행과 같아질 때까지 대기 (실패 시 None)"""
+        rows = await capture.wait_list()
+        if not rows:
+            return None
+        try:
+            await page.wait_for_function(
+                """([sel, bidNo]) => {
+                    const cell = document.querySelector(sel + " td[col_id='bidPbancNum']");
+                    return !!cell && cell.innerText.trim() === bidNo;
+                }""",
+                arg=[row_selector, rows[0]["bid_no"]],
+                timeout=CAPTURE_WAIT_TIMEOUT * 1000
+            )
+        except:
+            return None
+        return rows
+
+    async def _wait_for_list_change(self, page, row_selector, old_bid_no):
+        """페이지 이동 클릭 후 목록이 바뀌었는지 확인 (network 엔진은 응답 기준, 아니면 첫 행 폴링)"""
+        capture = self.captures.get(page)
+        if capture:
+            rows = await self._wait_for_captured_list(page, row_selector, capture)
+            if rows:
+                return rows[0]["bid_no"] != old_bid_no
+        return await self._wait_for_grid_update(page, row_selector, old_bid_no)
+
+    def _row_link(self, page, row_selector, index):
+        """목록 index번째 행의 상세 링크 Locator"""
+        return page.locator(row_selector).nth(index).locator("td[col_id='bidPbancNm'] a")
 
     async def _get_first_bid_no(self, page, row_selector):
         """현재 리스트의 첫 번째 공고번호 반환"""
@@ -271,19 +681,16 @@ class NuriCrawler:
             pass
         return ""
 
-    async def _wait_for_grid_update(self, page, row_selector, old_bid_no, timeout=15):
-        """페이지 이동 후 그리드 내용이 바뀔 때까지 대기"""
-        start = time.time()
-        while time.time() - start < timeout:
-            await asyncio.sleep(0.5)
-            new_bid_no = await self._get_first_bid_no(page, row_selector)
-            if new_bid_no and new_bid_no != old_bid_no:
-                return True
-        return False
+    async def _wait_for_grid_update(self, page, row_selector, old_bid_no):
+        """페이지 이동 후 그리드 내용이 바뀔 때까지 대기 (첫 행 변경 감지 후 로딩 종료 확인)"""
+        if not await self.waits.grid_change(page, row_selector, old_bid_no):
+            return False
+        await self.waits.loading_done(page)
+        return True
 
-    async def _process_current_page(self, page, row_selector, search_btn_selector):
-        """현재 페이지의 목록을 순회하며 상세 수집"""
-        rows = await page.query_selector_all(row_selector)
+    async def _process_current_page(self, page, row_selector, search_btn_selector, current_page_num=1):
+        """현재 페이지의 목록을 순회하며 상세 수집 (워커 풀이 있으면 신규 공고를 대기열로 전달)"""
+        rows = await self._list_rows(page, row_selector)
         count = len(rows)
 
         if count == 0:
@@ -293,41 +700,37 @@ class NuriCrawler:
 
         for i in range(count):
             try:
-                await asyncio.sleep(1)
+                # 워커 풀/상세 전용 페이지 사용 시 목록 화면을 벗어나지 않으므로 처음 읽은 행 정보를 그대로 사용
+                if not self.detail_pool and not self.detail_url:
+                    await self.waits.loading_done(page)
 
-                rows = await page.query_selector_all(row_selector)
-                if i >= len(rows):
-                    break
+                    rows = await self._list_rows(page, row_selector)
+                    if i >= len(rows):
+                        break
 
                 current_row = rows[i]
 
-                link_element = await current_row.query_selector("td[col_id='bidPbancNm'] a")
-                bid_no_element = await current_row.query_selector("td[col_id='bidPbancNum']")
-                status_element = await current_row.query_selector("td[col_id='pbancSttsGridCdNm']")
-                deadline_element = await current_row.query_selector("td[col_id='slprRcptDdlnDt']")
+                # 순차 처리 모드: 재개한 페이지에서 이미 처리한 행은 건너뛰고, 처리한 행 위치를 체크포인트에 기록
+                if not self.detail_pool and self.checkpoint:
+                    if self.checkpoint.skip_row(current_page_num, i):
+                        continue
+                    self.checkpoint.mark(current_page_num, i - 1)
 
-                if not link_element:
+                if not current_row["has_link"]:
                     continue
 
-                bid_no = (await bid_no_element.inner_text()).strip() if bid_no_element else f"UNKNOWN-{i}"
-                web_status = (await status_element.inner_text()).strip() if status_element else ""
-                bid_title = (await link_element.inner_text()).strip()
-
-                deadline_txt = ""
-                deadline_dt = None
+                bid_no = current_row["bid_no"] if current_row["bid_no"] is not None else f"UNKNOWN-{i}"
+                web_status = current_row["status"]
+                bid_title = current_row["title"]
+                list_fp = row_fingerprint(current_row)
 
                 # 마감일시 체크
-                if deadline_element:
-                    deadline_txt = (await deadline_element.inner_text()).strip()
-                    if deadline_txt:
-                        try:
-                            deadline_dt = datetime.strptime(deadline_txt, "%Y/%m/%d %H:%M")
-                        except ValueError:
-                            deadline_dt = None
+                deadline_txt = current_row["deadline"]
+                deadline_dt = self._parse_deadline(deadline_txt)
 
                 # 1) 목록 기준 만료 공고 스킵
                 if deadline_dt and deadline_dt <= datetime.now():
-                    logger.info(f"   [만료] 마감된 공고입니다. (마감: {deadline_txt}) -> 스킵")
+                    logger.debug(f"   [만료] 마감된 공고입니다. (마감: {deadline_txt}) -> 스킵", extra={"bid_no": bid_no})
                     continue
 
                 # 2) DB 메타 확인 (status, end_date)
@@ -336,48 +739,66 @@ class NuriCrawler:
 
                 # 2-1) 상태 변경이면: 삭제만 하고 재수집(상세 진입) 안 함
                 if db_status and db_status != web_status:
-                    logger.info(f"   [변경] 상태 변경 ({db_status} -> {web_status}). DB 삭제(재수집 없음): {bid_no}")
+                    logger.info(f"   [변경] 상태 변경 ({db_status} -> {web_status}). DB 삭제(재수집 없음): {bid_no}",
+                                extra={"bid_no": bid_no})
                     self.storage.delete(bid_no)
                     continue
 
                 # 2-2) DB end_date가 비어있고, 목록에서 deadline이 새로 확인되면 동기화
                 if db_status and not db_end_date and deadline_dt:
                     if deadline_dt <= datetime.now():
-                        logger.info(f"   [정리] DB 마감일시 공백 + 웹 마감일시 만료({deadline_txt}) -> DB 삭제: {bid_no}")
+                        logger.info(f"   [정리] DB 마감일시 공백 + 웹 마감일시 만료({deadline_txt}) -> DB 삭제: {bid_no}",
+                                    extra={"bid_no": bid_no})
                         self.storage.delete(bid_no)
                         continue
                     else:
-                        logger.info(f"   [갱신] DB 마감일시 공백 + 웹 마감일시 신규({deadline_txt}) -> end_date 업데이트: {bid_no}")
-                        self.storage.update_end_date(bid_no, deadline_txt)
+                        logger.info(f"   [갱신] DB 마감일시 공백 + 웹 마감일시 신규({deadline_txt}) -> end_date 업데이트: {bid_no}",
+                                    extra={"bid_no": bid_no})
+                        self.storage.update_end_date(bid_no, deadline_txt, list_fp)
                         continue
 
-                # 2-3) 이미 수집된 공고(상태 동일)면 스킵
+                # 2-3) 이미 수집된 공고(상태 동일): 목록 지문이 바뀌었으면(변경공고) 재수집 대기열, 주기적 재확인 차례면 재확인 대기열, 아니면 스킵
                 if db_status:
-                    logger.info(f"   [스킵] 이미 수집된 공고: {bid_no}")
+                    stored_fp = self.storage.get_fingerprints(bid_no)[0]
+                    if stored_fp is None:
+                        # 지문 도입 전 수집된 공고: 현재 목록 값을 기준 지문으로 기록
+                        self.storage.set_list_fingerprint(bid_no, list_fp)
+                    elif stored_fp != list_fp:
+                        logger.info(f"   [변경공고] 목록 값 변경 -> 상세 재수집 대기열 등록: {bid_no}", extra={"bid_no": bid_no})
+                        self.recrawl.push(current_page_num, current_row, list_fp)
+                        self.metrics.incr("recrawl.queued")
+                        continue
+                    elif self.recrawl.due_for_recheck(bid_no):
+                        # 목록에 드러나지 않는 변경(예산/첨부파일 등)은 주기적으로 상세를 다시 열어 상세 지문으로 확인
+                        logger.debug(f"   [재확인] 목록 값 동일 -> 주기적 상세 재확인 대기열 등록: {bid_no}", extra={"bid_no": bid_no})
+                        self.recrawl.push(current_page_num, current_row, list_fp, recheck=True)
+                        self.metrics.incr("recrawl.recheck")
+                        continue
+                    logger.debug(f"   [스킵] 이미 수집된 공고: {bid_no}", extra={"bid_no": bid_no})
                     continue
 
                 # 3) 신규 공고만 상세 진입/수집
-                logger.info(f"   [진입] {bid_title}")
-
-                await self._close_blocking_popups(page)
-                await link_element.click(force=True)
-                await asyncio.sleep(3)
-
-                info, files = await self.extract_detail_info(page)
+                if self.detail_pool:
+                    if await self.detail_pool.submit(DetailJob(current_page_num, bid_no, bid_title, web_status, list_fp)):
+                        logger.debug(f"   [대기열] 상세 수집 요청: {bid_no}", extra={"bid_no": bid_no})
+                    continue
 
-                info['입찰공고번호'] = bid_no
-                info['입찰공고명'] = bid_title
-                info['진행상태'] = web_status
-                if files:
-                    info['첨부파일_목록'] = ", ".join(files)
+                if self.detail_url:
+                    logger.debug(f"   [진입] (상세 페이지) {bid_title}", extra={"bid_no": bid_no})
+                    await self._open_detail_direct(await self._detail_page(), bid_no, bid_title, web_status, list_fp)
+                    continue
 
-                self.print_result(info, files)
-                self.storage.save(info)
+                logger.debug(f"   [진입] {bid_title}", extra={"bid_no": bid_no})
+                link_element = self._row_link(page, row_selector, current_row["index"])
+                await self._collect_detail(page, link_element, bid_no, bid_title, web_status, list_fp)
 
                 await self._return_to_list(page, row_selector, search_btn_selector)
 
             except Exception as e:
-                logger.info(f"   [오류] 상세 처리 실패 ({i+1}번): {e}")
+                self.metrics.incr("detail.failed")
+                logger.info(f"   [오류] 상세 처리 실패 ({i+1}번): {e}", extra={"page": current_page_num})
+                if self.detail_pool or self.detail_url:
+                    continue
                 try:
                     await self._return_to_list(page, row_selector, search_btn_selector)
                 except:
@@ -385,48 +806,97 @@ class NuriCrawler:
 
         return True
 
+    async def _collect_detail(self, page, link_element, bid_no, bid_title, web_status, list_fp=None):
+        """목록의 상세 링크 클릭 → 상세 정보 추출 → DB 저장(목록 행 지문 포함) (목록 복귀는 호출 측에서 수행)"""
+        started = time.time()
+        await self._close_blocking_popups(page)
+        capture = self.captures.get(page)
+        if capture:
+            capture.expect_detail()
+        await link_element.click(force=True)
+
+        captured = await capture.wait_detail() if capture else None
+        if captured:
+            logger.debug("      [수집] 상세 응답(JSON)에서 추출")
+            info, files = build_detail(*captured)
+        else:
+            # DOM 추출(캡처 미사용/미인식/시간 초과 모두): 목록 그리드가 사라지고(상세 화면 전환) 로딩이 끝날 때까지 대기
+            await self.waits.selector(page, self.ROW_SELECTOR, state="hidden", kind="detail")
+            await self.waits.loading_done(page)
+            info, files = await self.extract_detail_info(page)
+
+        self._save_detail(info, files, bid_no, bid_title, web_status, list_fp, started)
+
+    async def _detail_page(self):
+        """순차 처리 모드의 상세 전용 페이지 (없거나 닫혔으면 새로 열기, 목록 페이지는 그대로 유지)"""
+        if self.detail_tab is None or self.detail_tab.is_closed():
+            self.detail_tab = await self.context.new_page()
+        return self.detail_tab
+
+    def _detail_page_url(self, bid_no):
+        """상세 직접 URL (공고번호 'R26BK00000001-000' → bid_pbanc_no / bid_pbanc_ord 로도 치환 가능)"""
+        bid_pbanc_no, _, bid_pbanc_ord = bid_no.partition("-")
+        return self.detail_url.format(bid_no=bid_no, bid_pbanc_no=bid_pbanc_no, bid_pbanc_ord=bid_pbanc_ord)
+
+    async def _open_detail_direct(self, page, bid_no, bid_title, web_status, list_fp=None):
+        """상세 전용 페이지를 직접 URL 로 이동해 추출 → DB 저장 (목록 복귀/재검색 없음)"""
+        started = time.time()
+        if EXTRACT_ENGINE == "network" and page not in self.captures:
+            self.captures[page] = NetworkCapture(page)
+        capture = self.captures.get(page)
+        if capture:
+            capture.expect_detail()
+        await page.goto(self._detail_page_url(bid_no), timeout=TIMEOUT)
+
+        captured = await capture.wait_detail() if capture else None
+        if captured:
+            logger.debug("      [수집] 상세 응답(JSON)에서 추출")
+            info, files = build_detail(*captured)
+        else:
+            await self.waits.loading_done(page)
+            info, files = await self.extract_detail_info(page)
+
+        self._save_detail(info, files, bid_no, bid_title, web_status, list_fp, started)
+
+    def _save_detail(self, info, files, bid_no, bid_title, web_status, list_fp, started):
+        """추출한 상세에 목록 값(공고번호/공고명/진행상태)과 첨부파일 목록을 채워 저장 + detail 소요시간 기록"""
+
+        info['입찰공고번호'] = bid_no
+        info['입찰공고명'] = bid_title
+        info['진행상태'] = web_status
+        labels = [file_label(name, size) for name, size, _ in files]
+        if labels:
+            info['첨부파일_목록'] = ", ".join(labels)
+
+        self.print_result(info, labels, bid_no)
+        self.storage.save(info, list_fp)
+        if self.attachments:
+            self.attachments.enqueue(bid_no, files)
+
+        duration = time.time() - started
+        self.metrics.observe("detail", duration)
+        logger.debug(f"      [상세] 수집 완료: {bid_no} ({duration:.2f}초)",
+                     extra={"bid_no": bid_no, "phase": "detail", "duration": duration})
+
     async def extract_detail_info(self, target_page):
-        """상세 페이지 데이터 추출 (비동기)"""
-        extracted_data = {}
-        files = []
-        logger.info("      [수집] 상세 정보 파싱 중...")
+        """상세 페이지 데이터 추출 (비동기, EXTRACT_MODE=evaluate 이면 1회 호출로 전체 추출)"""
+        logger.debug("      [수집] 상세 정보 파싱 중...")
 
-        try:
-            await target_page.wait_for_selector("table.w2tb", state="visible", timeout=5000)
-            tables = await target_page.query_selector_all("table.w2tb")
-
-            for tbl in tables:
-                rows = await tbl.query_selector_all("tbody tr")
-                for row in rows:
-                    ths = await row.query_selector_all("th")
-                    tds = await row.query_selector_all("td")
-                    count = min(len(ths), len(tds))
-                    for i in range(count):
-                        key = (await ths[i].inner_text()).strip().replace("\n", " ").replace("\r", "")
-                        val = (await tds[i].inner_text()).strip().replace("\n", " ").replace("\r", "")
-                        if key and key not in extracted_data:
-                            extracted_data[key] = val
-        except:
-            pass
+        await self.waits.selector(target_page, "table.w2tb", state="visible")
 
         try:
-            file_rows = await target_page.query_selector_all(".w2grid_dataLayer tbody tr")
-            for row in file_rows:
-                cells = await row.query_selector_all("td")
-                if len(cells) >= 6:
-                    fname = (await cells[4].inner_text()).strip()
-                    fsize = (await cells[5].inner_text()).strip()
-                    if fname:
-                        files.append(f"{fname} ({fsize})")
+            return await read_detail(target_page)
         except:
-            pass
-
-        return extracted_data, files
+            return {}, []
 
     async def _return_to_list(self, page, row_selector, search_btn_selector):
         """목록 버튼으로 리스트 복귀 (JS 활용, 목록 버튼만 찾음)"""
+        with self.metrics.timer("return_to_list"):
+            await self._return_to_list_inner(page, row_selector, search_btn_selector)
+
+    async def _return_to_list_inner(self, page, row_selector, search_btn_selector):
         await self._close_blocking_popups(page)
-        await asyncio.sleep(1)
+        await self.waits.loading_done(page)
 
         # JS로 '눈에 보이는' 목록 버튼만 찾아서 클릭
         try:
@@ -444,7 +914,7 @@ class NuriCrawler:
             }""")
 
             if result:
-                logger.info(f"      [동작] '{result}' 버튼 클릭 완료")
+                logger.debug(f"      [동작] '{result}' 버튼 클릭 완료")
             else:
                 logger.info("      [오류] 클릭 가능한 '목록' 버튼을 찾을 수 없음 (검색 재실행 예정)")
 
@@ -454,14 +924,16 @@ class NuriCrawler:
         # 목록 화면 복구 확인
         try:
             await page.wait_for_selector(row_selector, state="visible", timeout=10000)
-            logger.info("      [확인] 목록 복구됨")
+            logger.debug("      [확인] 목록 복구됨")
         except:
+            self.metrics.incr("return_to_list.recovery")
             logger.info("      [복구] 목록 재로딩 실패. 검색 재실행")
             await self._close_blocking_popups(page)
+            self._expect_list(page)
             await page.click(search_btn_selector, force=True)
             await page.wait_for_selector(row_selector, state="visible", timeout=10000)
 
-    def print_result(self, info, files):
-        logger.info(f"      [결과] 필드 {len(info)}개, 파일 {len(files)}개")
+    def print_result(self, info, files, bid_no=None):
+        logger.debug(f"      [결과] 필드 {len(info)}개, 파일 {len(files)}개", extra={"bid_no": bid_no})
         if files:
-            logger.info(f"      - 첨부파일: {', '.join(files)}")
\ No newline at end of file
+            logger.debug(f"      - 첨부파일: {', '.join(files)}", extra={"bid_no": bid_no})
\ No newline at end of file
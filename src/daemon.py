@@ -0,0 +1,74 @@
+from playwright.async_api import async_playwright
+from src.config import DAEMON_RESTART_EVERY
+from src.crawler import NuriCrawler
+from src.logger import get_logger
+from src.scheduler import CrawlScheduler, IntervalPolicy, AdaptivePolicy
+from src.storage import Storage
+
+logger = get_logger("MAIN")
+
+
+class CrawlerDaemon:
+    """
+    브라우저를 유지한 채 주기적으로 수집하는 상주 실행기
+    - 한 번 띄운 브라우저/컨텍스트와 입찰공고목록 화면을 다음 실행에서 재사용 (검색만 재실행)
+    - 실행 실패 시 또는 DAEMON_RESTART_EVERY 회마다 브라우저를 깨끗하게 재시작
+    - 실행 간격은 CrawlScheduler 가 관리 (겹침 없음 + 지터), interval_minutes=None 이면 신규 공고 속도 기반 적응형
+    """
+
+    def __init__(self, interval_minutes=None, restart_every: int = DAEMON_RESTART_EVERY):
+        self.interval_minutes = interval_minutes
+        self.restart_every = restart_every
+        self.storage = Storage()
+        self.crawler = None
+        self.runs_since_start = 0
+
+    async def run_forever(self):
+        if self.interval_minutes:
+            policy = IntervalPolicy(self.interval_minutes)
+        else:
+            policy = AdaptivePolicy(self.storage)
+        async with async_playwright() as p:
+            try:
+                await CrawlScheduler(lambda: self.run_once(p), policy).run_forever()
+            finally:
+                await self._shutdown_browser()
+                self.storage.close()
+
+    async def run_once(self, playwright):
+        """브라우저가 없으면 띄우고 1회 수집, 필요하면 브라우저 재시작 예약 (신규 공고 수 반환, 실패 시 None)"""
+        logger.info(">> 상주 모드 크롤링 작업 시작")
+        new_bids = None
+        try:
+            last_seq = self.storage.change_bounds()[1] or 0
+            if self.crawler is None:
+                logger.info(">>> [상주] 브라우저 시작")
+                self.crawler = NuriCrawler(storage=self.storage)
+                await self.crawler.start(playwright)
+                self.runs_since_start = 0
+
+            ok = await self.crawler.run_once()
+            self.runs_since_start += 1
+            if ok:
+                new_bids = self.storage.count_changes(last_seq, op="insert")
+                logger.info(f">>> [상주] 이번 실행 신규 공고 {new_bids}건")
+
+            if not ok:
+                logger.info(">>> [상주] 실행 실패 -> 브라우저 재시작 예정")
+                await self._shutdown_browser()
+            elif self.runs_since_start >= self.restart_every:
+                logger.info(f">>> [상주] {self.runs_since_start}회 실행 -> 브라우저 재시작 예정")
+                await self._shutdown_browser()
+
+        except Exception as e:
+            logger.error(f"작업 실행 중 오류 발생: {e}")
+            await self._shutdown_browser()
+
+        logger.info(">> 크롤링 작업 종료")
+        logger.info("-" * 60 + "\n")
+        return new_bids
+
+    async def _shutdown_browser(self):
+        if self.crawler:
+            await self.crawler.stop()
+            self.crawler = None
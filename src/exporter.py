@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import sys
+import textwrap
+import time
+from datetime import datetime, timedelta, timezone
+from src.config import EXPORT_HOLDBACK_SEC
+from src.logger import get_logger
+
+logger = get_logger("MAIN")
+
+CURSOR_KEY = "export_cursor"
+
+
+def _open_output(path, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def default_filename(fmt: str, compress: bool):
+    """YYYYMMDD_HHMMSS_nuri_bids.json / .ndjson (+ .gz)"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ext = "ndjson" if fmt == "ndjson" else "json"
+    return f"{timestamp}_nuri_bids.{ext}" + (".gz" if compress else "")
+
+
+def _write_rows(f, rows, fmt: str):
+    """
+    행을 하나씩 파일에 기록 → 기록한 건수와 마지막 커서 반환
+    - ndjson: raw_data JSON 문자열을 그대로 한 줄씩 (압축 저장분은 iter_rows 에서 텍스트로 복원)
+    - json: 기존 export 와 같은 indent=4 배열을 원소 단위로 기록
+    """
+    count = 0
+    last = None
+    if fmt == "json":
+        f.write("[")
+    for bid_no, collected_at, raw in rows:
+        if not raw:
+            continue
+        if fmt == "ndjson":
+            f.write(raw)
+            f.write("\n")
+        else:
+            try:
+                obj = json.loads(raw)
+            except ValueError:
+                continue
+            f.write(",\n" if count else "\n")
+            f.write(textwrap.indent(json.dumps(obj, ensure_ascii=False, indent=4), "    "))
+        count += 1
+        last = (collected_at, bid_no)
+    if fmt == "json":
+        f.write("\n]" if count else "]")
+    return count, last
+
+
+def export_bids(storage, output=None, fmt="json", compress=False, since=None, incremental=False,
+                expiring_within=None, **filters):
+    """
+    DB → 파일 스트리밍 추출 (행 단위로 읽고 바로 기록하므로 DB 크기와 무관하게 메모리 일정)
+    - since: 이 시각(collected_at, 'YYYY-MM-DD HH:MM:SS' UTC) 이후 수집/갱신된 행만
+    - incremental: 지난 incremental 추출의 마지막 커서 이후 행만 추출하고, 성공하면 커서를 저장
+    - expiring_within: 지금부터 N시간 안에 마감되는 공고만 (deadline_from/to 대신 사용)
+    - filters: Storage._filter_clauses 조건 (status, deadline_from/to, category, budget_min/max, region ...)
+    - 출력은 임시 파일에 쓴 뒤 이름을 바꿔 하위 작업이 쓰다 만 파일을 읽지 않도록 함
+    반환: (파일명 또는 None, 건수)
+    """
+    compress = compress or bool(output and output.endswith(".gz"))
+    output = output or default_filename(fmt, compress)
+
+    after = None
+    if incremental:
+        cursor = storage.get_state(CURSOR_KEY)
+        if cursor:
+            after = tuple(cursor)
+            logger.info(f">> [추출] 증분 추출: {after[0]} ({after[1]}) 이후 변경분")
+    if since and (not after or since > after[0]):
+        after = (since, "")
+
+    if expiring_within is not None:
+        filters["deadline_from"] = int(time.time())
+        filters["deadline_to"] = filters["deadline_from"] + int(expiring_within * 3600)
+
+    # 커서를 이어가려면 수집 시각 오름차순, 그 외에는 기존과 같이 최신순
+    ascending = after is not None or incremental
+    # 최근 EXPORT_HOLDBACK_SEC 초 안에 수집된 행은 다음 증분 추출로 넘김
+    # (collected_at 은 초 단위이고 write-behind 커밋보다 먼저 찍히므로, 같은 초/커밋 대기 중인 행의 누락 방지)
+    until = None
+    if incremental:
+        until = (datetime.now(timezone.utc) - timedelta(seconds=EXPORT_HOLDBACK_SEC)).strftime("%Y-%m-%d %H:%M:%S")
+    rows = storage.iter_rows(after, until=until, ascending=ascending, **filters)
+
+    tmp_path = f"{output}.part"
+    try:
+        with _open_output(tmp_path, compress) as f:
+            count, last = _write_rows(f, rows, fmt)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if count == 0:
+        os.remove(tmp_path)
+        return None, 0
+
+    os.replace(tmp_path, output)
+    if incremental and last:
+        storage.set_state(CURSOR_KEY, list(last))
+    return output, count
+
+
+def export_changes(storage, after=None, consumer=None, limit=1000, output=None):
+    """
+    변경 이력(bid_changes)을 커서 이후부터 NDJSON 으로 출력 (output 없으면 표준출력, 이때 콘솔 로그는 호출 측에서 stderr 로)
+    - after: 이 seq 이후부터 (미지정 시 consumer 커서, 그것도 없으면 처음부터)
+    - consumer: 소비자 이름별 커서를 crawl_state 에 저장해 다음 호출에서 이어 읽음
+    반환: (건수, 마지막 seq)
+    """
+    cursor_key = f"changes_cursor:{consumer}" if consumer else None
+    if after is None:
+        after = storage.get_state(cursor_key, 0) if cursor_key else 0
+
+    min_seq, _ = storage.change_bounds()
+    if min_seq and after < min_seq - 1:
+        logger.info(f"   [주의] 커서({after}) 이후 이력 일부가 정리됨 (보관 중 최소 seq {min_seq}) -> 전체 추출로 재동기화 필요")
+
+    changes = storage.get_changes(after, limit)
+    f = open(output, "w", encoding="utf-8") if output else sys.stdout
+    try:
+        for change in changes:
+            f.write(json.dumps(change, ensure_ascii=False))
+            f.write("\n")
+    finally:
+        if output:
+            f.close()
+
+    last = changes[-1]["seq"] if changes else after
+    if cursor_key and changes:
+        storage.set_state(cursor_key, last)
+    return len(changes), last
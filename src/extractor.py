@@ -0,0 +1,122 @@
+from src.config import EXTRACT_MODE
+
+# 목록 그리드 행 → {index, bid_no, title, status, deadline, has_link} (page.evaluate 1회)
+LIST_ROWS_JS = """(rowSelector) => {
+    const text = (row, sel) => {
+        const el = row.querySelector(sel);
+        return el ? el.innerText.trim() : null;
+    };
+    return Array.from(document.querySelectorAll(rowSelector)).map((row, index) => {
+        const link = row.querySelector("td[col_id='bidPbancNm'] a");
+        return {
+            index: index,
+            bid_no: text(row, "td[col_id='bidPbancNum']"),
+            title: link ? link.innerText.trim() : "",
+            status: text(row, "td[col_id='pbancSttsGridCdNm']") || "",
+            deadline: text(row, "td[col_id='slprRcptDdlnDt']") || "",
+            has_link: !!link
+        };
+    });
+}"""
+
+# 상세 화면 table.w2tb 의 th/td 쌍 + 첨부파일 그리드(파일명/크기/링크 href) (page.evaluate 1회)
+DETAIL_JS = """() => {
+    const clean = (el) => el.innerText.trim().replace(/\\n/g, " ").replace(/\\r/g, "");
+    const fields = [];
+    document.querySelectorAll("table.w2tb").forEach(tbl => {
+        tbl.querySelectorAll("tbody tr").forEach(row => {
+            const ths = row.querySelectorAll("th");
+            const tds = row.querySelectorAll("td");
+            const count = Math.min(ths.length, tds.length);
+            for (let i = 0; i < count; i++) {
+                fields.push([clean(ths[i]), clean(tds[i])]);
+            }
+        });
+    });
+
+    const files = [];
+    document.querySelectorAll(".w2grid_dataLayer tbody tr").forEach(row => {
+        const cells = row.querySelectorAll("td");
+        if (cells.length >= 6) {
+            const link = cells[4].querySelector("a[href]");
+            files.push([cells[4].innerText.trim(), cells[5].innerText.trim(), link ? link.href : null]);
+        }
+    });
+    return {fields: fields, files: files};
+}"""
+
+
+def build_detail(fields, files):
+    """
+    (key, value) 목록과 (파일명, 크기[, 링크]) 목록을 Storage.save 형태로 변환 (같은 키는 처음 값 유지)
+    → (extracted_data, [(파일명, 크기, 링크 또는 None)])
+    """
+    extracted_data = {}
+    for key, val in fields:
+        if key and key not in extracted_data:
+            extracted_data[key] = val
+
+    attachments = [(fname, fsize, rest[0] if rest else None) for fname, fsize, *rest in files if fname]
+    return extracted_data, attachments
+
+
+def file_label(name, size):
+    """첨부파일_목록 표기: '파일명 (크기)'"""
+    return f"{name} ({size})"
+
+
+async def read_list_rows(page, row_selector, mode=EXTRACT_MODE):
+    """현재 목록 그리드의 행 정보를 한 번에 읽기"""
+    if mode == "evaluate":
+        return await page.evaluate(LIST_ROWS_JS, row_selector)
+
+    # element 모드: 행/셀마다 개별 호출 (기존 방식)
+    result = []
+    rows = await page.query_selector_all(row_selector)
+    for index, row in enumerate(rows):
+        link_element = await row.query_selector("td[col_id='bidPbancNm'] a")
+        bid_no_element = await row.query_selector("td[col_id='bidPbancNum']")
+        status_element = await row.query_selector("td[col_id='pbancSttsGridCdNm']")
+        deadline_element = await row.query_selector("td[col_id='slprRcptDdlnDt']")
+
+        result.append({
+            "index": index,
+            "bid_no": (await bid_no_element.inner_text()).strip() if bid_no_element else None,
+            "title": (await link_element.inner_text()).strip() if link_element else "",
+            "status": (await status_element.inner_text()).strip() if status_element else "",
+            "deadline": (await deadline_element.inner_text()).strip() if deadline_element else "",
+            "has_link": link_element is not None,
+        })
+    return result
+
+
+async def read_detail(page, mode=EXTRACT_MODE):
+    """상세 화면의 필드/첨부파일 추출 → (extracted_data, files)"""
+    if mode == "evaluate":
+        result = await page.evaluate(DETAIL_JS)
+        return build_detail(result["fields"], result["files"])
+
+    # element 모드: th/td 마다 개별 호출 (기존 방식)
+    fields = []
+    tables = await page.query_selector_all("table.w2tb")
+    for tbl in tables:
+        rows = await tbl.query_selector_all("tbody tr")
+        for row in rows:
+            ths = await row.query_selector_all("th")
+            tds = await row.query_selector_all("td")
+            count = min(len(ths), len(tds))
+            for i in range(count):
+                key = (await ths[i].inner_text()).strip().replace("\n", " ").replace("\r", "")
+                val = (await tds[i].inner_text()).strip().replace("\n", " ").replace("\r", "")
+                fields.append((key, val))
+
+    files = []
+    file_rows = await page.query_selector_all(".w2grid_dataLayer tbody tr")
+    for row in file_rows:
+        cells = await row.query_selector_all("td")
+        if len(cells) >= 6:
+            link = await cells[4].query_selector("a[href]")
+            href = await link.evaluate("a => a.href") if link else None
+            files.append(((await cells[4].inner_text()).strip(), (await cells[5].inner_text()).strip(), href))
+
+    return build_detail(fields, files)
@@ -0,0 +1,55 @@
+import re
+
+# 상세 raw_data 에서 뽑아 bids 의 타입 컬럼으로 저장하는 업무 필드
+CATEGORY_KEY = "업무분류"
+CONTRACT_METHOD_KEY = "계약방법"
+BUDGET_KEY = "배정예산"
+REGION_LIMIT_KEY = "지역제한"
+DEPARTMENT_KEY = "담당부서"
+OPEN_PLACE_KEY = "개찰장소"
+# 시/도 추정에 사용하는 주소성 필드 (앞쪽 우선)
+ADDRESS_KEYS = (OPEN_PLACE_KEY, "현장설명회장소", "단지주소")
+
+# 시/도 표기 → 약칭 (긴 이름부터 매칭)
+REGION_ALIASES = {
+    "충청북도": "충북", "충청남도": "충남", "전라북도": "전북", "전라남도": "전남",
+    "경상북도": "경북", "경상남도": "경남",
+    "서울": "서울", "부산": "부산", "대구": "대구", "인천": "인천", "광주": "광주", "대전": "대전",
+    "울산": "울산", "세종": "세종", "경기": "경기", "강원": "강원", "충북": "충북", "충남": "충남",
+    "전북": "전북", "전남": "전남", "경북": "경북", "경남": "경남", "제주": "제주",
+}
+REGION_RE = re.compile(
+    r"(?<![가-힣])(" + "|".join(sorted(REGION_ALIASES, key=len, reverse=True)) + r")"
+    r"(?:특별자치시|특별자치도|특별시|광역시|시|도)?(?![가-힣A-Za-z])"
+)
+AMOUNT_RE = re.compile(r"\d[\d,]*")
+
+
+def parse_amount(text):
+    """'200,000,000 원' → 200000000 (숫자가 없으면 None, 예: '원')"""
+    if not text:
+        return None
+    match = AMOUNT_RE.search(str(text))
+    return int(match.group().replace(",", "")) if match else None
+
+
+def parse_region(data: dict):
+    """개찰장소/현장설명회장소/단지주소에서 시/도 약칭 추정 (예: '부산광역시 해운대구 ...' → '부산', 못 찾으면 None)"""
+    for key in ADDRESS_KEYS:
+        match = REGION_RE.search(data.get(key) or "")
+        if match:
+            return REGION_ALIASES[match.group(1)]
+    return None
+
+
+def business_fields(data: dict):
+    """save/마이그레이션 공용: raw_data → (category, contract_method, budget, region_limit, region, department, open_place)"""
+    return (
+        data.get(CATEGORY_KEY) or None,
+        data.get(CONTRACT_METHOD_KEY) or None,
+        parse_amount(data.get(BUDGET_KEY)),
+        data.get(REGION_LIMIT_KEY) or None,
+        parse_region(data),
+        data.get(DEPARTMENT_KEY) or None,
+        data.get(OPEN_PLACE_KEY) or None,
+    )
@@ -1,25 +1,143 @@
+import atexit
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
-from src.config import LOG_DIR
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from src.config import LOG_DIR, LOG_LEVEL, LOG_JSON, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+# extra={...} 로 넘기면 JSON lines 로그에 별도 필드로 기록되는 구조화 필드
+STRUCTURED_FIELDS = ("bid_no", "page", "phase", "duration", "worker", "shard")
+
+_queue_handler = None  # 모든 로거가 공유하는 QueueHandler (이벤트 루프/스레드는 큐에 넣기만 함)
+_local_queue = None  # 이 프로세스의 로그 큐 (attach_queue 전까지 _queue_handler 가 여기에 넣음)
+_listener = None  # 큐를 비우며 콘솔/파일에 쓰는 단일 writer 스레드 (첫 로그 기록 때 시작)
+_listener_lock = threading.Lock()
+_console_stream = sys.stdout  # 콘솔 핸들러 출력 대상 (console_to_stderr 로 변경)
+_console = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """1줄 1레코드 JSON: ts, level, logger, msg + 구조화 필드(있는 것만)"""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage().strip(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = round(value, 4) if isinstance(value, float) else value
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _build_handlers():
+    # 1. 콘솔 핸들러: 메시지만 출력
+    global _console
+    console = _console = logging.StreamHandler(_console_stream)
+    console.setFormatter(logging.Formatter('%(message)s'))
+
+    # 2. 파일 핸들러: 시각 및 레벨 기록 (프로세스 안에서 writer 는 이 핸들러 하나 → 회전 시 경합 없음)
+    file_handler = RotatingFileHandler(
+        LOG_DIR / "crawler.log", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter('[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'))
+    handlers = [console, file_handler]
+
+    # 3. (선택) JSON lines: 분석용
+    if LOG_JSON:
+        json_handler = RotatingFileHandler(
+            LOG_DIR / "crawler.jsonl", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+    return handlers
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    로컬 큐에 처음 기록할 때 listener(콘솔/파일 핸들러)를 시작하는 QueueHandler
+    → import 시점에 get_logger 만 하고 attach_queue 로 부모 큐에 붙는 자식 프로세스는 로그 파일을 열지 않음
+    """
+
+    def enqueue(self, record):
+        if self.queue is _local_queue and _listener is None:
+            _start_listener()
+        super().enqueue(record)
+
+
+def _ensure_pipeline():
+    """프로세스당 1회: 큐 + QueueHandler 준비 (listener 와 로그 파일은 첫 로그 기록 때 _start_listener)"""
+    global _queue_handler, _local_queue
+    if _queue_handler is not None:
+        return _queue_handler
+
+    _local_queue = queue.SimpleQueue()
+    _queue_handler = _LazyQueueHandler(_local_queue)
+    return _queue_handler
+
+
+def _start_listener():
+    """로컬 큐의 QueueListener(콘솔/파일 핸들러) 시작, 종료 시 남은 로그 flush"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        _listener = QueueListener(_local_queue, *_build_handlers(), respect_handler_level=True)
+        _listener.start()
+    atexit.register(_stop_listener)
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def console_to_stderr():
+    """표준출력을 데이터 출력(NDJSON 등)에 쓰는 모드용: 콘솔 로그를 stderr 로 보냄"""
+    global _console_stream
+    _console_stream = sys.stderr
+    if _console is not None:
+        _console.setStream(sys.stderr)
+
 
 def get_logger(name):
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    if not logger.handlers:
-        # 1. 콘솔 핸들러: 메시지만 출력
-        console_fmt = logging.Formatter('%(message)s')
-        sh = logging.StreamHandler(sys.stdout)
-        sh.setFormatter(console_fmt)
-        logger.addHandler(sh)
-        
-        # 2. 파일 핸들러: 시각 및 레벨 기록
-        file_fmt = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s')
-        fh = RotatingFileHandler(
-            LOG_DIR / "crawler.log", maxBytes=10*1024*1024, backupCount=5, encoding='utf-8'
-        )
-        fh.setFormatter(file_fmt)
-        logger.addHandler(fh)
-        
-    return logger
\ No newline at end of file
+    logger.setLevel(getattr(logging, str(LOG_LEVEL).upper(), logging.INFO))
+
+    handler = _ensure_pipeline()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+        logger.propagate = False
+
+    return logger
+
+
+def attach_queue(log_queue):
+    """
+    자식 프로세스(샤드)용: 이 프로세스의 로그를 부모가 넘긴 multiprocessing 큐로 보냄
+    → 파일 writer 는 부모 프로세스 하나만 유지 (부모는 forward_queue 로 수신)
+    - 그 전에 로그를 쓰지 않았다면 이 프로세스에서는 listener/로그 파일이 열리지 않음
+    """
+    handler = _ensure_pipeline()
+    handler.queue = log_queue
+    _stop_listener()
+    # attach 전에 로컬 큐에 남은 레코드도 부모로 전달
+    while True:
+        try:
+            log_queue.put(_local_queue.get_nowait())
+        except queue.Empty:
+            break
+
+
+def forward_queue(log_queue):
+    """부모 프로세스용: 자식이 보낸 로그 레코드를 이 프로세스의 파이프라인으로 전달 (반환된 listener 는 stop() 필요)"""
+    listener = QueueListener(log_queue, _ensure_pipeline())
+    listener.start()
+    return listener
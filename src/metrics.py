@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+PROM_PREFIX = "nuri_crawler"
+
+
+def percentile(values, pct):
+    """정렬 후 최근접 순위(nearest-rank) 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _write_atomic(path, text):
+    """임시 파일에 쓴 뒤 교체 (node_exporter textfile collector 가 쓰다 만 파일을 읽지 않도록)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class Metrics:
+    """
+    실행 단위 타이머/카운터 수집기
+    - timer: 단계별 소요시간 목록 (navigate, menu_click, search, page, detail, return_to_list, storage.* ...)
+    - counter: 발생 횟수 (safe_click.retry, safe_click.js_fallback, return_to_list.recovery, popup.removed ...)
+    - write-behind 스레드에서도 기록하므로 lock 으로 보호
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timers = defaultdict(list)
+        self.counters = defaultdict(int)
+        self.started_at = datetime.now()
+
+    @contextmanager
+    def timer(self, name):
+        """with 블록 소요시간 기록 (예외가 나도 기록)"""
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.observe(name, time.time() - started)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            self.timers[name].append(seconds)
+        # 단계별 소요시간 로그는 DEBUG 에서만 (JSON lines 의 phase/duration 필드)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"      [단계] {name} {seconds * 1000:.0f}ms", extra={"phase": name, "duration": seconds})
+
+    def incr(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def summary(self):
+        """타이머별 count/합계/p50/p95/최대(초) + 카운터"""
+        with self.lock:
+            timers = {name: list(values) for name, values in self.timers.items()}
+            counters = dict(self.counters)
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "timers": {
+                name: {
+                    "count": len(values),
+                    "sum": round(sum(values), 4),
+                    "p50": round(percentile(values, 50), 4),
+                    "p95": round(percentile(values, 95), 4),
+                    "max": round(max(values), 4),
+                }
+                for name, values in sorted(timers.items()) if values
+            },
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def to_prometheus(self, summary=None):
+        """
+        Prometheus text exposition 형식 (이름의 '.' 은 label 로 분리하지 않고 phase/event 값에 그대로 사용)
+        - 모든 값은 마지막 실행 기준이라 실행마다 0부터 다시 세므로 counter/summary(단조 증가)가 아닌 gauge 로 내보냄
+        """
+        summary = summary or self.summary()
+        lines = [
+            f"# HELP {PROM_PREFIX}_phase_seconds_last_run Crawl phase latency quantiles of the last run in seconds.",
+            f"# TYPE {PROM_PREFIX}_phase_seconds_last_run gauge",
+        ]
+        for name, stat in summary["timers"].items():
+            lines.append(f'{PROM_PREFIX}_phase_seconds_last_run{{phase="{name}",quantile="0.5"}} {stat["p50"]}')
+            lines.append(f'{PROM_PREFIX}_phase_seconds_last_run{{phase="{name}",quantile="0.95"}} {stat["p95"]}')
+        lines.append(f"# HELP {PROM_PREFIX}_phase_seconds_sum_last_run Total time spent per phase in the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_phase_seconds_sum_last_run gauge")
+        for name, stat in summary["timers"].items():
+            lines.append(f'{PROM_PREFIX}_phase_seconds_sum_last_run{{phase="{name}"}} {stat["sum"]}')
+        lines.append(f"# HELP {PROM_PREFIX}_phase_count_last_run Number of timed operations per phase in the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_phase_count_last_run gauge")
+        for name, stat in summary["timers"].items():
+            lines.append(f'{PROM_PREFIX}_phase_count_last_run{{phase="{name}"}} {stat["count"]}')
+
+        lines.append(f"# HELP {PROM_PREFIX}_events_last_run Crawl event counts of the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_events_last_run gauge")
+        for name, value in summary["counters"].items():
+            lines.append(f'{PROM_PREFIX}_events_last_run{{event="{name}"}} {value}')
+
+        lines.append(f"# HELP {PROM_PREFIX}_last_run_timestamp_seconds Start time of the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{PROM_PREFIX}_last_run_timestamp_seconds {int(self.started_at.timestamp())}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, metrics_dir):
+        """metrics_dir 에 last_run.json / nuri_crawler.prom 저장 (매 실행 덮어씀)"""
+        summary = self.summary()
+        try:
+            metrics_dir.mkdir(parents=True, exist_ok=True)
+            _write_atomic(metrics_dir / "last_run.json", json.dumps(summary, ensure_ascii=False, indent=4))
+            _write_atomic(metrics_dir / f"{PROM_PREFIX}.prom", self.to_prometheus(summary))
+        except OSError as e:
+            logger.info(f"   [주의] 메트릭 파일 저장 실패: {e}")
+        return summary
+
+    def report(self, summary=None):
+        """단계별 p50/p95 요약 로그"""
+        summary = summary or self.summary()
+        for name, stat in summary["timers"].items():
+            logger.info(
+                f"   [메트릭] {name}: {stat['count']}회, 합계 {stat['sum']:.1f}초, "
+                f"p50 {stat['p50'] * 1000:.0f}ms, p95 {stat['p95'] * 1000:.0f}ms, 최대 {stat['max'] * 1000:.0f}ms"
+            )
+        if summary["counters"]:
+            detail = ", ".join(f"{name} {value}" for name, value in summary["counters"].items())
+            logger.info(f"   [메트릭] 카운터: {detail}")
@@ -0,0 +1,400 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from src.config import BASE_DIR
+
+# 합성 공고의 원본 레코드 (export 결과물)
+FIXTURE_DIR = BASE_DIR / "test" / "json"
+PAGE_SIZE = 10
+
+# 상세 표(table.w2tb)에 싣지 않는 키 (크롤러가 목록 값으로 채우거나 첨부파일 그리드로 표시)
+NON_DETAIL_KEYS = ("진행상태", "첨부파일_목록")
+FILE_RE = re.compile(r"(.+?) \(([^()]*?B)\)(?:, |$)")
+
+
+def load_fixtures():
+    """test/json 의 export 레코드 로드 (공고번호 기준 중복 제거)"""
+    records = {}
+    for path in sorted(FIXTURE_DIR.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            for rec in json.load(f):
+                records.setdefault(rec.get("입찰공고번호"), rec)
+    return list(records.values())
+
+
+def generate_bids(count: int, seed: int = 0):
+    """fixture 레코드를 돌려 쓰며 공고번호/마감일시만 바꾼 합성 공고 count 건 생성 (최신 공고가 앞)"""
+    rng = random.Random(seed)
+    templates = load_fixtures()
+    now = datetime.now()
+
+    bids = []
+    for i in range(count):
+        rec = dict(templates[i % len(templates)])
+        deadline = now + timedelta(days=rng.randint(1, 30), hours=rng.randint(0, 23))
+        files = FILE_RE.findall(rec.get("첨부파일_목록", ""))
+
+        rec["입찰공고번호"] = f"R26BK{90000000 + count - i:08d}-000"
+        rec["진행상태"] = "입찰개시"
+        # 상세 화면은 날짜/시각이 줄바꿈으로 붙어 추출되므로 실제 사이트와 같은 표기로 맞춤
+        rec["입찰서접수마감일시"] = deadline.strftime("%Y/%m/%d%H:%M")
+        bids.append({
+            "record": rec,
+            "deadline": deadline.strftime("%Y/%m/%d %H:%M"),
+            "files": files,
+        })
+    return bids
+
+
+PAGE_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>누리장터 (mock)</title>
+<link rel="stylesheet" href="/static/site.css">
+<style>
+  .hidden { display: none; }
+  #___processbar2 { position: fixed; top: 0; left: 0; right: 0; height: 4px; background: #36c; }
+  .w2modal { position: fixed; top: 0; left: 0; right: 0; bottom: 0; background: rgba(0,0,0,.3); z-index: 99; }
+  .w2window { position: fixed; top: 120px; left: 120px; width: 420px; height: 220px; background: #fff; border: 1px solid #333; z-index: 100; }
+  table { border-collapse: collapse; }
+  td, th { border: 1px solid #ccc; padding: 2px 6px; }
+  .w2pageList_ul { display: inline; list-style: none; }
+  .w2pageList_ul li { display: inline; margin: 0 3px; }
+</style>
+</head>
+<body>
+<div id="___processbar2" style="display:none"></div>
+<img src="/banner/main.png" alt="banner" width="600" height="60">
+
+<div id="mf_wfm_gnb">
+  <button id="mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_btn_menuLvl1">입찰공고</button>
+  <div id="gnbSub" class="hidden">
+    <button id="mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_genDepth2_0_btn_menuLvl2">입찰공고</button>
+    <button id="mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_genDepth2_0_genDepth3_0_btn_menuLvl3">입찰공고목록</button>
+  </div>
+</div>
+
+<div id="listScreen" class="hidden">
+  <select id="mf_wfm_container_sbxPrgrsStts">
+    <option value="">전체</option>
+    <option value="입찰개시">입찰개시</option>
+    <option value="입찰마감">입찰마감</option>
+  </select>
+  <select id="mf_wfm_container_sbxBsnsDvsnCd">
+    <option value="">전체</option>
+    <option value="물품">물품</option>
+    <option value="용역">용역</option>
+    <option value="공사">공사</option>
+  </select>
+  <input type="button" id="mf_wfm_container_btnS0001" value="검색">
+  <span>Total <span id="mf_wfm_container_tbxTotCnt">0</span></span>
+  <table id="mf_wfm_container_grdBidPbancList_body_table">
+    <tbody id="mf_wfm_container_grdBidPbancList_body_tbody"></tbody>
+  </table>
+  <div class="w2pageList">
+    <ul class="w2pageList_ul"></ul>
+    <span class="w2pageList_control_next"></span>
+  </div>
+</div>
+
+<div id="detailScreen" class="hidden">
+  <table class="w2tb"><tbody id="detailBody"></tbody></table>
+  <div class="w2grid_dataLayer"><table><tbody id="fileBody"></tbody></table></div>
+  <input type="button" value="목록" id="btnList">
+</div>
+
+<div id="noticeModal" class="w2modal"></div>
+<div id="noticePopup" class="w2window">공지사항 (mock)</div>
+
+<script>
+const PAGE_SIZE = %(page_size)d;
+const BLOCK_SIZE = 10;
+const state = { page: 1, status: "", category: "", total: 0, rows: [] };
+const $ = (id) => document.getElementById(id);
+const esc = (s) => String(s == null ? "" : s).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+
+async function api(url) {
+  $("___processbar2").style.display = "block";
+  try {
+    const res = await fetch(url);
+    return await res.json();
+  } finally {
+    $("___processbar2").style.display = "none";
+  }
+}
+
+function openMenu() { $("gnbSub").classList.remove("hidden"); }
+$("mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_btn_menuLvl1").addEventListener("click", openMenu);
+$("mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_btn_menuLvl1").addEventListener("mouseenter", openMenu);
+$("mf_wfm_gnb_wfm_gnbMenu_genDepth1_1_genDepth2_0_genDepth3_0_btn_menuLvl3").addEventListener("click", () => {
+  $("detailScreen").classList.add("hidden");
+  $("listScreen").classList.remove("hidden");
+});
+
+async function loadPage(page) {
+  const data = await api(`/api/BidPbancList?page=${page}&status=${encodeURIComponent(state.status)}&category=${encodeURIComponent(state.category)}`);
+  state.page = page;
+  state.total = data.totCnt;
+  state.rows = data.dlBidPbancList;
+  renderGrid();
+  renderPaging();
+}
+
+function renderGrid() {
+  const tbody = $("mf_wfm_container_grdBidPbancList_body_tbody");
+  tbody.innerHTML = "";
+  state.rows.forEach((row, i) => {
+    const tr = document.createElement("tr");
+    tr.className = "grid_body_row";
+    tr.innerHTML =
+      `<td col_id="rnum">${(state.page - 1) * PAGE_SIZE + i + 1}</td>` +
+      `<td col_id="bidPbancNum">${esc(row.bidPbancNum)}</td>` +
+      `<td col_id="bidPbancNm"><a href="javascript:void(0)">${esc(row.bidPbancNm)}</a></td>` +
+      `<td col_id="pbancSttsGridCdNm">${esc(row.pbancSttsGridCdNm)}</td>` +
+      `<td col_id="slprRcptDdlnDt">${esc(row.slprRcptDdlnDt)}</td>`;
+    tr.querySelector("a").addEventListener("click", () => openDetail(row.bidPbancNum));
+    tbody.appendChild(tr);
+  });
+  $("mf_wfm_container_tbxTotCnt").innerText = state.total;
+}
+
+function renderPaging() {
+  const last = Math.max(1, Math.ceil(state.total / PAGE_SIZE));
+  const start = Math.floor((state.page - 1) / BLOCK_SIZE) * BLOCK_SIZE + 1;
+  const end = Math.min(last, start + BLOCK_SIZE - 1);
+  const ul = document.querySelector(".w2pageList_ul");
+  ul.innerHTML = "";
+  for (let p = start; p <= end; p++) {
+    const li = document.createElement("li");
+    if (p === state.page) {
+      li.innerHTML = `<span class="w2pageList_label_selected">${p}</span>`;
+    } else {
+      li.innerHTML = `<a href="javascript:void(0)" title="${p}">${p}</a>`;
+      li.querySelector("a").addEventListener("click", () => loadPage(p));
+    }
+    ul.appendChild(li);
+  }
+  const next = document.querySelector(".w2pageList_control_next");
+  next.innerHTML = "";
+  if (end < last) {
+    next.innerHTML = `<a href="javascript:void(0)" title="다음">&gt;</a>`;
+    next.querySelector("a").addEventListener("click", () => loadPage(end + 1));
+  }
+}
+
+async function openDetail(bidNo) {
+  const data = await api(`/api/BidPbancDtl?bidNo=${encodeURIComponent(bidNo)}`);
+  const fields = Object.entries(data.dmBidPbancDtl);
+  let html = "";
+  for (let i = 0; i < fields.length; i += 2) {
+    html += "<tr>";
+    fields.slice(i, i + 2).forEach(([k, v]) => { html += `<th>${esc(k)}</th><td>${esc(v)}</td>`; });
+    html += "</tr>";
+  }
+  $("detailBody").innerHTML = html;
+  $("fileBody").innerHTML = data.dlAtchFile.map((f, i) =>
+    `<tr><td>${i + 1}</td><td>공고서</td><td></td><td></td><td>${esc(f.atchFileNm)}</td><td>${esc(f.atchFileSz)}</td></tr>`
+  ).join("");
+  $("listScreen").classList.add("hidden");
+  $("detailScreen").classList.remove("hidden");
+}
+
+$("btnList").addEventListener("click", () => {
+  $("detailScreen").classList.add("hidden");
+  $("listScreen").classList.remove("hidden");
+});
+
+$("mf_wfm_container_btnS0001").addEventListener("click", () => {
+  state.status = $("mf_wfm_container_sbxPrgrsStts").value;
+  state.category = $("mf_wfm_container_sbxBsnsDvsnCd").value;
+  loadPage(1);
+});
+
+// 상세 직접 접속 (?bidNo=...): 목록 없이 상세 화면만 표시
+const directBidNo = new URLSearchParams(location.search).get("bidNo");
+if (directBidNo) openDetail(directBidNo);
+</script>
+</body>
+</html>
+"""
+
+
+class MockNuriSite:
+    """
+    누리장터 WebSquare 화면을 흉내 내는 로컬 서버
+    - GNB 메뉴 ID, 진행상태/업무분류 검색 조건, grdBidPbancList 그리드, 페이지네이션, table.w2tb 상세, 첨부파일 그리드, 공지 팝업, '목록' 버튼
+    - 검색/상세 데이터는 JSON API(BidPbancList/BidPbancDtl)로 내려줌 (network 추출 엔진 확인용)
+    - '?bidNo=' 로 접속하면 상세 화면을 바로 표시 (DETAIL_NAV="tab" 확인용)
+    - '/files/<공고번호>/<순번>' 첨부파일 다운로드 (파일명이 같으면 내용도 같음, Range 이어 받기 지원)
+    - latency_ms(+jitter_ms) 만큼 API 응답 지연
+    """
+
+    def __init__(self, bid_count: int = 1000, latency_ms: int = 0, jitter_ms: int = 0, port: int = 0, seed: int = 0):
+        self.bids = generate_bids(bid_count, seed)
+        self.by_no = {bid["record"]["입찰공고번호"]: bid for bid in self.bids}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def detail_url(self):
+        """상세 직접 URL 템플릿 (NuriCrawler(detail_url=...) 용)"""
+        return self.url + "?bidNo={bid_no}"
+
+    @property
+    def attach_url(self):
+        """첨부파일 다운로드 URL 템플릿 (NuriCrawler(attach_url=...) 용)"""
+        return self.url + "files/{bid_no}/{index}"
+
+    def file_content(self, bid_no: str, index: int):
+        """첨부파일 내용: 파일명으로 정해지는 4~64KB 바이트 (변경공고마다 같은 공고서 → 같은 내용)"""
+        bid = self.by_no.get(bid_no)
+        if not bid or not 0 <= index < len(bid["files"]):
+            return None
+        seed = hashlib.sha256(bid["files"][index][0].encode("utf-8")).digest()
+        return seed * (128 + seed[0] * 8)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-nuri", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+
+    def list_payload(self, page: int, status: str, category: str = ""):
+        rows = [
+            bid for bid in self.bids
+            if (not status or bid["record"]["진행상태"] == status)
+            and (not category or bid["record"].get("업무분류") == category)
+        ]
+        chunk = rows[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+        return {
+            "totCnt": len(rows),
+            "dlBidPbancList": [
+                {
+                    "bidPbancNum": bid["record"]["입찰공고번호"],
+                    "bidPbancNm": bid["record"].get("입찰공고명", ""),
+                    "pbancSttsGridCdNm": bid["record"]["진행상태"],
+                    "slprRcptDdlnDt": bid["deadline"],
+                }
+                for bid in chunk
+            ],
+        }
+
+    def detail_payload(self, bid_no: str):
+        bid = self.by_no.get(bid_no)
+        if not bid:
+            return None
+        return {
+            "dmBidPbancDtl": {k: v for k, v in bid["record"].items() if k not in NON_DETAIL_KEYS},
+            "dlAtchFile": [{"atchFileNm": name, "atchFileSz": size} for name, size in bid["files"]],
+        }
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                pass
+
+            def _send(self, status, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, payload):
+                if payload is None:
+                    self._send(404, b"{}", "application/json")
+                    return
+                self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+            def _send_file(self, parts):
+                try:
+                    body = site.file_content(parts[0], int(parts[1]))
+                except (IndexError, ValueError):
+                    body = None
+                if body is None:
+                    self._send(404, b"not found", "text/plain")
+                    return
+                match = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+                if not match:
+                    self._send(200, body, "application/octet-stream")
+                    return
+                start = int(match.group(1))
+                if start >= len(body):
+                    self._send(416, b"", "application/octet-stream")
+                    return
+                self.send_response(206)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                self.wfile.write(body[start:])
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+
+                if parsed.path == "/":
+                    self._send(200, (PAGE_HTML % {"page_size": PAGE_SIZE}).encode("utf-8"), "text/html; charset=utf-8")
+                elif parsed.path == "/api/BidPbancList":
+                    site._delay()
+                    page = int(query.get("page", ["1"])[0])
+                    self._send_json(site.list_payload(page, query.get("status", [""])[0], query.get("category", [""])[0]))
+                elif parsed.path == "/api/BidPbancDtl":
+                    site._delay()
+                    self._send_json(site.detail_payload(query.get("bidNo", [""])[0]))
+                elif parsed.path.startswith("/files/"):
+                    self._send_file(parsed.path.split("/")[2:])
+                elif parsed.path == "/static/site.css":
+                    self._send(200, b"body { font-family: sans-serif; }", "text/css")
+                elif parsed.path.startswith("/banner/"):
+                    self._send(200, b"\x89PNG\r\n\x1a\n" + b"\0" * 20000, "image/png")
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="누리장터 mock 서버")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--bids", type=int, default=1000, help="합성 공고 수")
+    parser.add_argument("--latency", type=int, default=0, help="API 응답 지연(ms)")
+    parser.add_argument("--jitter", type=int, default=0, help="API 응답 지연 편차(ms)")
+    args = parser.parse_args()
+
+    site = MockNuriSite(args.bids, args.latency, args.jitter, port=args.port)
+    print(f"mock 누리장터: {site.url} (공고 {len(site.bids)}건)")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import json
+from collections import Counter
+from src.config import POPUP_SELECTORS, MODAL_SELECTORS
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+BINDING_NAME = "__nuriPopupRemoved"
+
+# 문서 생성 직후(페이지 스크립트보다 먼저) 실행: MutationObserver 로 화면에 보이게 된 팝업을 제거
+# - 기존 검사와 같이 '보이는' 팝업만 제거 (숨겨 둔 대화상자는 건드리지 않음), 배경 모달은 팝업을 지운 경우에만 제거
+# - 생성 후 표시되는 팝업도 잡도록 style/class 변경도 감시
+INIT_SCRIPT = """(() => {
+  if (window.__nuriPopupGuard) return;
+  window.__nuriPopupGuard = true;
+  const POPUPS = %(popups)s;
+  const MODALS = %(modals)s;
+
+  const report = (kind, count) => {
+    try { if (count && window.%(binding)s) window.%(binding)s(kind, count); } catch (e) {}
+  };
+  const visible = el => el.isConnected && el.getClientRects().length > 0
+    && getComputedStyle(el).visibility !== "hidden";
+  const candidates = node => {
+    if (node.nodeType !== 1) return [];
+    const found = node.matches(POPUPS) ? [node] : [];
+    return found.concat(Array.from(node.querySelectorAll(POPUPS)));
+  };
+
+  let scheduled = null;
+  const pending = new Set();
+  const sweep = () => {
+    scheduled = null;
+    let popups = 0, modals = 0;
+    for (const el of pending) {
+      if (visible(el)) { el.remove(); popups++; }
+    }
+    pending.clear();
+    if (popups) {
+      document.querySelectorAll(MODALS).forEach(el => { el.remove(); modals++; });
+    }
+    report("popup", popups);
+    report("modal", modals);
+  };
+
+  new MutationObserver(records => {
+    for (const record of records) {
+      const nodes = record.type === "attributes" ? [record.target] : record.addedNodes;
+      for (const node of nodes) candidates(node).forEach(el => pending.add(el));
+    }
+    // 같은 작업 안의 변경(추가 후 표시)을 모아 레이아웃 계산은 1번만
+    if (pending.size && !scheduled) scheduled = Promise.resolve().then(sweep);
+  }).observe(document, { childList: true, subtree: true, attributes: true, attributeFilter: ["style", "class"] });
+})();"""
+
+
+class PopupSuppressor:
+    """
+    컨텍스트 단위 팝업 차단기 (context.add_init_script 로 1회 설치)
+    - 모든 페이지/프레임에 문서 생성 직후 MutationObserver 를 주입해 팝업이 화면에 보이는 즉시 제거 (배경 모달 포함)
+    - 제거 건수는 expose_binding 으로 받아 실행별로 집계 (클릭 전마다 page.evaluate 로 검사할 필요 없음)
+    """
+
+    def __init__(self, popup_selectors: str = POPUP_SELECTORS, modal_selectors: str = MODAL_SELECTORS):
+        self.popup_selectors = popup_selectors
+        self.modal_selectors = modal_selectors
+        self.installed = False
+        self.reset()
+
+    def reset(self):
+        """실행 단위 통계 초기화 (브라우저를 재사용하는 daemon 모드)"""
+        self.removed = Counter()  # "popup" | "modal" → 제거 건수
+
+    @property
+    def script(self):
+        return INIT_SCRIPT % {
+            "popups": json.dumps(self.popup_selectors),
+            "modals": json.dumps(self.modal_selectors),
+            "binding": BINDING_NAME,
+        }
+
+    async def install(self, context):
+        """브라우저 컨텍스트에 설치 (이후 열리는 페이지와 이동하는 모든 문서에 적용)"""
+        try:
+            await context.expose_binding(BINDING_NAME, self._on_removed)
+            await context.add_init_script(script=self.script)
+        except Exception as e:
+            logger.info(f"   [주의] 팝업 차단 스크립트 설치 실패 -> 클릭 전 검사로 진행: {e}")
+            return
+        self.installed = True
+        logger.info(">>> [팝업] 팝업/모달 자동 차단 스크립트 설치")
+
+    def _on_removed(self, source, kind, count):
+        self.removed[kind] += int(count)
+
+    def report(self):
+        if not self.installed:
+            return
+        logger.info(f"   [팝업] 자동 차단: 팝업 {self.removed['popup']}건, 모달 {self.removed['modal']}건")
@@ -0,0 +1,112 @@
+import hashlib
+import heapq
+import json
+import time
+from datetime import datetime
+from src.config import RECRAWL_BUDGET, RECRAWL_MAX_ATTEMPTS, RECRAWL_RECHECK_RUNS
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+STATE_KEY = "recrawl_queue"
+RECHECK_KEY = "recheck_round"  # 주기적 상세 재확인 회차 (실행마다 +1)
+
+
+def row_fingerprint(row):
+    """목록 한 행의 화면 표시 값(공고번호/공고명/상태/마감일시) 지문 → 변경공고 감지용"""
+    text = f"{row['bid_no']}|{row['title']}|{row['status']}|{row['deadline']}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def detail_fingerprint(data: dict):
+    """상세 raw_data 지문 (키 순서 무관) → 재수집 결과가 저장본과 같으면 쓰기 생략"""
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class RecrawlQueue:
+    """
+    변경공고 상세 재수집 대기열 (crawl_state 테이블에 저장)
+    - 이미 수집된 공고의 목록 행 지문이 저장된 값과 다르면 등록 (공고번호 기준 중복 없음)
+    - 우선순위: 마감이 가까운 공고 → 먼저 발견한 공고
+    - 실행마다 budget 건까지만 상세 재수집, 남은 항목은 저장해 다음 실행에서 이어 처리
+    - 재수집했는데 목록 지문이 갱신되지 않은(공고를 찾지 못한) 항목은 max_attempts 회 시도 후 제외
+    - 목록 값이 그대로인 공고도 recheck_runs 실행마다 1번 상세 재확인(recheck) 항목으로 등록
+      → 목록에 드러나지 않는 변경(예산/첨부파일/입찰방식)은 저장 시 상세 지문 비교로 감지
+      → 재확인 항목은 목록 변경분보다 후순위이며, 예산을 넘겨 남으면 저장하지 않고 다음 주기로 넘김
+    """
+
+    def __init__(self, storage, budget: int = RECRAWL_BUDGET, max_attempts: int = RECRAWL_MAX_ATTEMPTS,
+                 recheck_runs: int = RECRAWL_RECHECK_RUNS):
+        self.storage = storage
+        self.budget = budget
+        self.max_attempts = max_attempts
+        self.recheck_runs = recheck_runs
+        self.round = storage.get_state(RECHECK_KEY, 0) or 0
+        self.items = {}  # bid_no → 항목 dict
+        self.in_flight = []  # 이번 실행에서 꺼낸 항목
+        for item in storage.get_state(STATE_KEY, []) or []:
+            if not self._expired(item):
+                self.items[item["bid_no"]] = item
+        if self.items:
+            logger.info(f">>> [재수집] 이전 실행에서 남은 변경공고 {len(self.items)}건")
+
+    @staticmethod
+    def _deadline_key(deadline_txt):
+        try:
+            return datetime.strptime(deadline_txt, "%Y/%m/%d %H:%M").timestamp()
+        except (TypeError, ValueError):
+            return float("inf")
+
+    def _expired(self, item):
+        return self._deadline_key(item.get("deadline")) <= time.time()
+
+    def due_for_recheck(self, bid_no: str):
+        """목록 값이 그대로인 공고가 이번 실행의 상세 재확인 대상인지 (공고번호 해시로 recheck_runs 개 회차에 분산)"""
+        if self.recheck_runs <= 0 or bid_no in self.items:
+            return False
+        slot = int(hashlib.sha1(bid_no.encode("utf-8")).hexdigest()[:8], 16) % self.recheck_runs
+        return slot == self.round % self.recheck_runs
+
+    def push(self, page_num, row, list_fp, recheck=False):
+        """목록 지문이 바뀐 공고(recheck=True 면 주기적 재확인 공고) 등록 (이미 있으면 위치/지문만 갱신)"""
+        item = self.items.get(row["bid_no"])
+        if item is None:
+            item = self.items[row["bid_no"]] = {"bid_no": row["bid_no"], "attempts": 0, "queued_at": time.time(),
+                                                "recheck": recheck}
+        item.update(page=page_num, title=row["title"], status=row["status"],
+                    deadline=row["deadline"], list_fp=list_fp, recheck=item.get("recheck", False) and recheck)
+
+    def take(self):
+        """이번 실행에서 처리할 항목을 우선순위 순으로 최대 budget 건 꺼냄"""
+        # 대기 중 마감된 공고는 재수집하지 않음
+        self.items = {bid_no: item for bid_no, item in self.items.items() if not self._expired(item)}
+        ranked = [(item.get("recheck", False), self._deadline_key(item["deadline"]), item["queued_at"], bid_no)
+                  for bid_no, item in self.items.items()]
+        batch = [self.items.pop(bid_no) for *_, bid_no in heapq.nsmallest(max(self.budget, 0), ranked)]
+        for item in batch:
+            item["attempts"] += 1
+        self.in_flight.extend(batch)
+        if batch:
+            rechecks = sum(1 for item in batch if item.get("recheck"))
+            logger.info(
+                f">>> [재수집] 변경공고 {len(batch) - rechecks}건 + 주기적 재확인 {rechecks}건 상세 재수집 "
+                f"(대기 {len(self.items)}건, 예산 {self.budget}건)"
+            )
+        return batch
+
+    def save(self):
+        """아직 반영되지 않은 항목 저장 (꺼낸 항목은 목록 지문이 갱신됐으면 완료로 간주)"""
+        for item in self.in_flight:
+            if item.get("recheck") or self.storage.get_fingerprints(item["bid_no"])[0] == item["list_fp"]:
+                continue
+            if item["attempts"] >= self.max_attempts:
+                logger.info(f"   [재수집] {item['attempts']}회 시도 후 제외: {item['bid_no']}")
+                continue
+            self.items.setdefault(item["bid_no"], item)
+        self.in_flight = []
+        # 예산을 넘겨 남은 주기적 재확인 항목은 이월하지 않음 (다음 주기에 다시 대상이 됨)
+        pending = [item for item in self.items.values() if not self._expired(item) and not item.get("recheck")]
+        self.storage.set_state(STATE_KEY, pending)
+        self.storage.set_state(RECHECK_KEY, self.round + 1)
+        return len(pending)
@@ -0,0 +1,73 @@
+from collections import Counter
+from src.config import ROUTE_PROFILE, ROUTE_PROFILES, ROUTE_BYTES_ESTIMATE
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+
+class RequestRouter:
+    """
+    context.route 기반 요청 차단기
+    - 프로필(config.ROUTE_PROFILES)의 resource type / URL 패턴으로 차단, allow 패턴은 항상 통과
+    - 실행별 차단 요청 수와 절감 바이트(유형별 추정치)를 리포트
+    """
+
+    def __init__(self, profile_name: str = ROUTE_PROFILE):
+        self.profile_name = profile_name
+        profile = ROUTE_PROFILES.get(profile_name, {})
+        self.block_types = set(profile.get("block_types", []))
+        self.block_patterns = list(profile.get("block_patterns", []))
+        self.allow_patterns = list(profile.get("allow_patterns", []))
+        self.reset()
+
+    def reset(self):
+        """실행 단위 통계 초기화 (브라우저를 재사용하는 daemon 모드)"""
+        self.blocked = Counter()  # resource type → 차단 건수
+        self.allowed = 0
+        self.allowed_bytes = 0
+
+    @property
+    def enabled(self):
+        return bool(self.block_types or self.block_patterns)
+
+    def should_block(self, resource_type: str, url: str):
+        if any(pattern in url for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return any(pattern in url for pattern in self.block_patterns)
+
+    async def install(self, context):
+        """브라우저 컨텍스트에 라우팅 설치 (프로필이 비어 있으면 설치하지 않음)"""
+        if not self.enabled:
+            return
+        await context.route("**/*", self._handle)
+        context.on("response", self._on_response)
+        logger.info(f">>> [라우팅] 요청 차단 프로필 '{self.profile_name}' 적용")
+
+    async def _handle(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked[request.resource_type] += 1
+            await route.abort()
+            return
+        self.allowed += 1
+        await route.continue_()
+
+    def _on_response(self, response):
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def report(self):
+        if not self.enabled:
+            return
+        blocked_total = sum(self.blocked.values())
+        saved_bytes = sum(ROUTE_BYTES_ESTIMATE.get(kind, ROUTE_BYTES_ESTIMATE["other"]) * count
+                          for kind, count in self.blocked.items())
+        detail = ", ".join(f"{kind} {count}" for kind, count in self.blocked.most_common())
+        logger.info(
+            f"   [라우팅] 차단 {blocked_total}건 ({detail or '없음'}), 절감 추정 {saved_bytes / 1024 / 1024:.1f}MB / "
+            f"통과 {self.allowed}건, 수신 {self.allowed_bytes / 1024 / 1024:.1f}MB"
+        )
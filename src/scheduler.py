@@ -0,0 +1,184 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from src.config import (
+    SCHEDULE_JITTER_SEC, ADAPTIVE_MIN_MINUTES, ADAPTIVE_MAX_MINUTES, ADAPTIVE_TARGET_NEW_BIDS,
+    ADAPTIVE_SMOOTHING, ADAPTIVE_HISTORY_DAYS, ADAPTIVE_MIN_HOUR_SAMPLES
+)
+from src.logger import get_logger
+
+logger = get_logger("MAIN")
+
+HISTORY_KEY = "schedule_history"
+
+
+class IntervalPolicy:
+    """고정 간격: 실행 시작 시각 기준 minutes 분마다 (실행이 길어지면 밀린 회차는 건너뛰고 다음 칸에 맞춤)"""
+
+    def __init__(self, minutes: float):
+        self.interval = minutes * 60
+
+    def describe(self):
+        return f"매 {self.interval / 60:g}분"
+
+    def first_delay(self):
+        return self.interval
+
+    def next_delay(self, started, new_bids=None):
+        elapsed = time.time() - started
+        if elapsed <= self.interval:
+            return self.interval - elapsed
+        skipped = int(elapsed // self.interval)
+        logger.info(f"   [스케줄] 실행이 {elapsed / 60:.1f}분 걸려 밀린 {skipped}회는 건너뜀")
+        return self.interval - elapsed % self.interval
+
+
+class DailyPolicy:
+    """매일 지정 시각(HH:MM 목록): 실행 중 지나간 시각은 건너뜀"""
+
+    def __init__(self, times):
+        self.times = sorted(datetime.strptime(t.strip(), "%H:%M").time() for t in times)
+
+    def describe(self):
+        return "매일 " + ", ".join(t.strftime("%H:%M") for t in self.times)
+
+    def first_delay(self):
+        return self._until_next()
+
+    def next_delay(self, started, new_bids=None):
+        return self._until_next()
+
+    def _until_next(self):
+        now = datetime.now()
+        for day in (0, 1):
+            for t in self.times:
+                candidate = datetime.combine(now.date() + timedelta(days=day), t)
+                if candidate > now:
+                    return (candidate - now).total_seconds()
+        return 24 * 3600
+
+
+class AdaptivePolicy:
+    """
+    신규 공고 속도에 맞춘 간격 (min_minutes ~ max_minutes)
+    - 실행마다 (시작 시각, 시간대, 신규 공고 수, 직전 실행과의 간격)을 crawl_state(schedule_history)에 기록
+    - 최근 속도: 실행별 '신규/시간'의 지수이동평균, 시간대 속도: 같은 시각(시)대 실행들의 신규 합 / 간격 합
+    - 예상 속도(두 값의 평균, 시간대 표본이 부족하면 최근 속도)로 target_new 건이 쌓이는 시간을 다음 간격으로 사용
+    """
+
+    def __init__(self, storage, min_minutes: float = ADAPTIVE_MIN_MINUTES, max_minutes: float = ADAPTIVE_MAX_MINUTES,
+                 target_new: int = ADAPTIVE_TARGET_NEW_BIDS, smoothing: float = ADAPTIVE_SMOOTHING,
+                 history_days: int = ADAPTIVE_HISTORY_DAYS, min_hour_samples: int = ADAPTIVE_MIN_HOUR_SAMPLES):
+        self.storage = storage
+        self.min_minutes = min_minutes
+        self.max_minutes = max_minutes
+        self.target_new = target_new
+        self.smoothing = smoothing
+        self.history_days = history_days
+        self.min_hour_samples = min_hour_samples
+        self.history = storage.get_state(HISTORY_KEY, []) or []
+
+    def describe(self):
+        return f"적응형 {self.min_minutes:g}~{self.max_minutes:g}분 (실행당 신규 {self.target_new}건 목표)"
+
+    def first_delay(self):
+        return self.min_minutes * 60
+
+    def next_delay(self, started, new_bids=None):
+        self._record(started, new_bids)
+        minutes = self.next_minutes(datetime.now().hour)
+        return max(minutes * 60 - (time.time() - started), 0)
+
+    def _record(self, started, new_bids):
+        """이번 실행 결과 기록 (첫 실행/실패는 간격을 모르거나 건수가 없으므로 속도 계산에서 제외)"""
+        previous = self.history[-1]["at"] if self.history else None
+        span_h = (started - previous) / 3600 if previous else None
+        self.history.append({
+            "at": started,
+            "hour": datetime.fromtimestamp(started).hour,
+            "new": new_bids,
+            "span_h": round(span_h, 4) if span_h and span_h < 24 else None,
+        })
+        cutoff = time.time() - self.history_days * 86400
+        self.history = [entry for entry in self.history if entry["at"] >= cutoff]
+        self.storage.set_state(HISTORY_KEY, self.history)
+
+    def _samples(self):
+        return [entry for entry in self.history if entry["new"] is not None and entry["span_h"]]
+
+    def recent_rate(self):
+        """실행별 신규/시간의 지수이동평균 (표본 없으면 None)"""
+        rate = None
+        for entry in self._samples():
+            sample = entry["new"] / entry["span_h"]
+            rate = sample if rate is None else self.smoothing * sample + (1 - self.smoothing) * rate
+        return rate
+
+    def hour_rate(self, hour: int):
+        """해당 시각(시)대 실행들의 신규 합 / 간격 합 (표본 부족 시 None)"""
+        samples = [entry for entry in self._samples() if entry["hour"] == hour]
+        if len(samples) < self.min_hour_samples:
+            return None
+        return sum(entry["new"] for entry in samples) / sum(entry["span_h"] for entry in samples)
+
+    def next_minutes(self, hour: int):
+        recent = self.recent_rate()
+        by_hour = self.hour_rate(hour)
+        rates = [rate for rate in (recent, by_hour) if rate is not None]
+        if not rates:
+            # 첫 실행 직후: 속도를 모르므로 최소 간격으로 한 번 더 보고 판단
+            minutes = self.min_minutes
+        else:
+            rate = sum(rates) / len(rates)
+            minutes = self.target_new / rate * 60 if rate > 0 else self.max_minutes
+        minutes = min(max(minutes, self.min_minutes), self.max_minutes)
+
+        recent_txt = f"{recent:.1f}" if recent is not None else "-"
+        hour_txt = f"{by_hour:.1f}" if by_hour is not None else "-"
+        logger.info(
+            f"   [스케줄] 신규 공고 속도(건/시간): 최근 {recent_txt}, {hour}시대 {hour_txt} -> 다음 간격 {minutes:.1f}분"
+        )
+        return minutes
+
+
+class CrawlScheduler:
+    """
+    asyncio 기반 반복 실행기
+    - 이전 실행이 끝난 뒤에만 다음 실행을 예약 → 실행이 겹치거나 쌓이지 않음
+    - 다음 실행까지의 대기(policy.next_delay)에 ±jitter_sec 무작위 지연 추가 (매일 지정 시각은 + 방향만)
+    - job 은 async 함수, 반환값(신규 공고 수 또는 None)은 적응형 정책에 전달
+    """
+
+    def __init__(self, job, policy, jitter_sec: float = SCHEDULE_JITTER_SEC, run_immediately: bool = True):
+        self.job = job
+        self.policy = policy
+        self.jitter_sec = jitter_sec
+        self.run_immediately = run_immediately
+        self.runs = 0
+
+    def _jitter(self):
+        if not self.jitter_sec:
+            return 0.0
+        if isinstance(self.policy, DailyPolicy):
+            return random.uniform(0, self.jitter_sec)
+        return random.uniform(-self.jitter_sec, self.jitter_sec)
+
+    async def run_forever(self):
+        logger.info(f">>> [스케줄] {self.policy.describe()}, 지터 ±{self.jitter_sec:g}초")
+        delay = 0.0 if self.run_immediately else self.policy.first_delay() + self._jitter()
+        while True:
+            if delay > 0:
+                next_at = datetime.now() + timedelta(seconds=delay)
+                logger.info(f"== 대기 중... 다음 실행: {next_at.strftime('%Y-%m-%d %H:%M:%S')} ==\n")
+                await asyncio.sleep(delay)
+
+            started = time.time()
+            new_bids = None
+            try:
+                new_bids = await self.job()
+            except Exception as e:
+                logger.error(f"작업 실행 중 오류 발생: {e}")
+            self.runs += 1
+
+            delay = max(self.policy.next_delay(started, new_bids) + self._jitter(), 0.0)
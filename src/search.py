@@ -0,0 +1,46 @@
+import re
+
+# 전문 검색 색인 컬럼 → raw_data 키 (bids_fts 컬럼 순서와 동일)
+FTS_FIELDS = (
+    ("title", "입찰공고명"),
+    ("industry", "업종제한사항"),
+    ("info", "공고정보"),
+    ("department", "담당부서"),
+)
+FTS_COLUMNS = tuple(column for column, _ in FTS_FIELDS)
+# trigram 토크나이저는 3글자 이상 검색어만 색인으로 찾음 (2글자 한글 단어는 LIKE 로 보완)
+TRIGRAM_MIN = 3
+SNIPPET_WIDTH = 20
+
+
+def fts_values(data: dict):
+    """raw_data → bids_fts 컬럼 값 (공백 정리)"""
+    return tuple(" ".join(str(data.get(key) or "").split()) for _, key in FTS_FIELDS)
+
+
+def split_terms(query: str):
+    """검색어 → (색인 검색어 목록(3글자 이상), 짧은 검색어 목록)"""
+    terms = [term for term in query.split() if term]
+    return [t for t in terms if len(t) >= TRIGRAM_MIN], [t for t in terms if len(t) < TRIGRAM_MIN]
+
+
+def match_expression(terms):
+    """FTS5 MATCH 식: 각 검색어를 구문(phrase)으로 감싸 AND 결합 (따옴표/연산자 문자 이스케이프)"""
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def make_snippet(texts, terms, width: int = SNIPPET_WIDTH):
+    """MATCH 없이 찾은 결과용 스니펫: 첫 검색어가 나온 컬럼에서 앞뒤 width 글자, 검색어는 [ ] 로 강조"""
+    for text in texts:
+        if not text:
+            continue
+        positions = [text.find(term) for term in terms if term in text]
+        if not positions:
+            continue
+        start = max(0, min(positions) - width)
+        end = min(len(text), min(positions) + width)
+        snippet = text[start:end]
+        for term in terms:
+            snippet = re.sub(re.escape(term), f"[{term}]", snippet)
+        return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+    return texts[0][:width * 2] if texts and texts[0] else ""
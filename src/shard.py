@@ -0,0 +1,318 @@
+import asyncio
+import multiprocessing
+import queue
+import time
+from src.config import SHARD_FILTERS, SHARD_PROCESSES, SHARD_RETRIES, ATTACH_DOWNLOAD
+from src.logger import get_logger, attach_queue, forward_queue
+from src.recrawl import detail_fingerprint
+from src.storage import Storage
+
+logger = get_logger("MAIN")
+
+PROGRESS_INTERVAL = 10  # 샤드별 진행 현황 로그 간격(초)
+FALLBACK_SHARD = "전체"  # 샤드 검색 조건을 적용할 수 없을 때 대신 실행하는 조건 없는 단일 샤드
+
+
+def shard_state_key(name: str, key: str):
+    """샤드별 crawl_state 키 (워터마크/체크포인트를 샤드마다 따로 유지)"""
+    return f"shard:{name}:{key}"
+
+
+class ShardStorage:
+    """
+    샤드 프로세스용 Storage 대리 객체
+    - 쓰기(save/delete/update_end_date/set_list_fingerprint/set_state/link_files/mark_file)는 DB 대신 조정 프로세스 큐로 전송 → DB 쓰기는 한 곳에서만
+    - 조회(get_meta/get_status/get_fingerprints/get_state/downloaded_files)는 시작 시 받은 인덱스/상태/받은 파일 스냅샷 + 이 샤드가 보낸 변경분으로 응답
+    - 정리/인덱스 적재/계측 연결은 조정 프로세스가 담당하므로 아무것도 하지 않음
+    """
+
+    def __init__(self, name: str, out_queue, index: dict, fingerprints: dict, state: dict, files: dict = None):
+        self.name = name
+        self.queue = out_queue
+        self.index = index
+        self.fingerprints = fingerprints
+        self.state = state
+        self.files = files or {}  # 받은 첨부파일 (bid_no, 순번) → (파일명, 크기, URL)
+
+    def _send(self, *message):
+        self.queue.put((self.name,) + message)
+
+    def set_metrics(self, metrics):
+        pass
+
+    def clean_old_data(self):
+        pass
+
+    def compact_changes(self, *args, **kwargs):
+        pass
+
+    def preload_index(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def get_status(self, bid_no: str):
+        return self.index.get(bid_no, (None, None))[0]
+
+    def get_meta(self, bid_no: str):
+        return self.index.get(bid_no, (None, None))
+
+    def get_fingerprints(self, bid_no: str):
+        return self.fingerprints.get(bid_no, (None, None))
+
+    def set_list_fingerprint(self, bid_no: str, list_fp: str):
+        self._send("set_list_fingerprint", bid_no, list_fp)
+        self.fingerprints[bid_no] = (list_fp, self.get_fingerprints(bid_no)[1])
+
+    def save(self, data: dict, list_fp: str = None):
+        self._send("save", data, list_fp)
+        bid_no = data.get("입찰공고번호")
+        if bid_no:
+            self.index[bid_no] = (data.get("진행상태", ""), data.get("입찰서접수마감일시", ""))
+            self.fingerprints[bid_no] = (list_fp or self.get_fingerprints(bid_no)[0], detail_fingerprint(data))
+
+    def delete(self, bid_no: str):
+        self._send("delete", bid_no)
+        self.index.pop(bid_no, None)
+        self.fingerprints.pop(bid_no, None)
+
+    def update_end_date(self, bid_no: str, end_date_str: str, list_fp: str = None):
+        self._send("update_end_date", bid_no, end_date_str, list_fp)
+        status = self.index.get(bid_no, (None, None))[0]
+        self.index[bid_no] = (status, end_date_str)
+        if list_fp:
+            self.fingerprints[bid_no] = (list_fp, self.get_fingerprints(bid_no)[1])
+
+    def link_files(self, bid_no: str, files):
+        self._send("link_files", bid_no, files)
+
+    def mark_file(self, bid_no: str, seq: int, status: str, sha256: str = None, size: int = None, error: str = None):
+        self._send("mark_file", bid_no, seq, status, sha256, size, error)
+
+    def pending_files(self, max_attempts: int):
+        return []  # 이전 실행의 미완료 다운로드는 single/daemon 실행에서 이어 받음
+
+    def downloaded_files(self):
+        return dict(self.files)  # 조정 프로세스 스냅샷 → 이미 받은 파일은 다시 내려받지 않음
+
+    def get_state(self, key: str, default=None):
+        value = self.state.get(key)
+        return default if value is None else value
+
+    def set_state(self, key: str, value):
+        self.state[key] = value
+        self._send("set_state", key, value)
+
+
+def run_shard(name: str, selects: dict, out_queue, log_queue, index: dict, fingerprints: dict, state: dict,
+              files: dict = None):
+    """샤드 프로세스 진입점: 브라우저 1개로 해당 검색 조건만 수집, 끝나면 ('done', 성공 여부) 전송"""
+    attach_queue(log_queue)  # 로그 파일은 조정 프로세스가 혼자 씀
+    from playwright.async_api import async_playwright
+    from src.crawler import NuriCrawler
+
+    storage = ShardStorage(name, out_queue, index, fingerprints, state, files)
+
+    async def crawl():
+        nonlocal crawler
+        # 브라우저 상태 파일은 단일 실행용 공유 파일 → 샤드끼리 동시에 덮어쓰지 않도록 사용 안 함
+        crawler = NuriCrawler(storage=storage, state_path=None, metrics_dir=None, search_filters=selects)
+        async with async_playwright() as p:
+            await crawler.start(p)
+            try:
+                return await crawler.run_once()
+            finally:
+                await crawler.stop()
+
+    ok = False
+    crawler = None
+    try:
+        ok = asyncio.run(crawl())
+    except Exception as e:
+        logger.info(f"!!! [샤드:{name}] 실행 실패: {e}")
+    finally:
+        out_queue.put((name, "done", ok, bool(crawler and crawler.search_filter_failed)))
+
+
+class ShardCoordinator:
+    """
+    검색 조건(SHARD_FILTERS)별 병렬 수집 조정기
+    - 샤드마다 별도 프로세스 + 브라우저, 동시에 최대 processes 개
+    - 샤드가 보낸 쓰기 요청을 큐에서 꺼내 단일 Storage(쓰기 지연 스레드)로 반영 → SQLite 잠금 경합 없음
+    - 실패한 샤드는 retries 회까지 다시 실행, 샤드별 진행 건수를 주기적으로 로그
+    - 검색 조건(SHARD_CATEGORY_SELECTOR)을 화면에서 찾지 못한 샤드가 있으면 나머지 샤드를 취소하고
+      조건 없는 단일 샤드(FALLBACK_SHARD)로 전환 (조건 선택자가 실제 화면과 다르면 모든 샤드가 같은 이유로 실패하므로)
+    """
+
+    OPS = ("save", "delete", "update_end_date")
+
+    def __init__(self, storage=None, shards=SHARD_FILTERS, processes: int = SHARD_PROCESSES,
+                 retries: int = SHARD_RETRIES):
+        self.storage = storage or Storage()
+        self.shards = {shard["name"]: shard["selects"] for shard in shards}
+        self.processes = max(1, processes)
+        self.retries = retries
+        self.ctx = multiprocessing.get_context("spawn")  # 브라우저/스레드 상태를 물려받지 않도록 spawn
+        self.queue = self.ctx.Queue()
+        self.log_queue = self.ctx.Queue()  # 샤드 프로세스 로그 → 조정 프로세스의 로그 파이프라인
+        self.running = {}  # 샤드 이름 → Process
+        self.attempts = {name: 0 for name in self.shards}
+        self.counts = {name: {op: 0 for op in self.OPS} for name in self.shards}
+        self.results = {}  # 샤드 이름 → 최종 성공 여부
+        self.pending = []  # 실행 대기 중인 샤드 이름
+
+    def run(self):
+        """전체 샤드 수집 (모든 샤드 성공 시 True)"""
+        start_time = time.time()
+        logger.info(f">> 샤드 수집 시작: {len(self.shards)}개 샤드, 동시 {self.processes}개 프로세스")
+        self.storage.clean_old_data()
+        self.storage.compact_changes()
+        self.storage.preload_index()
+
+        self.pending = pending = list(self.shards)
+        last_progress = time.time()
+        log_listener = forward_queue(self.log_queue)
+        try:
+            while pending or self.running:
+                while pending and len(self.running) < self.processes:
+                    self._launch(pending.pop(0))
+
+                try:
+                    message = self.queue.get(timeout=1)
+                except queue.Empty:
+                    message = None
+                if message:
+                    retry = self._handle(message)
+                    if retry:
+                        pending.append(retry)
+
+                self._reap_dead(pending)
+                if time.time() - last_progress >= PROGRESS_INTERVAL:
+                    self._log_progress()
+                    last_progress = time.time()
+        finally:
+            for process in self.running.values():
+                process.terminate()
+            self.storage.flush()
+            log_listener.stop()
+
+        self._log_progress()
+        failed = [name for name, ok in self.results.items() if not ok]
+        logger.info(
+            f"== 샤드 수집 완료 (소요시간: {time.time() - start_time:.2f}초, "
+            f"성공 {len(self.results) - len(failed)}/{len(self.results)}"
+            + (f", 실패: {', '.join(failed)}" if failed else "") + ") =="
+        )
+        return not failed
+
+    def _launch(self, name: str):
+        """샤드 프로세스 시작 (현재 인덱스/샤드 상태/받은 첨부파일 스냅샷 전달)"""
+        self.storage.flush()  # 인덱스는 save/delete 시 함께 갱신되므로 다시 적재하지 않음
+        prefix = shard_state_key(name, "")
+        state = {
+            key: self.storage.get_state(shard_state_key(name, key))
+            for key in ("watermark", "checkpoint", "recrawl_queue")
+        }
+        files = self.storage.downloaded_files() if ATTACH_DOWNLOAD else {}
+        self.attempts[name] += 1
+        process = self.ctx.Process(
+            target=run_shard,
+            args=(name, self.shards[name], self.queue, self.log_queue, dict(self.storage.index or {}),
+                  dict(self.storage.fingerprints or {}), state, files),
+            name=f"shard-{name}",
+            daemon=True,
+        )
+        process.start()
+        self.running[name] = process
+        logger.info(f">>> [샤드:{name}] 시작 (시도 {self.attempts[name]}회, pid={process.pid}, 상태 키 {prefix}*)")
+
+    def _handle(self, message):
+        """큐 메시지 1건 처리, 재시도할 샤드 이름 반환"""
+        name, kind, *args = message
+        if kind == "done":
+            process = self.running.pop(name, None)
+            if process:
+                process.join(timeout=10)
+            if name not in self.shards:
+                return None  # 조건 없는 수집으로 전환하며 취소한 샤드
+            if len(args) > 1 and args[1]:
+                return self._fallback(name)
+            return self._finish(name, bool(args[0]))
+
+        if kind == "set_state":
+            key, value = args
+            self.storage.set_state(shard_state_key(name, key), value)
+        elif kind in ("set_list_fingerprint", "link_files", "mark_file"):
+            getattr(self.storage, kind)(*args)
+        elif kind in self.OPS:
+            getattr(self.storage, kind)(*args)
+            self.counts[name][kind] += 1
+        return None
+
+    def _reap_dead(self, pending):
+        """'done' 없이 죽은 샤드 프로세스 정리 (큐에 남은 메시지를 먼저 반영)"""
+        for name, process in list(self.running.items()):
+            if process.is_alive():
+                continue
+            while True:
+                try:
+                    message = self.queue.get(timeout=0.5)
+                except queue.Empty:
+                    break
+                retry = self._handle(message)
+                if retry:
+                    pending.append(retry)
+            if name in self.running:
+                self.running.pop(name)
+                logger.info(f"   [주의] 샤드 '{name}' 프로세스 비정상 종료 (exitcode={process.exitcode})")
+                retry = self._finish(name, False)
+                if retry:
+                    pending.append(retry)
+
+    def _fallback(self, name: str):
+        """샤드 검색 조건 적용 실패: 다른 샤드를 취소하고 조건 없는 단일 샤드 이름 반환 (이미 전환했으면 실패 처리)"""
+        if name == FALLBACK_SHARD:
+            return self._finish(name, False)
+        logger.info(
+            f"   [주의] 샤드 '{name}' 검색 조건을 화면에서 적용하지 못함 (SHARD_CATEGORY_SELECTOR 확인 필요) "
+            f"-> 나머지 샤드를 취소하고 조건 없이 단일 샤드로 전체 수집"
+        )
+        for process in self.running.values():
+            process.terminate()
+        self.running.clear()
+        self.pending.clear()
+        self.results = {}
+        self.shards = {FALLBACK_SHARD: {}}
+        self.attempts.setdefault(FALLBACK_SHARD, 0)
+        self.counts.setdefault(FALLBACK_SHARD, {op: 0 for op in self.OPS})
+        return FALLBACK_SHARD
+
+    def _finish(self, name: str, ok: bool):
+        """샤드 종료 처리: 실패했고 재시도 여유가 있으면 이름 반환"""
+        if not ok and self.attempts[name] <= self.retries:
+            logger.info(f">>> [샤드:{name}] 실패 -> 재시도 ({self.attempts[name]}/{self.retries + 1})")
+            return name
+        self.results[name] = ok
+        logger.info(f">>> [샤드:{name}] {'완료' if ok else '실패'} ({self._format_counts(name)})")
+        return None
+
+    def _format_counts(self, name: str):
+        counts = self.counts[name]
+        return f"저장 {counts['save']}, 삭제 {counts['delete']}, 마감 갱신 {counts['update_end_date']}"
+
+    def _log_progress(self):
+        for name in self.shards:
+            if name in self.running:
+                status = "진행 중"
+            elif name in self.results:
+                status = "완료" if self.results[name] else "실패"
+            else:
+                status = "대기"
+            logger.info(f"   [샤드:{name}] {status} - {self._format_counts(name)}")
+
+    def close(self):
+        self.storage.close()
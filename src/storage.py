@@ -1,62 +1,513 @@
+import os
 import sqlite3
 import json
-from datetime import datetime, timedelta
-from src.config import DB_PATH
+import queue
+import threading
+import time
+import atexit
+import calendar
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from src.config import (
+    DB_PATH, WRITE_BEHIND, WRITE_BATCH_SIZE, WRITE_FLUSH_INTERVAL, CHANGELOG_RETENTION_DAYS,
+    RAW_INTERN_MIN_LENGTH, RAW_INTERN_MIN_COUNT
+)
 from src.logger import get_logger
+from src.codec import RawCodec
+from src.fields import business_fields
+from src.search import FTS_COLUMNS, fts_values, split_terms, match_expression, make_snippet
+from src.recrawl import detail_fingerprint
 
 logger = get_logger("STORAGE")
 
+# PRAGMA user_version 기준 스키마 버전 (_migrate 에서 단계별로 올림)
+SCHEMA_VERSION = 5
+SITE_DATETIME_FORMATS = ("%Y/%m/%d%H:%M", "%Y/%m/%d", "%Y-%m-%d%H:%M:%S", "%Y-%m-%d%H:%M")
+
+# fields.business_fields() 반환 순서와 같은 순서의 (컬럼, 타입)
+BUSINESS_COLUMNS = (
+    ("category", "TEXT"), ("contract_method", "TEXT"), ("budget", "INTEGER"), ("region_limit", "TEXT"),
+    ("region", "TEXT"), ("department", "TEXT"), ("open_place", "TEXT"),
+)
+
+
+def parse_site_datetime(text):
+    """
+    누리장터 일시 문자열 → datetime (형식 불일치/빈 값이면 None)
+    목록 'YYYY/MM/DD HH:MM' 과 상세 'YYYY/MM/DDHH:MM'(줄바꿈 제거로 공백 없음)을 모두 허용
+    """
+    if not text:
+        return None
+    compact = "".join(str(text).split())
+    for fmt in SITE_DATETIME_FORMATS:
+        try:
+            return datetime.strptime(compact, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def site_epoch(text):
+    """사이트 일시(한국 시각, 로컬 시간대로 간주) → epoch 초 (파싱 불가 시 None)"""
+    dt = parse_site_datetime(text)
+    return int(dt.timestamp()) if dt else None
+
+
+def utc_epoch(text):
+    """SQLite CURRENT_TIMESTAMP 문자열(UTC, 'YYYY-MM-DD HH:MM:SS') → epoch 초"""
+    dt = parse_site_datetime(text)
+    return calendar.timegm(dt.timetuple()) if dt else None
+
+
+def _connect(db_path):
+    """WAL 저널 모드 연결 (크롤링 중에도 export 등 다른 reader 가 잠금 없이 조회 가능)"""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class WriteBehindWriter:
+    """
+    쓰기 작업(op)을 대기열에 모아 백그라운드 스레드에서 일괄 커밋
+    - WRITE_BATCH_SIZE 건이 모이거나 WRITE_FLUSH_INTERVAL 초가 지나면 한 트랜잭션으로 커밋
+    - op 는 cursor 를 받아 실행되는 함수 (writer 스레드 전용 연결 사용), 실패하면 예외를 그대로 올림
+    - 배치 중 하나라도 실패하면 롤백 후 op 를 1건씩 다시 실행/커밋 → 실패한 op 만 빠지고 on_failure(cursor) 호출
+    - 롤백할 때마다 on_rollback(cursor) 호출 (롤백된 raw_data 사전 등록을 메모리에서도 되돌림)
+    """
+
+    def __init__(self, db_path, batch_size: int, flush_interval: float, on_failure=None, on_rollback=None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.metrics = None  # Storage.set_metrics() 로 연결 (일괄 커밋 소요시간 기록)
+        self.on_failure = on_failure  # 실패한 op 가 있을 때 writer 스레드에서 호출 (메모리 인덱스 무효화 등)
+        self.on_rollback = on_rollback
+        self._stop = object()
+        self._flush = object()  # 대기열 표식: 배치 수집을 끝내고 즉시 커밋
+        self.thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, op):
+        self.queue.put(op)
+
+    def flush(self):
+        """대기 중인 쓰기가 모두 커밋될 때까지 대기 (flush 표식으로 WRITE_FLUSH_INTERVAL 대기 없이 바로 커밋)"""
+        self.queue.put(self._flush)
+        self.queue.join()
+
+    def close(self):
+        self.queue.put(self._stop)
+        self.thread.join()
+
+    def _run(self):
+        conn = _connect(self.db_path)
+        cursor = conn.cursor()
+        stopping = False
+
+        while not stopping:
+            op = self.queue.get()
+            batch = [op]
+            deadline = time.time() + self.flush_interval
+
+            # 배치 크기 또는 시간 한도까지 추가 수집
+            while op is not self._stop and op is not self._flush and len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    op = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(op)
+
+            stopping = any(op is self._stop for op in batch)
+            ops = [op for op in batch if op is not self._stop and op is not self._flush]
+            started = time.time()
+            try:
+                for op in ops:
+                    op(cursor)
+                conn.commit()
+                if self.metrics:
+                    self.metrics.observe("storage.batch_commit", time.time() - started)
+                    self.metrics.incr("storage.batched_ops", len(ops))
+            except Exception as e:
+                self._rollback(conn, cursor)
+                failed = self._replay(conn, cursor, ops)
+                logger.info(f"   [DB에러] 일괄 커밋 실패 ({len(ops)}건, 롤백 후 1건씩 재실행 -> 실패 {failed}건): {e}")
+                if failed and self.on_failure:
+                    self.on_failure(cursor)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+        conn.close()
+
+    def _rollback(self, conn, cursor):
+        conn.rollback()
+        if self.on_rollback:
+            self.on_rollback(cursor)
+
+    def _replay(self, conn, cursor, ops):
+        """롤백된 배치를 op 단위 트랜잭션으로 다시 실행 → 실패한 op 수"""
+        failed = 0
+        for op in ops:
+            try:
+                op(cursor)
+                conn.commit()
+            except Exception as e:
+                self._rollback(conn, cursor)
+                failed += 1
+                logger.info(f"      [DB에러] {getattr(op, 'name', 'write')} 실패: {e}")
+        return failed
+
+
 class Storage:
-    def __init__(self):
-        """DB 연결 및 테이블 초기화"""
-        self.conn = sqlite3.connect(DB_PATH)
+    def __init__(self, write_behind: bool = WRITE_BEHIND, db_path=None):
+        """DB 연결 및 테이블 초기화 (db_path 미지정 시 config.DB_PATH)"""
+        self.db_path = db_path or DB_PATH
+        self.conn = _connect(self.db_path)
         self.cursor = self.conn.cursor()
-        self._init_schema()
+        self.index = None  # bid_no → (status, end_date), preload_index() 호출 후 사용
+        self.fingerprints = None  # bid_no → (list_fp, detail_fp), preload_index() 호출 후 사용
+        self._index_stale = False  # writer 에서 실패한 쓰기가 있으면 True → 다음 조회 때 인덱스 재적재
+        self.metrics = None  # 실행별 Metrics (set_metrics), 없으면 계측 생략
+        self.fts_enabled = False  # SQLite FTS5(trigram) 사용 가능 여부 (_init_fts)
+        self.codec = None  # raw_data 저장 형식 변환기 (_init_schema 에서 사전 테이블 준비 후 생성)
+        try:
+            self._init_schema()
+        except Exception as e:
+            # 반쯤 적용된 마이그레이션 위에 쓰지 않도록 미확정분을 되돌리고 중단
+            logger.info(f"   [DB에러] 초기화 실패: {e}")
+            self.conn.rollback()
+            self.conn.close()
+            raise
+
+        # 쓰기 지연(write-behind): 스키마 생성 후 writer 스레드 시작, 비정상 종료 시에도 flush
+        self.writer = WriteBehindWriter(
+            self.db_path, WRITE_BATCH_SIZE, WRITE_FLUSH_INTERVAL,
+            on_failure=self._on_write_failure, on_rollback=self.codec.load
+        ) if write_behind else None
+        atexit.register(self.close)
 
     def _init_schema(self):
-        """스키마 정의: 공고번호 PK, 상태 컬럼"""
-        try:
+        """
+        스키마 정의: 공고번호 PK, 상태 컬럼
+        - 생성/마이그레이션 실패는 잡지 않고 호출 측(__init__)으로 올림
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bids (
+                bid_no TEXT PRIMARY KEY,
+                title TEXT,
+                status TEXT,
+                end_date TEXT,
+                raw_data JSON,
+                collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                end_ts INTEGER,
+                open_ts INTEGER,
+                collected_ts INTEGER,
+                category TEXT,
+                contract_method TEXT,
+                budget INTEGER,
+                region_limit TEXT,
+                region TEXT,
+                department TEXT,
+                open_place TEXT,
+                list_fp TEXT,
+                detail_fp TEXT
+            )
+        ''')
+        # 크롤러 실행 상태(증분 워터마크 등) key-value 저장소
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # 변경 이력(change feed): insert/update/delete/expire 를 증가하는 seq 로 기록 (AUTOINCREMENT → 정리 후에도 seq 재사용 없음)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bid_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                bid_no TEXT NOT NULL,
+                op TEXT NOT NULL,
+                status TEXT,
+                end_date TEXT,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bid_changes_changed_at ON bid_changes (changed_at)")
+        self.conn.commit()
+        self._migrate()
+        self.codec = RawCodec(self.conn)
+        # LIKE 검색 대체 경로에서 압축된 raw_data 도 텍스트로 비교
+        self.conn.create_function("raw_json", 1, self.codec.sql_text)
+        self._init_fts()
+
+    def _init_fts(self):
+        """
+        전문 검색 색인(bids_fts, FTS5 trigram) 준비
+        - rowid 를 bids.rowid 와 맞춰 저장/삭제 시 rowid 로 바로 갱신
+        - 색인이 새로 만들어졌으면 기존 행으로 채움, FTS5/trigram 미지원 SQLite 면 검색은 LIKE 조회로 대체
+        """
+        exists = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bids_fts'"
+        ).fetchone()
+        if not exists:
+            try:
+                self.cursor.execute(
+                    f"CREATE VIRTUAL TABLE bids_fts USING fts5({', '.join(FTS_COLUMNS)}, tokenize='trigram')"
+                )
+            except sqlite3.OperationalError as e:
+                logger.info(f"   [검색] FTS5 trigram 미지원 SQLite({sqlite3.sqlite_version}) -> LIKE 검색 사용: {e}")
+                return
+
+            rows = self.cursor.execute("SELECT rowid, raw_data FROM bids").fetchall()
+            values = []
+            for rowid, raw in rows:
+                try:
+                    values.append((rowid, *fts_values(self.codec.decode(raw) or {})))
+                except ValueError:
+                    continue
+            self.cursor.executemany(
+                f"INSERT INTO bids_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?{', ?' * len(FTS_COLUMNS)})", values
+            )
+            self.conn.commit()
+            if values:
+                logger.info(f"   [검색] 전문 검색 색인 생성 {len(values)}건")
+        self.fts_enabled = True
+
+    def _migrate(self):
+        """
+        기존 bids.db 스키마를 SCHEMA_VERSION 까지 단계별로 변환 (PRAGMA user_version 으로 적용 여부 기록)
+        - v1: 정규화 시각 컬럼(end_ts/open_ts/collected_ts, epoch 초) 추가 + 기존 행 채움 + 인덱스
+        - v2: 업무 필드 타입 컬럼(업무분류/계약방법/배정예산(정수)/지역제한/시도/담당부서/개찰장소) 추가 + 기존 행 채움 + 인덱스
+        - v3: 변경공고 감지용 지문 컬럼(list_fp: 목록 행, detail_fp: 상세 raw_data) 추가 + detail_fp 채움
+              (list_fp 는 다음 수집에서 목록 행을 볼 때 채움)
+        - v4: raw_data 압축 저장용 사전 테이블(raw_keys: 키, raw_values: 공유 값) 추가
+              (이후 저장분부터 압축, 기존 JSON 텍스트 행은 그대로 읽히며 compact_raw() 로 일괄 변환)
+        - v5: 첨부파일 연결 테이블(bid_files: 공고번호 + 그리드 순번 → 파일명/URL/내용 해시/다운로드 상태) 추가
+        """
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(bids)")}
+            for column in ("end_ts", "open_ts", "collected_ts"):
+                if column not in columns:
+                    self.cursor.execute(f"ALTER TABLE bids ADD COLUMN {column} INTEGER")
+
+            rows = self.cursor.execute("SELECT bid_no, end_date, collected_at, raw_data FROM bids").fetchall()
+            updates = []
+            for bid_no, end_date, collected_at, raw in rows:
+                try:
+                    open_date = json.loads(raw).get("개찰일시") if raw else None
+                except ValueError:
+                    open_date = None
+                updates.append((site_epoch(end_date), site_epoch(open_date), utc_epoch(collected_at), bid_no))
+            self.cursor.executemany(
+                "UPDATE bids SET end_ts = ?, open_ts = ?, collected_ts = ? WHERE bid_no = ?", updates
+            )
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_end_ts ON bids (end_ts)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_open_ts ON bids (open_ts)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_collected_ts ON bids (collected_ts)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_collected_at ON bids (collected_at, bid_no)")
+            if rows:
+                logger.info(f"   [마이그레이션] v1: 시각 컬럼 채움 {len(rows)}건")
+
+        if version < 2:
+            columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(bids)")}
+            for column, col_type in BUSINESS_COLUMNS:
+                if column not in columns:
+                    self.cursor.execute(f"ALTER TABLE bids ADD COLUMN {column} {col_type}")
+
+            rows = self.cursor.execute("SELECT bid_no, raw_data FROM bids").fetchall()
+            updates = []
+            for bid_no, raw in rows:
+                try:
+                    data = json.loads(raw) if raw else {}
+                except ValueError:
+                    data = {}
+                updates.append((*business_fields(data), bid_no))
+            assignments = ", ".join(f"{column} = ?" for column, _ in BUSINESS_COLUMNS)
+            self.cursor.executemany(f"UPDATE bids SET {assignments} WHERE bid_no = ?", updates)
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_category_budget ON bids (category, budget)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_budget ON bids (budget)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_region ON bids (region)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bids_contract_method ON bids (contract_method)")
+            if rows:
+                logger.info(f"   [마이그레이션] v2: 업무 필드 컬럼 채움 {len(rows)}건")
+
+        if version < 3:
+            columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(bids)")}
+            for column in ("list_fp", "detail_fp"):
+                if column not in columns:
+                    self.cursor.execute(f"ALTER TABLE bids ADD COLUMN {column} TEXT")
+
+            rows = self.cursor.execute("SELECT bid_no, raw_data FROM bids").fetchall()
+            updates = []
+            for bid_no, raw in rows:
+                try:
+                    updates.append((detail_fingerprint(json.loads(raw)) if raw else None, bid_no))
+                except ValueError:
+                    continue
+            self.cursor.executemany("UPDATE bids SET detail_fp = ? WHERE bid_no = ?", updates)
+            if rows:
+                logger.info(f"   [마이그레이션] v3: 상세 지문 채움 {len(updates)}건")
+
+        if version < 4:
+            self.cursor.execute("CREATE TABLE IF NOT EXISTS raw_keys (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE)")
+            self.cursor.execute("CREATE TABLE IF NOT EXISTS raw_values (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)")
+            legacy = self.cursor.execute("SELECT COUNT(*) FROM bids WHERE typeof(raw_data) = 'text'").fetchone()[0]
+            if legacy:
+                logger.info(f"   [마이그레이션] v4: raw_data 압축 저장 사용 (기존 JSON 텍스트 {legacy}건은 --mode compact 로 변환)")
+
+        if version < 5:
+            # status: pending(받을 예정) | done(sha256 경로에 저장됨) | failed(다음 실행에서 재시도) | no_url(URL 없음)
             self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS bids (
-                    bid_no TEXT PRIMARY KEY,
-                    title TEXT,
-                    status TEXT,
-                    end_date TEXT,
-                    raw_data JSON,
-                    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                CREATE TABLE IF NOT EXISTS bid_files (
+                    bid_no TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    size_label TEXT,
+                    url TEXT,
+                    sha256 TEXT,
+                    bytes INTEGER,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (bid_no, seq)
                 )
             ''')
-            self.conn.commit()
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bid_files_status ON bid_files (status)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_bid_files_sha256 ON bid_files (sha256)")
+
+        self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def set_metrics(self, metrics):
+        """실행별 Metrics 연결 (호출 측/writer 스레드의 DB 작업 소요시간을 storage.* 타이머로 기록)"""
+        self.metrics = metrics
+        if self.writer:
+            self.writer.metrics = metrics
+
+    def _timed(self, name):
+        return self.metrics.timer(f"storage.{name}") if self.metrics else nullcontext()
+
+    def _write(self, op, name="write"):
+        """
+        쓰기 실행: write-behind 면 대기열에 넣고 True, 아니면 즉시 실행 후 커밋 (실패 시 롤백 후 False)
+        - op 는 예외를 잡지 않음 → 실패한 쓰기는 롤백되고, 호출 측은 False 면 메모리 인덱스를 갱신하지 않음
+        - write-behind 에서 실패하면 writer 가 롤백/보고 후 _on_write_failure 로 인덱스를 무효화
+        """
+        def timed_op(cursor):
+            with self._timed(name):
+                op(cursor)
+        timed_op.name = name
+
+        if self.writer:
+            self.writer.submit(timed_op)
+            return True
+        try:
+            timed_op(self.cursor)
+            with self._timed("commit"):
+                self.conn.commit()
         except Exception as e:
-            logger.info(f"   [DB에러] 초기화 실패: {e}")
+            self.conn.rollback()
+            self.codec.load()  # 롤백된 사전 등록(raw_keys)을 메모리에서도 되돌림
+            logger.info(f"      [DB에러] {name} 실패: {e}")
+            return False
+        return True
+
+    def _on_write_failure(self, cursor):
+        """writer 스레드: 롤백된 쓰기가 있으면 메모리 인덱스가 DB와 어긋났으므로 다음 조회 때 다시 적재"""
+        self._index_stale = True
+
+    def _sync_index(self):
+        """실패한 쓰기 이후 첫 조회면 메모리 인덱스를 DB 기준으로 다시 적재"""
+        if self._index_stale and self.index is not None:
+            self._index_stale = False
+            self.preload_index()
+
+    @staticmethod
+    def _log_change(cursor, bid_no, op, status=None, end_date=None):
+        """변경 이력 1건 기록 (bids 변경과 같은 트랜잭션에서 호출)"""
+        cursor.execute(
+            "INSERT INTO bid_changes (bid_no, op, status, end_date) VALUES (?, ?, ?, ?)",
+            (bid_no, op, status, end_date)
+        )
+
+    def flush(self):
+        """대기 중인 쓰기를 모두 DB에 반영 (조회 전 read-your-writes 보장)"""
+        if self.writer:
+            with self._timed("flush"):
+                self.writer.flush()
 
     def clean_old_data(self):
         """마감일 지났거나 1개월 초과 데이터 삭제 (단, 마감일이 빈 값인 경우는 날짜 비교 삭제 제외)"""
-        try:
-            now = datetime.now()
-            month_ago = (now - timedelta(days=31)).strftime("%Y-%m-%d %H:%M")
-            now_str = now.strftime("%Y-%m-%d %H:%M")
-            
-            # 1. (end_date < now) AND (end_date != '') AND (end_date IS NOT NULL)
-            #    => 마감일이 존재하고, 현재 시간보다 과거인 경우만 삭제
-            # 2. OR (collected_at < month_ago)
+        now_ts = int(time.time())
+        month_ago_ts = now_ts - 31 * 24 * 3600
+
+        def op(cursor):
+            # 1. end_ts < now
+            #    => 마감일이 존재(파싱 성공)하고, 현재 시간보다 과거인 경우만 삭제 (NULL 은 비교에서 제외)
+            # 2. OR collected_ts < month_ago
             #    => 수집한 지 1달이 넘은 데이터는 무조건 삭제
-            
-            self.cursor.execute('''
-                DELETE FROM bids 
-                WHERE (end_date < ? AND end_date != '' AND end_date IS NOT NULL) 
-                   OR collected_at < ?
-            ''', (now_str, month_ago))
-            
-            deleted = self.cursor.rowcount
-            self.conn.commit()
+            # 두 조건 모두 인덱스 범위 조회 (idx_bids_end_ts, idx_bids_collected_ts)
+
+            where = "WHERE end_ts < ? OR collected_ts < ?"
+            # 삭제 대상은 expire 이력으로 먼저 남김
+            cursor.execute(
+                f"INSERT INTO bid_changes (bid_no, op, status, end_date) "
+                f"SELECT bid_no, 'expire', status, end_date FROM bids {where}",
+                (now_ts, month_ago_ts)
+            )
+            if self.fts_enabled:
+                cursor.execute(
+                    f"DELETE FROM bids_fts WHERE rowid IN (SELECT rowid FROM bids {where})",
+                    (now_ts, month_ago_ts)
+                )
+            # 첨부파일 연결만 삭제 (내용 해시 파일은 다른 공고와 공유될 수 있으므로 유지)
+            cursor.execute(
+                f"DELETE FROM bid_files WHERE bid_no IN (SELECT bid_no FROM bids {where})",
+                (now_ts, month_ago_ts)
+            )
+            cursor.execute(f"DELETE FROM bids {where}", (now_ts, month_ago_ts))
+
+            deleted = cursor.rowcount
             if deleted > 0:
                 logger.info(f"   [정리] 만료(날짜확인됨)/오래된 데이터 {deleted}건 삭제 완료")
+
+        self._write(op, "clean_old_data")
+        self.flush()
+        if self.index is not None:
+            self.preload_index()
+
+    def preload_index(self):
+        """전체 (bid_no, status, end_date, 지문)를 메모리 인덱스로 적재 → 이후 get_meta/get_status/get_fingerprints는 DB 조회 없이 응답"""
+        self.flush()
+        try:
+            with self._timed("preload_index"):
+                self.cursor.execute("SELECT bid_no, status, end_date, list_fp, detail_fp FROM bids")
+                rows = self.cursor.fetchall()
+                self.index = {row[0]: (row[1], row[2]) for row in rows}
+                self.fingerprints = {row[0]: (row[3], row[4]) for row in rows}
+            logger.info(f"   [인덱스] 메타데이터 {len(self.index)}건 적재")
         except Exception as e:
-            logger.info(f"   [DB에러] 데이터 정리 실패: {e}")
+            self.index = None
+            self.fingerprints = None
+            logger.info(f"   [DB에러] 인덱스 적재 실패: {e}")
 
     def get_status(self, bid_no: str):
         """DB에 저장된 상태 반환 (없으면 None)"""
+        self._sync_index()
+        if self.index is not None:
+            return self.index.get(bid_no, (None, None))[0]
+        self.flush()
         try:
             self.cursor.execute("SELECT status FROM bids WHERE bid_no = ?", (bid_no,))
             res = self.cursor.fetchone()
@@ -66,6 +517,10 @@ class Storage:
 
     def get_meta(self, bid_no: str):
         """DB에 저장된 status, end_date 반환 (없으면 (None, None))"""
+        self._sync_index()
+        if self.index is not None:
+            return self.index.get(bid_no, (None, None))
+        self.flush()
         try:
             self.cursor.execute("SELECT status, end_date FROM bids WHERE bid_no = ?", (bid_no,))
             res = self.cursor.fetchone()
@@ -75,89 +530,554 @@ class Storage:
         except:
             return None, None
 
-    def update_end_date(self, bid_no: str, end_date_str: str):
+    def get_fingerprints(self, bid_no: str):
+        """DB에 저장된 (list_fp, detail_fp) 반환 (없으면 (None, None))"""
+        self._sync_index()
+        if self.fingerprints is not None:
+            return self.fingerprints.get(bid_no, (None, None))
+        self.flush()
+        try:
+            self.cursor.execute("SELECT list_fp, detail_fp FROM bids WHERE bid_no = ?", (bid_no,))
+            res = self.cursor.fetchone()
+            return (res[0], res[1]) if res else (None, None)
+        except:
+            return None, None
+
+    def set_list_fingerprint(self, bid_no: str, list_fp: str):
+        """목록 행 지문만 갱신 (지문이 없던 기존 공고 채움, 상세 재수집 없이 목록 값만 보정한 경우)"""
+        def op(cursor):
+            cursor.execute("UPDATE bids SET list_fp = ? WHERE bid_no = ?", (list_fp, bid_no))
+
+        if self._write(op, "set_list_fingerprint") and self.fingerprints is not None and bid_no in self.fingerprints:
+            self.fingerprints[bid_no] = (list_fp, self.fingerprints[bid_no][1])
+
+    def update_end_date(self, bid_no: str, end_date_str: str, list_fp: str = None):
         """
         end_date 업데이트 + raw_data 안에 '입찰서접수마감일시'가 없거나 빈 값이면 같이 업데이트.
-        상세 재수집 없이 '응찰 가능 데이터' 품질을 맞추기 위한 보정용.
+        상세 재수집 없이 '응찰 가능 데이터' 품질을 맞추기 위한 보정용. (list_fp 를 주면 목록 지문도 갱신)
         """
-        try:
+        def op(cursor):
             # raw_data 로드
-            self.cursor.execute("SELECT raw_data FROM bids WHERE bid_no = ?", (bid_no,))
-            res = self.cursor.fetchone()
+            cursor.execute("SELECT raw_data FROM bids WHERE bid_no = ?", (bid_no,))
+            res = cursor.fetchone()
             raw = res[0] if res else None
 
             updated_raw = None
+            detail_fp = None
             if raw:
                 try:
-                    obj = json.loads(raw)
+                    obj = self.codec.decode(raw, cursor)  # writer 스레드면 사전 재적재도 writer 연결로
                     # 키가 없거나 빈 값일 때만 보정
                     if not obj.get("입찰서접수마감일시"):
                         obj["입찰서접수마감일시"] = end_date_str
-                    updated_raw = json.dumps(obj, ensure_ascii=False)
-                except:
+                    updated_raw = self.codec.encode(obj, cursor)
+                    detail_fp = detail_fingerprint(obj)
+                except (ValueError, AttributeError):
                     updated_raw = raw  # 파싱 실패 시 원본 유지
 
             if updated_raw is None:
                 # raw_data가 없는 케이스 대비
-                updated_raw = json.dumps({"입찰서접수마감일시": end_date_str}, ensure_ascii=False)
+                updated_raw = self.codec.encode({"입찰서접수마감일시": end_date_str}, cursor)
 
-            self.cursor.execute('''
+            cursor.execute('''
                 UPDATE bids
                    SET end_date = ?,
                        raw_data = ?,
-                       collected_at = CURRENT_TIMESTAMP
+                       collected_at = CURRENT_TIMESTAMP,
+                       end_ts = ?,
+                       collected_ts = ?,
+                       list_fp = COALESCE(?, list_fp),
+                       detail_fp = COALESCE(?, detail_fp)
                  WHERE bid_no = ?
-            ''', (end_date_str, updated_raw, bid_no))
+            ''', (end_date_str, updated_raw, site_epoch(end_date_str), int(time.time()), list_fp, detail_fp, bid_no))
+            if cursor.rowcount:
+                cursor.execute("SELECT status FROM bids WHERE bid_no = ?", (bid_no,))
+                self._log_change(cursor, bid_no, "update", cursor.fetchone()[0], end_date_str)
 
-            self.conn.commit()
-            logger.info(f"      [갱신] 마감일시(end_date) 업데이트 완료: {bid_no} -> {end_date_str}")
-            return True
+            logger.debug(f"      [갱신] 마감일시(end_date) 업데이트 완료: {bid_no} -> {end_date_str}", extra={"bid_no": bid_no})
 
-        except Exception as e:
-            logger.info(f"      [DB에러] 마감일시 업데이트 실패: {bid_no} ({e})")
+        if not self._write(op, "update_end_date"):
             return False
 
+        if self.index is not None and bid_no in self.index:
+            self.index[bid_no] = (self.index[bid_no][0], end_date_str)
+        if list_fp and self.fingerprints is not None and bid_no in self.fingerprints:
+            self.fingerprints[bid_no] = (list_fp, self.fingerprints[bid_no][1])
+        return True
+
     def delete(self, bid_no: str):
         """특정 공고 삭제"""
+        def op(cursor):
+            if self.fts_enabled:
+                cursor.execute(
+                    "DELETE FROM bids_fts WHERE rowid = (SELECT rowid FROM bids WHERE bid_no = ?)", (bid_no,)
+                )
+            cursor.execute("DELETE FROM bid_files WHERE bid_no = ?", (bid_no,))
+            cursor.execute("DELETE FROM bids WHERE bid_no = ?", (bid_no,))
+            if cursor.rowcount:
+                self._log_change(cursor, bid_no, "delete")
+
+        if not self._write(op, "delete"):
+            return
+
+        if self.index is not None:
+            self.index.pop(bid_no, None)
+        if self.fingerprints is not None:
+            self.fingerprints.pop(bid_no, None)
+
+    def save(self, data: dict, list_fp: str = None):
+        """
+        데이터 저장 (list_fp: 상세로 들어간 목록 행 지문, 없으면 기존 값 유지)
+        - 재수집한 상세가 저장본과 같으면(detail_fp 동일) 목록 지문만 갱신하고 변경 이력을 남기지 않음
+        """
+        bid_no = data.get('입찰공고번호', 'UNKNOWN')
+        title = data.get('입찰공고명', 'No Title')
+        status = data.get('진행상태', '')
+
+        # 마감일시 추출 (YYYY/MM/DD HH:MM)
+        end_date_str = data.get('입찰서접수마감일시', '')
+        detail_fp = detail_fingerprint(data)
+
+        def op(cursor):
+            raw = self.codec.encode(data, cursor)  # 새 키는 이 쓰기와 같은 트랜잭션에서 사전에 등록
+            cursor.execute("SELECT rowid, list_fp, detail_fp FROM bids WHERE bid_no = ?", (bid_no,))
+            old = cursor.fetchone()
+            new_list_fp = list_fp or (old[1] if old else None)
+            if old and old[2] == detail_fp:
+                cursor.execute("UPDATE bids SET list_fp = ? WHERE bid_no = ?", (new_list_fp, bid_no))
+                if self.metrics:
+                    self.metrics.incr("detail.unchanged")
+                logger.debug(f"      [저장] 상세 변경 없음 (목록 지문만 갱신): {bid_no}", extra={"bid_no": bid_no})
+                return
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO bids (bid_no, title, status, end_date, raw_data, collected_at,
+                                             end_ts, open_ts, collected_ts,
+                                             category, contract_method, budget, region_limit, region, department, open_place,
+                                             list_fp, detail_fp)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (bid_no, title, status, end_date_str, raw,
+                  site_epoch(end_date_str), site_epoch(data.get('개찰일시')), int(time.time()),
+                  *business_fields(data), new_list_fp, detail_fp))
+            if self.fts_enabled:
+                # INSERT OR REPLACE 는 새 rowid 를 받으므로 이전 색인 행 삭제 후 새 rowid 로 추가
+                rowid = cursor.lastrowid
+                if old:
+                    cursor.execute("DELETE FROM bids_fts WHERE rowid = ?", (old[0],))
+                cursor.execute(
+                    f"INSERT INTO bids_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+                    f"VALUES (?{', ?' * len(FTS_COLUMNS)})",
+                    (rowid, *fts_values(data))
+                )
+            self._log_change(cursor, bid_no, "update" if old else "insert", status, end_date_str)
+
+            logger.debug(f"      [저장] DB 저장 완료: {bid_no}", extra={"bid_no": bid_no})
+
+        if not self._write(op, "save"):
+            return
+
+        if self.index is not None:
+            self.index[bid_no] = (status, end_date_str)
+        if self.fingerprints is not None:
+            # 쓰기 지연 중이면 기존 list_fp 를 아직 모르므로 새 값이 없을 때는 메모리 값 유지
+            self.fingerprints[bid_no] = (list_fp or self.fingerprints.get(bid_no, (None, None))[0], detail_fp)
+
+    def link_files(self, bid_no: str, files):
+        """
+        공고 ↔ 첨부파일 연결 갱신 (files: [{seq, name, size, url}], seq 는 그리드 순번)
+        - 파일명/크기/URL 이 같고 이미 받은 파일은 done 유지, 바뀐 파일은 pending 으로 되돌림
+        - 그리드에서 빠진 순번은 연결 삭제
+        """
+        rows = [
+            (bid_no, item["seq"], item["name"], item["size"], item["url"], "pending" if item["url"] else "no_url")
+            for item in files
+        ]
+
+        def op(cursor):
+            cursor.executemany('''
+                INSERT INTO bid_files (bid_no, seq, name, size_label, url, status) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (bid_no, seq) DO UPDATE SET
+                    status = CASE WHEN bid_files.status = 'done' AND bid_files.name = excluded.name
+                                       AND bid_files.size_label IS excluded.size_label
+                                       AND bid_files.url IS excluded.url
+                                  THEN 'done' ELSE excluded.status END,
+                    attempts = CASE WHEN bid_files.url IS excluded.url AND bid_files.name = excluded.name
+                                    THEN bid_files.attempts ELSE 0 END,
+                    name = excluded.name,
+                    size_label = excluded.size_label,
+                    url = excluded.url,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', rows)
+            cursor.execute("DELETE FROM bid_files WHERE bid_no = ? AND seq >= ?", (bid_no, len(rows)))
+
+        self._write(op, "link_files")
+
+    def mark_file(self, bid_no: str, seq: int, status: str, sha256: str = None, size: int = None, error: str = None):
+        """첨부파일 다운로드 결과 기록 (시도 횟수 +1, done 이면 내용 해시/바이트 수 저장)"""
+        def op(cursor):
+            cursor.execute('''
+                UPDATE bid_files
+                   SET status = ?, sha256 = COALESCE(?, sha256), bytes = COALESCE(?, bytes), error = ?,
+                       attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                 WHERE bid_no = ? AND seq = ?
+            ''', (status, sha256, size, error, bid_no, seq))
+
+        self._write(op, "mark_file")
+
+    def pending_files(self, max_attempts: int):
+        """아직 받지 못한(pending/failed) 첨부파일 중 시도 횟수가 남은 것 → [{bid_no, seq, name, size, url}]"""
+        self.flush()
+        self.cursor.execute('''
+            SELECT bid_no, seq, name, size_label, url FROM bid_files
+             WHERE status IN ('pending', 'failed') AND url IS NOT NULL AND attempts < ?
+             ORDER BY updated_at
+        ''', (max_attempts,))
+        return [
+            {"bid_no": bid_no, "seq": seq, "name": name, "size": size, "url": url}
+            for bid_no, seq, name, size, url in self.cursor.fetchall()
+        ]
+
+    def downloaded_files(self):
+        """받은 첨부파일 (bid_no, 순번) → (파일명, 크기, URL) (같은 파일 재다운로드 방지)"""
+        self.flush()
+        self.cursor.execute("SELECT bid_no, seq, name, size_label, url FROM bid_files WHERE status = 'done'")
+        return {(bid_no, seq): (name, size, url) for bid_no, seq, name, size, url in self.cursor.fetchall()}
+
+    def get_files(self, bid_no: str):
+        """공고의 첨부파일 연결 목록 (그리드 순서, done 이면 sha256 으로 ATTACH_DIR 경로를 찾음)"""
+        self.flush()
+        self.cursor.execute(
+            "SELECT seq, name, size_label, url, sha256, bytes, status FROM bid_files WHERE bid_no = ? ORDER BY seq",
+            (bid_no,)
+        )
+        columns = ("seq", "name", "size", "url", "sha256", "bytes", "status")
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+
+    def get_state(self, key: str, default=None):
+        """crawl_state 값(JSON) 조회 (없으면 default)"""
+        self.flush()
         try:
-            self.cursor.execute("DELETE FROM bids WHERE bid_no = ?", (bid_no,))
-            self.conn.commit()
+            self.cursor.execute("SELECT value FROM crawl_state WHERE key = ?", (key,))
+            res = self.cursor.fetchone()
+            return json.loads(res[0]) if res else default
         except Exception as e:
-            logger.info(f"      [DB에러] 삭제 실패: {bid_no} ({e})")
+            logger.info(f"   [DB에러] 상태 조회 실패: {key} ({e})")
+            return default
 
-    def save(self, data: dict):
-        """데이터 저장"""
+    def set_state(self, key: str, value):
+        """crawl_state 값(JSON) 저장"""
+        payload = json.dumps(value, ensure_ascii=False)
+
+        def op(cursor):
+            cursor.execute('''
+                INSERT OR REPLACE INTO crawl_state (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (key, payload))
+
+        self._write(op, "set_state")
+
+    @staticmethod
+    def _filter_clauses(status=None, deadline_from=None, deadline_to=None, category=None, contract_method=None,
+                        budget_min=None, budget_max=None, region=None, department=None):
+        """
+        공통 조회 조건 → (WHERE 절 목록, 파라미터)
+        - deadline_from/deadline_to: 마감일시 범위 (YYYY/MM/DD HH:MM 문자열 또는 epoch 초, end_ts 인덱스 사용)
+        - budget_min/budget_max: 배정예산(원) 범위, category/contract_method/region: 일치, department: 부분 일치
+        """
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if deadline_from:
+            clauses.append("end_ts >= ?")
+            params.append(deadline_from if isinstance(deadline_from, int) else site_epoch(deadline_from))
+        if deadline_to:
+            clauses.append("end_ts <= ?")
+            params.append(deadline_to if isinstance(deadline_to, int) else site_epoch(deadline_to))
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if contract_method:
+            clauses.append("contract_method = ?")
+            params.append(contract_method)
+        if budget_min is not None:
+            clauses.append("budget >= ?")
+            params.append(budget_min)
+        if budget_max is not None:
+            clauses.append("budget <= ?")
+            params.append(budget_max)
+        if region:
+            clauses.append("region = ?")
+            params.append(region)
+        if department:
+            clauses.append("department LIKE ?")
+            params.append(f"%{department}%")
+        return clauses, params
+
+    def iter_rows(self, after=None, until=None, ascending=False, batch_size: int = 500, **filters):
+        """
+        (bid_no, collected_at, raw_data JSON 문자열) 을 batch_size 씩 읽어 순서대로 반환 (전체를 메모리에 올리지 않음)
+        - 압축 저장된 행은 JSON 텍스트로 복원, 해석할 수 없는 행은 raw_data 를 None 으로 반환
+        - after: (collected_at, bid_no) 커서, 이보다 뒤에 수집/갱신된 행만 (since 는 (since, '') 로 전달)
+        - until: 이 시각 이전(미만)에 수집된 행만
+        - filters: _filter_clauses 조건 (status, deadline_from/to, category, budget_min/max, region ...)
+        """
+        self.flush()
+        clauses, params = self._filter_clauses(**filters)
+        if after:
+            clauses.append("(collected_at > ? OR (collected_at = ? AND bid_no > ?))")
+            params += [after[0], after[0], after[1]]
+        if until:
+            clauses.append("collected_at < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ASC" if ascending else "DESC"
+        # 조회 중에도 self.cursor 를 쓰는 다른 호출이 섞일 수 있으므로 전용 커서 사용
+        cursor = self.conn.cursor()
         try:
-            bid_no = data.get('입찰공고번호', 'UNKNOWN')
-            title = data.get('입찰공고명', 'No Title')
-            status = data.get('진행상태', '')
-            
-            # 마감일시 추출 (YYYY/MM/DD HH:MM)
-            end_date_str = data.get('입찰서접수마감일시', '')
-            
-            self.cursor.execute('''
-                INSERT OR REPLACE INTO bids (bid_no, title, status, end_date, raw_data, collected_at)
-                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (bid_no, title, status, end_date_str, json.dumps(data, ensure_ascii=False)))
-            
+            cursor.execute(
+                f"SELECT bid_no, collected_at, raw_data FROM bids {where} "
+                f"ORDER BY collected_at {order}, bid_no {order}",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for bid_no, collected_at, raw in rows:
+                    try:
+                        yield bid_no, collected_at, self.codec.text(raw)
+                    except ValueError:
+                        yield bid_no, collected_at, None
+        finally:
+            cursor.close()
+
+    def query_bids(self, limit: int = 100, order_by: str = "budget", **filters):
+        """
+        업무 필드 조건 조회 (예: query_bids(category="용역", budget_min=100_000_000, region="서울"))
+        - 타입 컬럼 인덱스로 걸러 raw_data 를 반환 (전체 스캔/json 파싱 없음)
+        - order_by: "budget"(예산 큰 순) | "deadline"(마감 임박 순) | "recent"(최근 수집 순)
+        """
+        orders = {"budget": "budget DESC", "deadline": "end_ts ASC", "recent": "collected_ts DESC"}
+        self.flush()
+        clauses, params = self._filter_clauses(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT raw_data FROM bids {where} ORDER BY {orders[order_by]} LIMIT ?",
+                params + [limit]
+            )
+            return [self.codec.decode(row[0]) for row in cursor.fetchall() if row[0]]
+        finally:
+            cursor.close()
+
+    def search(self, query: str, limit: int = 20, status=None):
+        """
+        입찰공고명/업종제한사항/공고정보/담당부서 전문 검색 → 관련도 순 결과
+        - 3글자 이상 검색어: FTS5 trigram 색인 MATCH + bm25 순위 + snippet
+        - 2글자 이하 검색어(예: '용역'): 색인 테이블에 LIKE 조건으로 추가 (trigram 은 3글자 미만을 찾지 못함)
+        반환: [{bid_no, title, end_date, budget, score, snippet}]
+        """
+        long_terms, short_terms = split_terms(query)
+        if not long_terms and not short_terms:
+            return []
+        self.flush()
+
+        if self.fts_enabled:
+            columns = [f"bids_fts.{column}" for column in FTS_COLUMNS]
+        else:
+            columns = ["b.title", "raw_json(b.raw_data)"]
+        clauses, params = [], []
+        if long_terms and self.fts_enabled:
+            clauses.append("bids_fts MATCH ?")
+            params.append(match_expression(long_terms))
+            like_terms = short_terms
+        else:
+            like_terms = long_terms + short_terms
+        for term in like_terms:
+            clauses.append("(" + " OR ".join(f"{column} LIKE ?" for column in columns) + ")")
+            params += [f"%{term}%"] * len(columns)
+        if status:
+            clauses.append("b.status = ?")
+            params.append(status)
+
+        matched = bool(long_terms and self.fts_enabled)
+        score = "bm25(bids_fts, 10.0, 2.0, 2.0, 1.0)" if matched else "0"
+        snippet = "snippet(bids_fts, -1, '[', ']', '…', 16)" if matched else "NULL"
+        texts = ", ".join(columns)
+        join = "JOIN bids b ON b.rowid = bids_fts.rowid" if self.fts_enabled else ""
+        source = f"bids_fts {join}" if self.fts_enabled else "bids b"
+        order = "score" if matched else "b.collected_ts DESC"
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT b.bid_no, b.title, b.end_date, b.budget, {score} AS score, {snippet}, {texts} "
+                f"FROM {source} WHERE {' AND '.join(clauses)} ORDER BY {order} LIMIT ?",
+                params + [limit]
+            )
+            results = []
+            for bid_no, title, end_date, budget, rank, snip, *column_texts in cursor.fetchall():
+                results.append({
+                    "bid_no": bid_no,
+                    "title": title,
+                    "end_date": end_date,
+                    "budget": budget,
+                    "score": round(-rank, 3) if matched else None,
+                    "snippet": snip or make_snippet(column_texts, long_terms + short_terms),
+                })
+            return results
+        finally:
+            cursor.close()
+
+    def expiring_within(self, hours: float, status=None):
+        """지금부터 hours 시간 안에 마감되는 공고(raw_data) 를 마감 임박 순으로 반환 (end_ts 인덱스 범위 조회)"""
+        self.flush()
+        now_ts = int(time.time())
+        sql = "SELECT raw_data FROM bids WHERE end_ts BETWEEN ? AND ?"
+        params = [now_ts, now_ts + int(hours * 3600)]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql + " ORDER BY end_ts", params)
+            return [self.codec.decode(row[0]) for row in cursor.fetchall() if row[0]]
+        finally:
+            cursor.close()
+
+    def get_changes(self, after_seq: int = 0, limit: int = 1000):
+        """
+        after_seq 이후 변경 이력을 seq 순으로 최대 limit 건 반환
+        - insert/update 의 data 는 변경 당시 스냅샷이 아니라 조회 시점의 현재 raw_data (이후 삭제됐으면 None)
+          → 예: insert 항목에도 그 뒤의 마감일시 갱신이 반영되어 있음, 변경 시점 값은 status/end_date 컬럼 참고
+        - 호출 측은 마지막 seq 를 다음 커서로 사용
+        """
+        self.flush()
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT c.seq, c.bid_no, c.op, c.status, c.end_date, c.changed_at,
+                       CASE WHEN c.op IN ('insert', 'update') THEN b.raw_data END
+                  FROM bid_changes c
+                  LEFT JOIN bids b ON b.bid_no = c.bid_no
+                 WHERE c.seq > ?
+                 ORDER BY c.seq
+                 LIMIT ?
+            ''', (after_seq, limit))
+            return [
+                {
+                    "seq": seq, "bid_no": bid_no, "op": op, "status": status, "end_date": end_date,
+                    "changed_at": changed_at, "data": self.codec.decode(raw),
+                }
+                for seq, bid_no, op, status, end_date, changed_at, raw in cursor.fetchall()
+            ]
+        finally:
+            cursor.close()
+
+    def change_bounds(self):
+        """보관 중인 변경 이력의 (최소 seq, 최대 seq) (비어 있으면 (None, None))"""
+        self.flush()
+        self.cursor.execute("SELECT MIN(seq), MAX(seq) FROM bid_changes")
+        return self.cursor.fetchone()
+
+    def count_changes(self, after_seq: int = 0, op: str = None):
+        """after_seq 이후 변경 이력 건수 (op 지정 시 해당 종류만, 예: 실행 중 신규 공고 수 = op='insert')"""
+        self.flush()
+        sql = "SELECT COUNT(*) FROM bid_changes WHERE seq > ?"
+        params = [after_seq or 0]
+        if op:
+            sql += " AND op = ?"
+            params.append(op)
+        self.cursor.execute(sql, params)
+        return self.cursor.fetchone()[0]
+
+    def compact_changes(self, retention_days: int = CHANGELOG_RETENTION_DAYS):
+        """retention_days 보다 오래된 변경 이력 삭제 (seq 는 AUTOINCREMENT 라 재사용되지 않음)"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+        def op(cursor):
+            cursor.execute("DELETE FROM bid_changes WHERE changed_at < ?", (cutoff,))
+            if cursor.rowcount > 0:
+                logger.info(f"   [정리] {retention_days}일 지난 변경 이력 {cursor.rowcount}건 삭제")
+
+        self._write(op, "compact_changes")
+
+    def raw_size(self):
+        """raw_data 크기 현황: 행 수, raw_data 합계(바이트), JSON 텍스트 행 수, DB 파일 크기(WAL 포함)"""
+        self.flush()
+        rows, raw_bytes, text_rows = self.cursor.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(CAST(raw_data AS BLOB))), 0), "
+            "COALESCE(SUM(typeof(raw_data) = 'text'), 0) FROM bids"
+        ).fetchone()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        paths = (str(self.db_path), f"{self.db_path}-wal")
+        file_bytes = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+        return {"rows": rows, "raw_bytes": raw_bytes, "text_rows": text_rows, "file_bytes": file_bytes}
+
+    def compact_raw(self, min_length: int = RAW_INTERN_MIN_LENGTH, min_count: int = RAW_INTERN_MIN_COUNT,
+                    batch_size: int = 500):
+        """
+        raw_data 일괄 변환 (--mode compact) → {"before": raw_size(), "after": raw_size(), "converted", "interned", "failed"}
+        1. min_length 이상이면서 min_count 건 이상 반복되는 값(업종제한사항 안내문 등)을 공유 값(raw_values)으로 등록
+        2. 모든 행을 현재 사전/압축 설정으로 다시 저장 (JSON 텍스트 → 압축, 압축 행도 새 공유 값 반영)
+        3. VACUUM 으로 빈 페이지를 반환해 DB 파일 크기까지 줄임
+        """
+        before = self.raw_size()
+
+        counts = Counter()
+        cursor = self.conn.cursor()
+        try:
+            for (raw,) in cursor.execute("SELECT raw_data FROM bids"):
+                try:
+                    data = self.codec.decode(raw) or {}
+                except ValueError:
+                    continue
+                counts.update(value for value in data.values() if isinstance(value, str) and len(value) >= min_length)
+        finally:
+            cursor.close()
+        interned = self.codec.intern(value for value, count in counts.items() if count >= min_count)
+
+        rowids = [row[0] for row in self.cursor.execute("SELECT rowid FROM bids")]
+        converted = failed = 0
+        for start in range(0, len(rowids), batch_size):
+            chunk = rowids[start:start + batch_size]
+            rows = self.cursor.execute(
+                f"SELECT rowid, raw_data FROM bids WHERE rowid IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            updates = []
+            for rowid, raw in rows:
+                try:
+                    data = self.codec.decode(raw)
+                except ValueError:
+                    failed += 1
+                    continue
+                if data is not None:
+                    updates.append((self.codec.encode(data, self.cursor), rowid))
+            self.cursor.executemany("UPDATE bids SET raw_data = ? WHERE rowid = ?", updates)
             self.conn.commit()
-            logger.info(f"      [저장] DB 저장 완료: {bid_no}")
-                
-        except Exception as e:
-            logger.info(f"      [DB에러] 저장 실패: {e}")
+            converted += len(updates)
+
+        self.conn.execute("VACUUM")
+        return {"before": before, "after": self.raw_size(), "converted": converted, "interned": interned,
+                "failed": failed}
 
     def fetch_all(self):
         """DB에 저장된 모든 데이터(raw_data) 반환"""
+        self.flush()
         try:
-            self.cursor.execute("SELECT raw_data FROM bids ORDER BY collected_at DESC")
-            rows = self.cursor.fetchall()
-            
+            with self._timed("fetch_all"):
+                self.cursor.execute("SELECT raw_data FROM bids ORDER BY collected_at DESC")
+                rows = self.cursor.fetchall()
+
             result = []
             for row in rows:
                 if row[0]:
                     try:
-                        # JSON 문자열을 파이썬 객체로 변환
-                        result.append(json.loads(row[0]))
+                        # JSON 문자열/압축 BLOB 을 파이썬 객체로 변환
+                        result.append(self.codec.decode(row[0]))
                     except:
                         continue
             return result
@@ -166,5 +1086,12 @@ class Storage:
             return []
 
     def close(self):
+        """대기 중인 쓰기를 모두 커밋한 뒤 연결 종료 (여러 번 호출해도 안전)"""
+        if self.writer:
+            self.writer.flush()
+            self.writer.close()
+            self.writer = None
         if self.conn:
-            self.conn.close()
\ No newline at end of file
+            self.conn.close()
+            self.conn = None
+        atexit.unregister(self.close)
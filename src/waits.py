@@ -0,0 +1,84 @@
+import time
+from collections import defaultdict
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from src.config import WAIT_TIMEOUTS, LOADING_SELECTOR
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+
+class WaitEngine:
+    """
+    고정 sleep 대신 실제 준비 신호를 기다리는 대기 유틸
+    - selector: 요소가 나타날 때까지
+    - loading: WebSquare 로딩바(LOADING_SELECTOR)가 사라질 때까지
+    - network_idle: 네트워크 요청이 잠잠해질 때까지
+    - grid: 목록 첫 행 공고번호가 바뀔 때까지
+    대기 종류별 타임아웃은 config.WAIT_TIMEOUTS(ms), 실제 소요 시간은 종류별로 집계
+    """
+
+    def __init__(self):
+        self.stats = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+
+    def _record(self, kind, started, timed_out=False):
+        elapsed = time.time() - started
+        stat = self.stats[kind]
+        stat["count"] += 1
+        stat["total"] += elapsed
+        stat["max"] = max(stat["max"], elapsed)
+        if timed_out:
+            stat["timeouts"] += 1
+
+    async def selector(self, page, selector, state="visible", kind="selector"):
+        """요소가 state 가 될 때까지 대기 (시간 초과 시 False)"""
+        started = time.time()
+        try:
+            await page.wait_for_selector(selector, state=state, timeout=WAIT_TIMEOUTS[kind])
+            self._record(kind, started)
+            return True
+        except PlaywrightTimeoutError:
+            self._record(kind, started, timed_out=True)
+            return False
+
+    async def loading_done(self, page):
+        """WebSquare 로딩 표시가 없어질 때까지 대기 (로딩바가 없으면 즉시 반환)"""
+        return await self.selector(page, LOADING_SELECTOR, state="hidden", kind="loading")
+
+    async def network_idle(self, page):
+        """네트워크 요청이 잠잠해질 때까지 대기"""
+        started = time.time()
+        try:
+            await page.wait_for_load_state("networkidle", timeout=WAIT_TIMEOUTS["network_idle"])
+            self._record("network_idle", started)
+            return True
+        except PlaywrightTimeoutError:
+            self._record("network_idle", started, timed_out=True)
+            return False
+
+    async def grid_change(self, page, row_selector, old_bid_no):
+        """목록 첫 행 공고번호가 old_bid_no 와 달라질 때까지 대기 (DOM 변경 시점에 즉시 반환)"""
+        started = time.time()
+        try:
+            await page.wait_for_function(
+                """([sel, oldBidNo]) => {
+                    const cell = document.querySelector(sel + " td[col_id='bidPbancNum']");
+                    const bidNo = cell ? cell.innerText.trim() : "";
+                    return bidNo !== "" && bidNo !== oldBidNo;
+                }""",
+                arg=[row_selector, old_bid_no],
+                timeout=WAIT_TIMEOUTS["grid"]
+            )
+            self._record("grid", started)
+            return True
+        except PlaywrightTimeoutError:
+            self._record("grid", started, timed_out=True)
+            return False
+
+    def report(self):
+        """대기 종류별 횟수/평균/최대/시간초과 로그"""
+        for kind, stat in sorted(self.stats.items()):
+            avg = stat["total"] / stat["count"] if stat["count"] else 0.0
+            logger.info(
+                f"   [대기] {kind}: {stat['count']}회, 합계 {stat['total']:.1f}초, "
+                f"평균 {avg:.2f}초, 최대 {stat['max']:.2f}초, 시간초과 {stat['timeouts']}회"
+            )
@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timedelta
+from src.config import INCREMENTAL, INCREMENTAL_STOP_PAGES, FULL_SWEEP_INTERVAL_HOURS
+from src.logger import get_logger
+
+logger = get_logger("CRAWLER")
+
+STATE_KEY = "watermark"
+
+
+def page_fingerprint(rows):
+    """목록 한 페이지의 (공고번호, 상태, 마감일시) 지문"""
+    text = "\n".join(f"{row['bid_no']}|{row['status']}|{row['deadline']}" for row in rows)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CrawlWatermark:
+    """
+    증분 수집 워터마크 (crawl_state 테이블에 저장)
+    - newest_bid_no: 지난 실행의 1페이지 첫 공고 (목록 화면에는 게시일시가 없으므로 공고번호로 판단)
+      → 1페이지 첫 공고와 페이지 지문이 그대로이고 모든 행이 알려진 공고면 새 공고가 없는 것으로 보고 1페이지에서 바로 중단
+    - page_fps: 페이지 번호별 지문 (이전 실행과 같으면 해당 페이지 행 검사 생략)
+    - last_full_sweep: 마지막 전체 순회 완료 시각 (FULL_SWEEP_INTERVAL_HOURS 마다 전체 순회)
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.state = storage.get_state(STATE_KEY, {}) or {}
+        self.page_fps = dict(self.state.get("page_fps", {}))
+        self.streak = 0
+        self.full_sweep = self._need_full_sweep()
+
+        mode = "전체 순회" if self.full_sweep else f"증분 (알려진 페이지 {INCREMENTAL_STOP_PAGES}연속 시 중단)"
+        logger.info(f">>> [증분] 수집 모드: {mode}")
+
+    def _need_full_sweep(self):
+        if not INCREMENTAL:
+            return True
+        last = self.state.get("last_full_sweep")
+        if not last:
+            return True
+        try:
+            return datetime.now() - datetime.fromisoformat(last) >= timedelta(hours=FULL_SWEEP_INTERVAL_HOURS)
+        except ValueError:
+            return True
+
+    def page_unchanged(self, page_num, fp):
+        """이전 실행과 같은 지문의 페이지인지 (전체 순회 중에는 항상 False)"""
+        return not self.full_sweep and self.page_fps.get(str(page_num)) == fp
+
+    def record_page(self, page_num, rows, fp, all_known):
+        """
+        페이지 처리 결과 기록 → 증분 중단 여부 반환
+        all_known: 모든 행이 DB에 같은 상태로 이미 있었는지 (처리 전 기준)
+        """
+        previous_fp = self.page_fps.get(str(page_num))
+        self.page_fps[str(page_num)] = fp
+
+        head_unchanged = False
+        if page_num == 1 and rows:
+            head_unchanged = rows[0]["bid_no"] == self.state.get("newest_bid_no") and previous_fp == fp
+            self.state["newest_bid_no"] = rows[0]["bid_no"]
+            self.state.pop("newest_seen_at", None)  # 이전 버전에서 쓰던 값 (사용하지 않음)
+
+        if self.full_sweep:
+            return False
+
+        if head_unchanged and all_known:
+            logger.info("   [증분] 1페이지 최신 공고/지문이 지난 실행과 같음 -> 새 공고 없음")
+            return True
+
+        self.streak = self.streak + 1 if all_known else 0
+        return self.streak >= INCREMENTAL_STOP_PAGES
+
+    def save(self, completed: bool):
+        """워터마크 저장 (전체 순회를 끝까지 마쳤을 때만 last_full_sweep 갱신)"""
+        self.state["page_fps"] = self.page_fps
+        if self.full_sweep and completed:
+            self.state["last_full_sweep"] = datetime.now().isoformat(timespec="seconds")
+        self.storage.set_state(STATE_KEY, self.state)
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from src.logger import get_logger
+
+logger = get_logger("WORKER")
+
+
+@dataclass
+class DetailJob:
+    """워커에게 넘기는 상세 수집 작업 (목록에서 확인한 값)"""
+    page_num: int
+    bid_no: str
+    title: str
+    status: str
+    list_fp: str = None  # 목록 행 지문 (상세 저장 시 함께 기록)
+
+
+@dataclass
+class WorkerStats:
+    name: str
+    done: int = 0
+    failed: int = 0
+    busy_sec: float = 0.0
+    started_at: float = 0.0
+
+    def summary(self):
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        per_min = self.done / elapsed * 60
+        return (f"[워커] {self.name}: 완료 {self.done}건, 실패 {self.failed}건, "
+                f"작업시간 {self.busy_sec:.1f}초, 처리율 {per_min:.1f}건/분")
+
+
+class DetailWorkerPool:
+    """
+    상세 페이지 병렬 수집 워커 풀
+    - 워커마다 별도 Page를 열어 입찰공고목록 화면을 준비 (상세 직접 URL 사용 시 목록 준비 없이 상세만 이동)
+    - 목록 순회(메인 페이지)는 신규 공고만 대기열에 넣고 다음 페이지로 계속 진행
+    - 대기열 크기(queue_size)로 목록 순회 속도를 제한하고, 워커 수(size)로 동시성을 제한
+    """
+
+    def __init__(self, crawler, context, size: int, queue_size: int):
+        self.crawler = crawler
+        self.context = context
+        self.size = size
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.tasks = []
+        self.pages = []
+        self.stats = []
+        self.submitted = set()
+
+    def start(self):
+        for n in range(self.size):
+            stats = WorkerStats(name=f"worker-{n+1}", started_at=time.time())
+            self.stats.append(stats)
+            self.tasks.append(asyncio.create_task(self._worker(stats)))
+        logger.info(f">>> [워커] 상세 수집 워커 {self.size}개 시작")
+
+    async def submit(self, job: DetailJob):
+        """대기열에 작업 추가 (목록이 밀려 같은 공고가 다시 보이면 중복 요청하지 않음, 변경공고 재수집도 같은 대기열 사용)"""
+        if job.bid_no in self.submitted:
+            return False
+        self.submitted.add(job.bid_no)
+        await self.queue.put(job)
+        return True
+
+    async def close(self):
+        """대기열 소진 후 워커 종료 및 처리량 리포트"""
+        await self.queue.join()
+        for _ in self.tasks:
+            await self.queue.put(None)
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+        # 워커 페이지는 닫지 않고 다음 실행에서 재사용 (브라우저 종료 시 함께 정리)
+        self.crawler.idle_pages.extend(self.pages)
+        self.pages = []
+
+        for stats in self.stats:
+            logger.info(stats.summary())
+
+    async def _worker(self, stats: WorkerStats):
+        # 이전 실행에서 쓰던 워커 페이지가 있으면 재사용 (첫 작업 시 검색만 재실행)
+        page = self.crawler.idle_pages.pop() if self.crawler.idle_pages else None
+        if page is not None:
+            self.pages.append(page)
+        prepared = False
+        while True:
+            job = await self.queue.get()
+            try:
+                if job is None:
+                    return
+
+                started = time.time()
+                try:
+                    # 워커 페이지는 첫 작업 시점(또는 이전 실패 후)에 목록 화면을 준비
+                    if page is None:
+                        page = await self.context.new_page()
+                        self.pages.append(page)
+                    # 상세 직접 URL 을 쓰면 워커 페이지는 목록 화면이 필요 없음
+                    if not prepared and not self.crawler.detail_url:
+                        await self.crawler._ensure_bid_list(page)
+                    prepared = True
+
+                    ok = await self._process_job(page, job)
+                    if ok:
+                        stats.done += 1
+                    else:
+                        stats.failed += 1
+
+                except Exception as e:
+                    stats.failed += 1
+                    self.crawler.metrics.incr("detail.failed")
+                    logger.info(f"   [오류] {stats.name} 상세 처리 실패: {job.bid_no} ({e})",
+                                extra={"bid_no": job.bid_no, "worker": stats.name})
+                    # 페이지 상태를 알 수 없으므로 다음 작업에서 새로 준비
+                    if page is not None:
+                        self.crawler.captures.pop(page, None)
+                        try:
+                            self.pages.remove(page)
+                            await page.close()
+                        except:
+                            pass
+                    page = None
+                    prepared = False
+
+                stats.busy_sec += time.time() - started
+            finally:
+                self.queue.task_done()
+
+    async def _process_job(self, page, job: DetailJob):
+        found = await self.crawler._collect_job(page, job)
+        if not found:
+            logger.info(f"   [주의] 워커 목록에서 공고를 찾지 못함: {job.bid_no}", extra={"bid_no": job.bid_no})
+        return found